@@ -0,0 +1,139 @@
+"""
+Serialization cost of the large list endpoints, before and after the orjson / TypeAdapter response path.
+
+    python benchmark_serialization.py [rows]
+
+Runs against a throwaway SQLite database in a temporary directory. For each endpoint it times:
+  json     - FastAPI's previous default: validate, dump to JSON-mode Python, json.dumps (JSONResponse)
+  orjson   - the same with ORJSONResponse, which every endpoint now gets as the default response class
+  adapter  - model_list_response: validate and dump_json in one pydantic-core pass
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+os.chdir(tempfile.mkdtemp(prefix="serialization-bench-"))
+sys.path.insert(0, BACKEND_DIR)
+warnings.filterwarnings("ignore")
+
+import main  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from pydantic import BaseModel, TypeAdapter  # noqa: E402
+from sqlalchemy import JSON, Boolean, DateTime, Float, Integer, Text  # noqa: E402
+from typing import List, Union, get_args, get_origin  # noqa: E402
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+REPORTS = max(ROWS // 20, 1)
+CHILDREN = 20
+REPEAT = 5
+
+ENDPOINTS = [
+    ("/hot-work-permit/", main.HotWorkPermitDB, main.HotWorkPermit),
+    ("/confined-space-work-permit/", main.ConfinedSpaceWorkPermitDB, main.ConfinedSpaceWorkPermit),
+    ("/electrical-work-permit/", main.ElectricalWorkPermitDB, main.ElectricalWorkPermit),
+    ("/visitor-management-reports/", main.VisitorManagementReport, main.VisitorManagementReportResponse),
+]
+
+def sample(annotation, name: str):
+    """A value matching a schema annotation, for JSON columns that hold nested models or lists"""
+    origin = get_origin(annotation)
+    if origin is Union:
+        return sample(next(arg for arg in get_args(annotation) if arg is not type(None)), name)
+    if origin in (list, List):
+        return [sample(get_args(annotation)[0], name) for _ in range(3)]
+    if origin is dict:
+        return {f"{name} key": sample(get_args(annotation)[1], name) if get_args(annotation) else f"{name} value"}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return {field: sample(info.annotation, field) for field, info in annotation.model_fields.items()}
+    if annotation is dict:
+        return {f"{name} key": 1}
+    if annotation is list:
+        return [f"{name} item"]
+    if annotation in (int, float):
+        return annotation(1)
+    if annotation is bool:
+        return True
+    return f"{name} value"
+
+def filler(column, i: int, schema):
+    """A plausible value for any column type, so every field of the wide models is populated"""
+    if column.primary_key or column.foreign_keys:
+        return None
+    kind = column.type
+    if isinstance(kind, Integer):
+        return i
+    if isinstance(kind, Float):
+        return i * 1.5
+    if isinstance(kind, Boolean):
+        return bool(i % 2)
+    if isinstance(kind, DateTime):
+        return datetime(2024, 1, 1 + i % 28, 10, 30)
+    if isinstance(kind, JSON):
+        field = schema.model_fields.get(column.name)
+        return sample(field.annotation, column.name) if field else [f"{column.name} item {n}" for n in range(3)]
+    if isinstance(kind, Text):
+        return f"{column.name} " * 20
+    return f"{column.name} {i}"
+
+def populated(model, schema, i: int, **values):
+    for column in model.__table__.columns:
+        if column.name not in values:
+            value = filler(column, i, schema)
+            if value is not None:
+                values[column.name] = value
+    return model(**values)
+
+def seed(db):
+    property_id = "bench-property"
+    for path, model, schema in ENDPOINTS[:3]:
+        db.add_all(populated(model, schema, i, property_id=property_id) for i in range(ROWS))
+    for i in range(REPORTS):
+        report = main.VisitorManagementReport(property_id=property_id)
+        db.add(report)
+        db.flush()
+        db.add_all(populated(main.VisitorManagementLog, main.VisitorManagementLogResponse, n, report_id=report.id) for n in range(CHILDREN))
+        db.add_all(populated(main.GatePassManagement, main.GatePassManagementResponse, n, report_id=report.id) for n in range(CHILDREN))
+    db.commit()
+
+def timed(render) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        render()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main_():
+    db = main.SessionLocal()
+    seed(db)
+    print(f"{'endpoint':34} {'rows':>6} {'json ms':>9} {'orjson ms':>10} {'adapter ms':>11} {'speedup':>8}")
+    for path, orm_model, response_model in ENDPOINTS:
+        objects = db.query(orm_model).all()
+        adapter = TypeAdapter(List[response_model])
+
+        def fastapi_content():
+            items = adapter.validate_python(objects, from_attributes=True)
+            return adapter.dump_python(items, mode="json", by_alias=True)
+
+        def before():
+            return JSONResponse(fastapi_content()).body
+
+        def with_orjson():
+            return ORJSONResponse(fastapi_content()).body
+
+        def after():
+            return main.model_list_response(response_model, objects).body
+
+        # The warm-up loads lazy relationships once, so the timings only cover serialization
+        assert json.loads(before()) == json.loads(after()) == json.loads(with_orjson())
+        json_ms, orjson_ms, adapter_ms = timed(before), timed(with_orjson), timed(after)
+        print(f"{path:34} {len(objects):>6} {json_ms:>9.1f} {orjson_ms:>10.1f} {adapter_ms:>11.1f} {json_ms / adapter_ms:>7.1f}x")
+    db.close()
+
+if __name__ == "__main__":
+    main_()
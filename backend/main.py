@@ -1,10 +1,10 @@
 from fastapi import FastAPI, HTTPException, Depends, Query, status, BackgroundTasks, Body
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from pydantic import BaseModel, Field, EmailStr
+from fastapi.responses import FileResponse, ORJSONResponse, Response
+from pydantic import BaseModel, Field, EmailStr, TypeAdapter, ConfigDict, create_model
 from typing import Optional, List, Literal, Dict, Any
 from sqlalchemy import create_engine, Column, String, DateTime, Integer, Boolean, Text, ForeignKey, Float, JSON, Date
-from sqlalchemy.orm import sessionmaker, declarative_base, Session, relationship
+from sqlalchemy.orm import sessionmaker, declarative_base, Session, relationship, load_only, selectinload, lazyload
 from datetime import datetime
 import uuid
 import os
@@ -17,10 +17,113 @@ import shutil
 from sqlalchemy.dialects.sqlite import JSON as SQLiteJSON
 from sqlalchemy.types import JSON as SAJSON
 from enum import Enum
+from functools import lru_cache
 
 
 
-app = FastAPI(title="PRK Tech India")
+# orjson renders every response; list endpoints of wide or nested models go through model_list_response
+app = FastAPI(title="PRK Tech India", default_response_class=ORJSONResponse)
+
+# ?fields= and ?include= selections are chosen by clients, so the models built for them (and their adapters) are kept in LRUs
+RESPONSE_MODEL_CACHE_SIZE = 256
+
+@lru_cache(maxsize=RESPONSE_MODEL_CACHE_SIZE)
+def list_adapter(model) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+def model_list_response(model, objects) -> Response:
+    """Validate ORM rows against a response model and encode them to JSON in one pydantic-core pass"""
+    adapter = list_adapter(model)
+    items = adapter.validate_python(objects, from_attributes=True)
+    return Response(adapter.dump_json(items, by_alias=True), media_type="application/json")
+
+@lru_cache(maxsize=RESPONSE_MODEL_CACHE_SIZE)
+def _trimmed_model(model, names: tuple, suffix: str):
+    return create_model(
+        f"{model.__name__}{suffix}",
+        __config__=ConfigDict(**{**model.model_config, "from_attributes": True}),
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in names},
+    )
+
+def trimmed_model(model, names, suffix: str):
+    """A copy of a response model holding only some of its fields; any order or repetition of names shares one model"""
+    wanted = set(names)
+    return _trimmed_model(model, tuple(name for name in model.model_fields if name in wanted), suffix)
+
+class SparseFields:
+    """A ?fields= selection: loads only the chosen columns and answers with a response model trimmed to them"""
+
+    def __init__(self, model, orm_model, fields: Optional[str]):
+        self.orm_model = orm_model
+        self.names = None
+        self.model = model
+        if not fields:
+            return
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in model.model_fields]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(model.model_fields)}",
+            )
+        # id is always returned so clients can follow up on a row
+        self.names = tuple(dict.fromkeys((["id"] if "id" in model.model_fields else []) + names))
+        self.model = trimmed_model(model, self.names, "Fields")
+
+    def apply(self, query):
+        if self.names is None:
+            return query
+        columns = self.orm_model.__table__.c
+        return query.options(load_only(*(getattr(self.orm_model, name) for name in self.names if name in columns)))
+
+    def response(self, obj):
+        if self.names is None:
+            return obj
+        return Response(self.model.model_validate(obj).model_dump_json(by_alias=True), media_type="application/json")
+
+class IncludedRelationships:
+    """An ?include= selection of a composite report's children: only those are loaded and serialized"""
+    # Without ?include= every child is returned, selectin-loaded in one query per relationship rather than per report.
+    # An empty ?include= returns headers only, from a single query.
+
+    def __init__(self, model, orm_model, include: Optional[str]):
+        self.orm_model = orm_model
+        columns = orm_model.__table__.c
+        relationships = orm_model.__mapper__.relationships
+        # Children are named as they appear in the JSON, i.e. by alias where the response model has one,
+        # and read from the relationship the field validates from (its validation_alias where that differs)
+        self.children = {
+            (info.alias or name): name for name, info in model.model_fields.items() if name not in columns
+        }
+        self.relationships = {}
+        for key, name in self.children.items():
+            attribute = model.model_fields[name].validation_alias or name
+            self.relationships[key] = attribute if attribute in relationships else None
+        if include is None:
+            self.included = list(self.children)
+            self.model = model
+            return
+        included = [key.strip() for key in include.split(",") if key.strip()]
+        unknown = [key for key in included if key not in self.children]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown include: {', '.join(unknown)}. Available: {', '.join(self.children)}",
+            )
+        self.included = list(dict.fromkeys(included))
+        excluded = {self.children[key] for key in self.children if key not in self.included}
+        self.model = trimmed_model(model, tuple(name for name in model.model_fields if name not in excluded), "Include")
+
+    def apply(self, query, *needed: str):
+        """Add the loader options; children named in needed (e.g. read by a filter) are loaded even if not included"""
+        options = []
+        for key, relationship_key in self.relationships.items():
+            if relationship_key is None:
+                continue
+            attribute = getattr(self.orm_model, relationship_key)
+            loaded = key in self.included or key in needed
+            options.append(selectinload(attribute) if loaded else lazyload(attribute))
+        return query.options(*options)
 
 # Base URL for the application
 BASE_URL = "https://server.prktechindia.in"
@@ -278,7 +381,7 @@ class PropertyResponse(PropertyBase):
     updated_time: datetime
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class InventoryBase(BaseModel):
     property_id: str
@@ -320,7 +423,7 @@ class InventoryResponse(InventoryBase):
     qr_code_url: Optional[str] = None
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AssetBase(BaseModel):
     asset_category: str
@@ -357,7 +460,7 @@ class AssetResponse(AssetBase):
     qr_code_url: str
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 class SignupSchema(BaseModel):
     name: str
     email: str
@@ -500,9 +603,6 @@ class WaterSource(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     property_id = Column(String, nullable=False)
     
-    # Track all update timestamps as string
-    update_history = Column(Text, default="")
-    
     # Relationship with water readings
     readings = relationship("WaterReading", back_populates="water_source", cascade="all, delete-orphan")
 
@@ -519,9 +619,6 @@ class WaterReading(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     property_id = Column(String, nullable=False)
     
-    # Track all update timestamps as string
-    update_history = Column(Text, default="")
-    
     water_source = relationship("WaterSource", back_populates="readings")
 
 class SwimmingPool(Base):
@@ -637,8 +734,8 @@ class WaterSourceResponse(BaseModel):
     is_active: bool
     created_at: datetime
     updated_at: datetime
-    update_history: str
     property_id: str
+    history: Optional[List["ChangeLogEntry"]] = None  # only with include_history=true
 
     class Config:
         from_attributes = True
@@ -667,18 +764,306 @@ class WaterReadingResponse(BaseModel):
     reading_date: datetime
     created_at: datetime
     updated_at: datetime
-    update_history: str
     property_id: str
+    history: Optional[List["ChangeLogEntry"]] = None  # only with include_history=true
 
     class Config:
         from_attributes = True
 
-def update_history_string(existing_history: str, db_object) -> str:
-    """Update the history string with new timestamp"""
-    current_time = datetime.utcnow().isoformat()
-    if existing_history:
-        return f"{existing_history},{current_time}"
-    return current_time
+# --- Change Log ---
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from contextvars import ContextVar
+from sqlalchemy import Index, event, inspect as sa_inspect, text
+from starlette.requests import Request as StarletteRequest
+
+CHANGE_LOG_BATCH_SIZE = 500
+CHANGE_LOG_FLUSH_INTERVAL = 1.0  # seconds the writer waits before flushing a partial batch
+CHANGE_LOG_FLUSH_TIMEOUT = 10.0  # longest a reader waits for pending entries before querying anyway
+CHANGE_LOG_WRITE_ATTEMPTS = 3
+CHANGE_LOG_RETRY_DELAY = 0.5  # seconds, multiplied by the attempt number
+CHANGE_LOG_MAX_VALUE_LENGTH = 500  # longer values (base64 images, long text) are logged by length only
+CHANGE_LOG_EXCLUDED_TABLES = {
+    # The log itself, plus tables that already are append-only histories or derived aggregates
+    "change_log",
+    "telemetry_rollups", "telemetry_stats", "telemetry_alerts",
+    "diesel_generator_readings", "electricity_meter_readings", "electricity_consumption_rollups",
+    "swimming_pool_readings", "plant_parameter_readings", "water_reading_totals",
+    "diesel_stock_transactions", "diesel_stock_snapshots",
+}
+
+CHANGE_LOG_IGNORED_FIELDS = {"updated_at", "updated_time"}  # bumped on every write; changed_at already records it
+
+current_actor: ContextVar[Optional[str]] = ContextVar("current_actor", default=None)
+change_log_logger = logging.getLogger("change_log")
+
+class ChangeLog(Base):
+    __tablename__ = "change_log"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity_type = Column(String, nullable=False)  # table name
+    entity_id = Column(String, nullable=False)
+    action = Column(String, nullable=False)  # insert, update or delete
+    changes = Column(SAJSON().with_variant(SQLiteJSON, 'sqlite'), nullable=True)  # {field: [old, new]} for updates
+    actor = Column(String, nullable=True)  # X-User-Id of the request, when sent
+    changed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_change_log_entity", "entity_type", "entity_id", "changed_at"),
+    )
+
+def ensure_change_log():
+    """Create the change log, carrying over the timestamps kept in the old update_history columns"""
+    if sa_inspect(engine).has_table("change_log"):
+        return
+    ChangeLog.__table__.create(bind=engine)
+    rows = []
+    for table_name in ("water_sources", "water_readings"):
+        if not sa_inspect(engine).has_table(table_name):
+            continue
+        if "update_history" not in {column["name"] for column in sa_inspect(engine).get_columns(table_name)}:
+            continue
+        with engine.connect() as conn:
+            legacy = conn.execute(text(f"SELECT id, update_history FROM {table_name} WHERE update_history != ''")).all()
+        for entity_id, update_history in legacy:
+            for position, stamp in enumerate(update_history.split(",")):
+                try:
+                    changed_at = datetime.fromisoformat(stamp)
+                except ValueError:
+                    continue
+                rows.append({
+                    "entity_type": table_name, "entity_id": entity_id,
+                    "action": "insert" if position == 0 else "update",
+                    "changes": None, "actor": None, "changed_at": changed_at,
+                })
+    if rows:
+        with engine.begin() as conn:
+            conn.execute(ChangeLog.__table__.insert(), rows)
+
+ensure_change_log()
+
+class ChangeLogEntry(BaseModel):
+    entity_type: str
+    entity_id: str
+    action: str
+    changes: Optional[Dict[str, Any]] = None
+    actor: Optional[str] = None
+    changed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+WaterSourceResponse.model_rebuild()
+WaterReadingResponse.model_rebuild()
+
+def _change_log_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, str) and len(value) > CHANGE_LOG_MAX_VALUE_LENGTH:
+        return f"<{len(value)} chars>"
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    text_value = str(value)
+    return text_value if len(text_value) <= CHANGE_LOG_MAX_VALUE_LENGTH else f"<{len(text_value)} chars>"
+
+def _change_log_entity_id(state) -> Optional[str]:
+    identity = state.identity or tuple(getattr(state.obj(), key.key) for key in state.mapper.primary_key)
+    if not identity or any(part is None for part in identity):
+        return None
+    return ":".join(str(part) for part in identity)
+
+class ChangeLogWriter:
+    """Background thread that inserts committed change entries in batches, off the request path"""
+    
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+        # Batches are written in submission order, so comparing counts tells a reader when its predecessors are done
+        self.progress = threading.Condition()
+        self.submitted = 0
+        self.finished = 0
+    
+    def submit(self, entries: List[dict]):
+        if not entries:
+            return
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="change-log-writer", daemon=True)
+                self.thread.start()
+        with self.progress:
+            self.submitted += 1
+            self.queue.put(entries)
+    
+    def flush(self, timeout: float = CHANGE_LOG_FLUSH_TIMEOUT) -> bool:
+        """Wait until everything submitted before this call is written; later submissions do not extend the wait"""
+        with self.progress:
+            target = self.submitted
+            return self.progress.wait_for(lambda: self.finished >= target, timeout)
+    
+    def _write(self, rows: List[dict]):
+        for attempt in range(1, CHANGE_LOG_WRITE_ATTEMPTS + 1):
+            try:
+                with engine.begin() as conn:
+                    conn.execute(ChangeLog.__table__.insert(), rows)
+                return
+            except Exception:
+                if attempt == CHANGE_LOG_WRITE_ATTEMPTS:
+                    # The log must never take the API down, so a batch that keeps failing is reported and dropped
+                    change_log_logger.exception("Dropped %d change log entries after %d failed writes", len(rows), attempt)
+                else:
+                    time.sleep(CHANGE_LOG_RETRY_DELAY * attempt)
+    
+    def _run(self):
+        while True:
+            batches = [self.queue.get()]
+            rows = list(batches[0])
+            deadline = time.monotonic() + CHANGE_LOG_FLUSH_INTERVAL
+            while len(rows) < CHANGE_LOG_BATCH_SIZE:
+                try:
+                    batch = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                batches.append(batch)
+                rows.extend(batch)
+            try:
+                self._write(rows)
+            finally:
+                with self.progress:
+                    self.finished += len(batches)
+                    self.progress.notify_all()
+
+change_log_writer = ChangeLogWriter()
+atexit.register(change_log_writer.flush)
+
+@event.listens_for(Session, "after_flush")
+def collect_change_log(session, flush_context):
+    """Capture inserts, updates and deletes while attribute history is still available"""
+    now = datetime.utcnow()
+    actor = current_actor.get()
+    pending = session.info.setdefault("change_log", [])
+    for action, objects in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            state = sa_inspect(obj)
+            table_name = state.mapper.local_table.name
+            if table_name in CHANGE_LOG_EXCLUDED_TABLES:
+                continue
+            changes = None
+            if action == "update":
+                changes = {}
+                for attr in state.mapper.column_attrs:
+                    if attr.key in CHANGE_LOG_IGNORED_FIELDS:
+                        continue
+                    history = state.attrs[attr.key].history
+                    if history.has_changes():
+                        old = history.deleted[0] if history.deleted else None
+                        new = history.added[0] if history.added else None
+                        if old != new:
+                            changes[attr.key] = [_change_log_value(old), _change_log_value(new)]
+                if not changes:
+                    continue
+            entity_id = _change_log_entity_id(state)
+            if entity_id is None:
+                continue
+            pending.append({
+                "entity_type": table_name,
+                "entity_id": entity_id,
+                "action": action,
+                "changes": changes,
+                "actor": actor,
+                "changed_at": now,
+            })
+
+@event.listens_for(Session, "after_commit")
+def submit_change_log(session):
+    change_log_writer.submit(session.info.pop("change_log", []))
+
+@event.listens_for(Session, "after_rollback")
+def discard_change_log(session):
+    session.info.pop("change_log", None)
+
+def log_bulk_writes(db: Session, table_name: str, action: str, changes: Dict[str, Optional[Dict[str, list]]]):
+    """Log rows written with Core statements (executemany, upserts, bulk UPDATEs), which bypass the ORM flush events.
+
+    changes maps entity id to its {field: [old, new]} diff, or None for inserts; entries are written on commit.
+    """
+    now = datetime.utcnow()
+    actor = current_actor.get()
+    db.info.setdefault("change_log", []).extend(
+        {
+            "entity_type": table_name, "entity_id": entity_id, "action": action,
+            "changes": {field: [_change_log_value(old), _change_log_value(new)] for field, (old, new) in diff.items()} if diff else None,
+            "actor": actor, "changed_at": now,
+        }
+        for entity_id, diff in changes.items()
+    )
+
+def log_bulk_inserts(db: Session, table_name: str, entity_ids: List[str]):
+    """Log rows inserted with Core executemany; written on commit"""
+    log_bulk_writes(db, table_name, "insert", dict.fromkeys(entity_ids))
+
+def get_change_history(db: Session, entity_type: str, entity_ids: List[str]) -> Dict[str, List[ChangeLogEntry]]:
+    """Change entries for some entities of one type, oldest first, keyed by entity id"""
+    change_log_writer.flush()
+    history: Dict[str, List[ChangeLogEntry]] = {entity_id: [] for entity_id in entity_ids}
+    if not entity_ids:
+        return history
+    entries = db.query(ChangeLog).filter(
+        ChangeLog.entity_type == entity_type,
+        ChangeLog.entity_id.in_(entity_ids)
+    ).order_by(ChangeLog.changed_at, ChangeLog.id)
+    for entry in entries:
+        history[entry.entity_id].append(ChangeLogEntry.model_validate(entry))
+    return history
+
+def with_history(db: Session, response_model, objects, include_history: bool):
+    """Serialize objects with response_model, attaching their change history only when asked for"""
+    if not include_history:
+        return objects
+    history = get_change_history(db, objects[0].__tablename__, [obj.id for obj in objects]) if objects else {}
+    return [
+        response_model.model_validate(obj).model_copy(update={"history": history[obj.id]})
+        for obj in objects
+    ]
+
+@app.middleware("http")
+async def bind_change_log_actor(request: StarletteRequest, call_next):
+    token = current_actor.set(request.headers.get("x-user-id"))
+    try:
+        return await call_next(request)
+    finally:
+        current_actor.reset(token)
+
+@app.get("/change-log/{entity_type}/{entity_id}", response_model=List[ChangeLogEntry], tags=["Change Log"])
+def get_entity_change_log(entity_type: str, entity_id: str, db: Session = Depends(get_db)):
+    """Who changed what and when for one record, e.g. /change-log/water_sources/{id}"""
+    return get_change_history(db, entity_type, [entity_id])[entity_id]
+
+@app.get("/change-log/", response_model=List[ChangeLogEntry], tags=["Change Log"])
+def get_change_log(
+    entity_type: Optional[str] = None,
+    actor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = Query(100, le=1000),
+    db: Session = Depends(get_db)
+):
+    """Recent changes across all modules, newest first"""
+    change_log_writer.flush()
+    query = db.query(ChangeLog)
+    if entity_type:
+        query = query.filter(ChangeLog.entity_type == entity_type)
+    if actor:
+        query = query.filter(ChangeLog.actor == actor)
+    if since:
+        query = query.filter(ChangeLog.changed_at >= since)
+    return query.order_by(ChangeLog.changed_at.desc(), ChangeLog.id.desc()).offset(skip).limit(limit).all()
 
 
 class WTP(Base):
@@ -913,7 +1298,7 @@ class PropertyResponse(PropertyBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 
 # Swimming Pool Models
@@ -940,7 +1325,7 @@ class SwimmingPoolResponse(SwimmingPoolBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 
 # Diesel Generator Models
@@ -989,7 +1374,7 @@ class DieselGeneratorResponse(DieselGeneratorBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 
 # Electricity Consumption Models
@@ -1020,7 +1405,7 @@ class ElectricityConsumptionResponse(ElectricityConsumptionBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 
 # Diesel Stock Models
@@ -1047,7 +1432,7 @@ class DieselStockResponse(DieselStockBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 # --- Dependency ---
 
@@ -1736,7 +2121,6 @@ def reset_task(task_id: str, db: Session = Depends(get_db)):
 @app.post("/water-sources/", response_model=WaterSourceResponse, tags=["Water Source"])
 def create_water_source(water_source: WaterSourceCreate, db: Session = Depends(get_db)):
     db_water_source = WaterSource(**water_source.dict())
-    db_water_source.update_history = update_history_string("", db_water_source)
     db.add(db_water_source)
     db.commit()
     db.refresh(db_water_source)
@@ -1749,6 +2133,7 @@ def get_water_sources(
     source_type: Optional[str] = None,
     is_active: Optional[bool] = None,
     property_id: Optional[str] = None,
+    include_history: bool = False,
     db: Session = Depends(get_db)
 ):
     query = db.query(WaterSource)
@@ -1758,7 +2143,7 @@ def get_water_sources(
     if is_active is not None:
         query = query.filter(WaterSource.is_active == is_active)
     
-    return query.offset(skip).limit(limit).all()
+    return with_history(db, WaterSourceResponse, query.offset(skip).limit(limit).all(), include_history)
 
 @app.get("/water-sources/{water_source_id}", response_model=WaterSourceResponse, tags=["Water Source"])
 def get_water_source(water_source_id: str, db: Session = Depends(get_db)):
@@ -1783,9 +2168,6 @@ def update_water_source(
     for field, value in water_source_update.dict(exclude_unset=True).items():
         setattr(water_source, field, value)
     
-    # Update history
-    water_source.update_history = update_history_string(water_source.update_history, water_source)
-    
     db.commit()
     db.refresh(water_source)
     return water_source
@@ -1817,8 +2199,8 @@ def create_water_reading(water_reading: WaterReadingCreate, db: Session = Depend
         water_reading.reading_date = datetime.utcnow()
     
     db_reading = WaterReading(**water_reading.dict())
-    db_reading.update_history = update_history_string("", db_reading)
     db.add(db_reading)
+    analyze_telemetry(db, db_reading.property_id, "water", db_reading.water_source_id, db_reading.reading_date, {db_reading.reading_type: db_reading.value})
     db.commit()
     db.refresh(db_reading)
     return db_reading
@@ -1830,6 +2212,7 @@ def get_water_readings(
     water_source_id: Optional[str] = None,
     reading_type: Optional[str] = None,
     property_id: Optional[str] = None,
+    include_history: bool = False,
     db: Session = Depends(get_db)
 ):
     query = db.query(WaterReading)
@@ -1840,7 +2223,7 @@ def get_water_readings(
         query = query.filter(WaterReading.reading_type == reading_type)
     if property_id:
         query = query.filter(WaterReading.property_id == property_id)
-    return query.offset(skip).limit(limit).all()
+    return with_history(db, WaterReadingResponse, query.offset(skip).limit(limit).all(), include_history)
 
 @app.get("/water-readings/{reading_id}", response_model=WaterReadingResponse, tags=["Water Reading"])
 def get_water_reading(reading_id: str, db: Session = Depends(get_db)):
@@ -1865,9 +2248,6 @@ def update_water_reading(
     for field, value in reading_update.dict(exclude_unset=True).items():
         setattr(reading, field, value)
     
-    # Update history
-    reading.update_history = update_history_string(reading.update_history, reading)
-    
     db.commit()
     db.refresh(reading)
     return reading
@@ -1891,6 +2271,7 @@ def get_readings_for_water_source(
     limit: int = Query(100, ge=1),
     reading_type: Optional[str] = None,
     property_id: Optional[str] = None,
+    include_history: bool = False,
     db: Session = Depends(get_db)
 ):
     # Verify water source exists
@@ -1904,7 +2285,7 @@ def get_readings_for_water_source(
     if reading_type:
         query = query.filter(WaterReading.reading_type == reading_type)
     
-    return query.offset(skip).limit(limit).all()
+    return with_history(db, WaterReadingResponse, query.offset(skip).limit(limit).all(), include_history)
 
 @app.get("/water-sources/{water_source_id}/total-water-intake", tags=["Water Reading"])
 def get_total_water_intake(water_source_id: str, db: Session = Depends(get_db)):
@@ -1914,11 +2295,12 @@ def get_total_water_intake(water_source_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Water source not found")
     if water_source.property_id != property_id:
         raise HTTPException(status_code=403, detail="Unauthorized access")
-    # Calculate total intake
-    total_intake = db.query(WaterReading).filter(
-        WaterReading.water_source_id == water_source_id,
-        WaterReading.reading_type == "intake"
-    ).with_entities(func.sum(WaterReading.value)).scalar() or 0
+    # Calculate total intake from the monthly totals instead of every reading
+    total_intake = db.query(func.sum(WaterReadingTotal.total)).filter(
+        WaterReadingTotal.water_source_id == water_source_id,
+        WaterReadingTotal.period == "month",
+        WaterReadingTotal.reading_type == "intake"
+    ).scalar() or 0
     
     return {
         "water_source_id": water_source_id,
@@ -1927,6 +2309,327 @@ def get_total_water_intake(water_source_id: str, db: Session = Depends(get_db)):
         "unit": "KL"
     }
 
+# --- Water Reading Totals ---
+
+from sqlalchemy import inspect, text
+
+class WaterReadingTotal(Base):
+    __tablename__ = "water_reading_totals"
+    
+    # Maintained by triggers on water_readings, so ORM writes, bulk inserts and raw SQL all stay in sync
+    water_source_id = Column(String, primary_key=True)
+    period = Column(String, primary_key=True)  # day or month
+    bucket = Column(String, primary_key=True)  # '2024-06-09' for day, '2024-06' for month, from reading_date
+    reading_type = Column(String, primary_key=True)  # intake, yield, supply
+    unit = Column(String, primary_key=True)
+    total = Column(Float, nullable=False, default=0)
+    reading_count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = {"sqlite_with_rowid": False}
+
+WATER_READING_TOTAL_BUCKETS = {"day": "%Y-%m-%d", "month": "%Y-%m"}
+
+def _water_total_trigger(name: str, event: str, row: str, sign: str) -> str:
+    """Trigger that adds (sign '') or removes (sign '-') the NEW or OLD reading from its day and month totals"""
+    reading_date = f"COALESCE({row}.reading_date, {row}.created_at, CURRENT_TIMESTAMP)"
+    upserts = "".join(
+        f"""
+        INSERT INTO water_reading_totals (water_source_id, period, bucket, reading_type, unit, total, reading_count)
+        VALUES ({row}.water_source_id, '{period}', strftime('{bucket_format}', {reading_date}),
+                {row}.reading_type, COALESCE({row}.unit, 'KL'), {sign}{row}.value, {sign}1)
+        ON CONFLICT (water_source_id, period, bucket, reading_type, unit) DO UPDATE SET
+            total = total + excluded.total,
+            reading_count = reading_count + excluded.reading_count;"""
+        for period, bucket_format in WATER_READING_TOTAL_BUCKETS.items()
+    )
+    cleanup = ""
+    if sign == "-":
+        cleanup = f"""
+        DELETE FROM water_reading_totals WHERE water_source_id = {row}.water_source_id AND reading_count <= 0;"""
+    return f"""CREATE TRIGGER IF NOT EXISTS {name} {event} ON water_readings
+    WHEN {row}.water_source_id IS NOT NULL
+    BEGIN{upserts}{cleanup}
+    END"""
+
+# An update fires both the remove-OLD and add-NEW triggers; the two commute, so their order does not matter
+WATER_READING_TOTAL_TRIGGERS = [
+    _water_total_trigger("water_reading_totals_insert", "AFTER INSERT", "NEW", ""),
+    _water_total_trigger("water_reading_totals_delete", "AFTER DELETE", "OLD", "-"),
+    _water_total_trigger("water_reading_totals_update_old", "AFTER UPDATE OF water_source_id, reading_type, value, unit, reading_date", "OLD", "-"),
+    _water_total_trigger("water_reading_totals_update_new", "AFTER UPDATE OF water_source_id, reading_type, value, unit, reading_date", "NEW", ""),
+]
+
+def ensure_water_reading_totals():
+    """Create the totals table and its triggers, seeding it from existing readings the first time"""
+    seed = not inspect(engine).has_table(WaterReadingTotal.__tablename__)
+    with engine.begin() as conn:
+        WaterReadingTotal.__table__.create(bind=conn, checkfirst=True)
+        if seed:
+            for period, bucket_format in WATER_READING_TOTAL_BUCKETS.items():
+                conn.execute(text(f"""
+                    INSERT INTO water_reading_totals (water_source_id, period, bucket, reading_type, unit, total, reading_count)
+                    SELECT water_source_id, '{period}', strftime('{bucket_format}', COALESCE(reading_date, created_at, CURRENT_TIMESTAMP)),
+                           reading_type, COALESCE(unit, 'KL'), SUM(value), COUNT(*)
+                    FROM water_readings
+                    WHERE water_source_id IS NOT NULL
+                    GROUP BY 1, 2, 3, 4, 5
+                """))
+        for trigger in WATER_READING_TOTAL_TRIGGERS:
+            conn.execute(text(trigger))
+
+ensure_water_reading_totals()
+
+class WaterReadingTotalResponse(BaseModel):
+    water_source_id: str
+    period: str
+    bucket: str
+    reading_type: str
+    unit: str
+    total: float
+    reading_count: int
+
+    class Config:
+        from_attributes = True
+
+class WaterSourceTypeTotal(BaseModel):
+    source_type: str
+    reading_type: str
+    unit: str
+    total: float
+    reading_count: int
+
+class PropertyWaterTotalsResponse(BaseModel):
+    property_id: str
+    period: str
+    bucket: str
+    by_source_type: List[WaterSourceTypeTotal]
+
+@app.get("/water-sources/{water_source_id}/totals", response_model=List[WaterReadingTotalResponse], tags=["Water Reading"])
+def get_water_source_totals(
+    water_source_id: str,
+    period: Literal["day", "month"] = "month",
+    start: Optional[str] = Query(None, description="First bucket, YYYY-MM-DD for day or YYYY-MM for month"),
+    end: Optional[str] = Query(None, description="Last bucket, YYYY-MM-DD for day or YYYY-MM for month"),
+    reading_type: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Per-day or per-month totals of a water source, read from the pre-aggregated table"""
+    if not db.query(WaterSource.id).filter(WaterSource.id == water_source_id).first():
+        raise HTTPException(status_code=404, detail="Water source not found")
+    
+    query = db.query(WaterReadingTotal).filter(
+        WaterReadingTotal.water_source_id == water_source_id,
+        WaterReadingTotal.period == period
+    )
+    if start:
+        query = query.filter(WaterReadingTotal.bucket >= start)
+    if end:
+        query = query.filter(WaterReadingTotal.bucket <= end)
+    if reading_type:
+        query = query.filter(WaterReadingTotal.reading_type == reading_type)
+    return query.order_by(WaterReadingTotal.bucket, WaterReadingTotal.reading_type, WaterReadingTotal.unit).all()
+
+@app.get("/properties/{property_id}/water-totals", response_model=PropertyWaterTotalsResponse, tags=["Water Reading"])
+def get_property_water_totals(
+    property_id: str,
+    period: Literal["day", "month"] = "month",
+    bucket: Optional[str] = Query(None, description="YYYY-MM-DD for day or YYYY-MM for month; defaults to the current one (UTC)"),
+    db: Session = Depends(get_db)
+):
+    """Totals of one day or month across a property's water sources, broken down by BWSSB/Tanker/Borewell"""
+    bucket = bucket or datetime.utcnow().strftime(WATER_READING_TOTAL_BUCKETS[period])
+    rows = db.query(
+        WaterSource.source_type,
+        WaterReadingTotal.reading_type,
+        WaterReadingTotal.unit,
+        func.sum(WaterReadingTotal.total),
+        func.sum(WaterReadingTotal.reading_count)
+    ).join(
+        WaterReadingTotal, WaterReadingTotal.water_source_id == WaterSource.id
+    ).filter(
+        WaterSource.property_id == property_id,
+        WaterReadingTotal.period == period,
+        WaterReadingTotal.bucket == bucket
+    ).group_by(
+        WaterSource.source_type, WaterReadingTotal.reading_type, WaterReadingTotal.unit
+    ).order_by(
+        WaterSource.source_type, WaterReadingTotal.reading_type, WaterReadingTotal.unit
+    ).all()
+    
+    return PropertyWaterTotalsResponse(
+        property_id=property_id,
+        period=period,
+        bucket=bucket,
+        by_source_type=[
+            WaterSourceTypeTotal(
+                source_type=source_type,
+                reading_type=reading_type,
+                unit=unit,
+                total=total or 0,
+                reading_count=reading_count or 0
+            )
+            for source_type, reading_type, unit, total, reading_count in rows
+        ]
+    )
+
+# --- Bulk Water Reading Ingestion ---
+
+import csv
+import io
+import math
+from fastapi import Request
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+WATER_READING_TYPES = ("intake", "yield", "supply")
+WATER_READING_UNITS = ("KL", "L", "Nos")
+WATER_READING_MAX_VALUE = 1000000
+WATER_READING_BULK_MAX_ROWS = 10000
+
+class WaterReadingBulkRowError(BaseModel):
+    row: int  # 1-based position in the submitted batch
+    errors: List[str]
+
+class WaterReadingBulkResponse(BaseModel):
+    received: int
+    inserted: int
+    inserted_ids: List[str]
+    errors: List[WaterReadingBulkRowError]
+
+def parse_water_reading_csv(content: bytes) -> List[dict]:
+    """Parse a CSV whose header uses the WaterReadingCreate field names; blank cells fall back to defaults"""
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+    rows = []
+    for row in csv.DictReader(io.StringIO(text)):
+        rows.append({
+            key.strip(): value.strip()
+            for key, value in row.items()
+            if key and isinstance(value, str) and value.strip()
+        })
+    return rows
+
+def ingest_water_readings(rows: List[Any], db: Session, atomic: bool = False) -> dict:
+    """Validate a whole batch of water readings at once and insert the valid ones in one transaction"""
+    errors: Dict[int, List[str]] = {}
+    parsed: Dict[int, WaterReadingCreate] = {}
+    for index, raw in enumerate(rows, start=1):
+        if not isinstance(raw, dict):
+            errors[index] = ["row must be an object"]
+            continue
+        try:
+            parsed[index] = WaterReadingCreate(**raw)
+        except ValidationError as e:
+            errors[index] = [f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()]
+
+    # One IN query resolves every water source referenced by the batch
+    source_ids = {reading.water_source_id for reading in parsed.values()}
+    source_properties = dict(
+        db.query(WaterSource.id, WaterSource.property_id).filter(WaterSource.id.in_(source_ids)).all()
+    ) if source_ids else {}
+
+    for index, reading in parsed.items():
+        row_errors = []
+        if reading.water_source_id not in source_properties:
+            row_errors.append("water_source_id: water source not found")
+        elif source_properties[reading.water_source_id] != reading.property_id:
+            row_errors.append("property_id: does not match the water source's property")
+        if reading.reading_type not in WATER_READING_TYPES:
+            row_errors.append(f"reading_type: must be one of {', '.join(WATER_READING_TYPES)}")
+        if reading.unit not in WATER_READING_UNITS:
+            row_errors.append(f"unit: must be one of {', '.join(WATER_READING_UNITS)}")
+        if not math.isfinite(reading.value) or not 0 <= reading.value <= WATER_READING_MAX_VALUE:
+            row_errors.append(f"value: must be between 0 and {WATER_READING_MAX_VALUE}")
+        if row_errors:
+            errors[index] = row_errors
+
+    now = datetime.utcnow()
+    values = []
+    if not (atomic and errors):
+        values = [
+            {
+                "id": str(uuid.uuid4()),
+                "water_source_id": reading.water_source_id,
+                "reading_type": reading.reading_type,
+                "value": reading.value,
+                "unit": reading.unit,
+                "reading_date": reading.reading_date or now,
+                "created_at": now,
+                "updated_at": now,
+                "property_id": reading.property_id,
+            }
+            for index, reading in parsed.items()
+            if index not in errors
+        ]
+
+    if values:
+        try:
+            # Single executemany INSERT inside one transaction
+            db.execute(WaterReading.__table__.insert(), values)
+            log_bulk_inserts(db, "water_readings", [value["id"] for value in values])
+            analyze_telemetry_batch(db, [
+                (value["property_id"], "water", value["water_source_id"], value["reading_type"], value["reading_date"], value["value"])
+                for value in sorted(values, key=lambda value: value["reading_date"])
+            ])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(status_code=500, detail=f"Error inserting water readings: {str(e)}")
+
+    return {
+        "received": len(rows),
+        "inserted": len(values),
+        "inserted_ids": [value["id"] for value in values],
+        "errors": [{"row": index, "errors": errors[index]} for index in sorted(errors)],
+    }
+
+@app.post(
+    "/water-readings/bulk",
+    response_model=WaterReadingBulkResponse,
+    tags=["Water Reading"],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/WaterReadingCreate"}}},
+                "text/csv": {"schema": {"type": "string"}},
+                "multipart/form-data": {"schema": {"type": "object", "properties": {"file": {"type": "string", "format": "binary"}}}},
+            },
+        }
+    },
+)
+async def create_water_readings_bulk(
+    request: Request,
+    atomic: bool = Query(False, description="Reject the whole batch if any row is invalid"),
+    db: Session = Depends(get_db)
+):
+    """Ingest many water readings from a JSON array, a text/csv body or an uploaded CSV file"""
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="Upload the CSV as a 'file' form field")
+        rows = parse_water_reading_csv(await upload.read())
+    elif "csv" in content_type:
+        rows = parse_water_reading_csv(await request.body())
+    else:
+        try:
+            rows = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or CSV")
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or CSV")
+
+    if not rows:
+        raise HTTPException(status_code=400, detail="No readings supplied")
+    if len(rows) > WATER_READING_BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {WATER_READING_BULK_MAX_ROWS} readings per request")
+
+    return await run_in_threadpool(ingest_water_readings, rows, db, atomic)
+
 @app.post("/properties/", response_model=PropertyResponse, tags=["Properties"])
 def create_property(property: PropertyCreate, db: Session = Depends(get_db)):
     db_property = Property(**property.dict())
@@ -1971,6 +2674,359 @@ def delete_property(property_id: str, db: Session = Depends(get_db)):
     db.commit()
     return {"message": "Property deleted successfully"}
 
+# --- Telemetry History and Rollups ---
+
+from datetime import timedelta, timezone
+import numpy as np
+from sqlalchemy import Index
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+TELEMETRY_PERIODS = ("hour", "day")
+
+class TelemetryRollup(Base):
+    __tablename__ = "telemetry_rollups"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    source = Column(String, nullable=False)  # diesel_generator, ...
+    series_id = Column(String, nullable=False)  # id of the generator/meter/pool the readings belong to
+    metric = Column(String, nullable=False)
+    period = Column(String, nullable=False)  # hour or day
+    bucket = Column(String, nullable=False)  # '2024-06-09T14' for hour, '2024-06-09' for day (UTC)
+    sample_count = Column(Integer, nullable=False, default=0)
+    value_sum = Column(Float, nullable=False, default=0)
+    value_min = Column(Float, nullable=True)
+    value_max = Column(Float, nullable=True)
+    first_at = Column(DateTime, nullable=True)
+    last_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        Index("uq_telemetry_rollups_bucket", "source", "series_id", "metric", "period", "bucket", unique=True),
+    )
+
+TelemetryRollup.__table__.create(bind=engine, checkfirst=True)
+
+class TelemetryRollupResponse(BaseModel):
+    series_id: str
+    metric: str
+    period: str
+    bucket: str
+    count: int
+    min: Optional[float] = None
+    max: Optional[float] = None
+    avg: Optional[float] = None
+    first_at: Optional[datetime] = None
+    last_at: Optional[datetime] = None
+
+def telemetry_bucket(recorded_at: datetime, period: str) -> str:
+    """Bucket key of a UTC timestamp for an hourly or daily rollup"""
+    return recorded_at.strftime("%Y-%m-%dT%H" if period == "hour" else "%Y-%m-%d")
+
+def record_telemetry_rollups(db: Session, source: str, series_id: str, recorded_at: datetime, values: Dict[str, Any]):
+    """Fold one reading into the hourly and daily rollups with a single upsert; None values are skipped"""
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "source": source,
+            "series_id": series_id,
+            "metric": metric,
+            "period": period,
+            "bucket": telemetry_bucket(recorded_at, period),
+            "sample_count": 1,
+            "value_sum": float(value),
+            "value_min": float(value),
+            "value_max": float(value),
+            "first_at": recorded_at,
+            "last_at": recorded_at,
+        }
+        for metric, value in values.items() if value is not None
+        for period in TELEMETRY_PERIODS
+    ]
+    if not rows:
+        return
+    table = TelemetryRollup.__table__
+    stmt = sqlite_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["source", "series_id", "metric", "period", "bucket"],
+        set_={
+            "sample_count": table.c.sample_count + stmt.excluded.sample_count,
+            "value_sum": table.c.value_sum + stmt.excluded.value_sum,
+            "value_min": func.min(table.c.value_min, stmt.excluded.value_min),
+            "value_max": func.max(table.c.value_max, stmt.excluded.value_max),
+            "first_at": func.min(table.c.first_at, stmt.excluded.first_at),
+            "last_at": func.max(table.c.last_at, stmt.excluded.last_at),
+        },
+    )
+    db.execute(stmt, rows)
+
+TELEMETRY_PERIOD_UNITS = {"hour": "h", "day": "D"}
+
+def rebuild_telemetry_rollups(db: Session, source: str, series_id: str, metric: str, recorded_at: np.ndarray, values: np.ndarray):
+    """Recompute the hourly and daily buckets spanned by a metric's raw samples and replace the stored ones.
+
+    recorded_at must be sorted datetime64 values covering whole days, so every bucket in the span is rebuilt.
+    """
+    if not len(recorded_at):
+        return
+    table = TelemetryRollup.__table__
+    for period, unit in TELEMETRY_PERIOD_UNITS.items():
+        keys = recorded_at.astype(f"datetime64[{unit}]")
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)]
+        buckets = np.datetime_as_string(keys[starts], unit=unit)
+        counts = ends - starts
+        sums = np.add.reduceat(values, starts)
+        minimums = np.minimum.reduceat(values, starts)
+        maximums = np.maximum.reduceat(values, starts)
+        first_at = recorded_at[starts].astype("datetime64[us]").tolist()
+        last_at = recorded_at[ends - 1].astype("datetime64[us]").tolist()
+        
+        db.execute(table.delete().where(
+            table.c.source == source,
+            table.c.series_id == series_id,
+            table.c.metric == metric,
+            table.c.period == period,
+            table.c.bucket >= str(buckets[0]),
+            table.c.bucket <= str(buckets[-1])
+        ))
+        db.execute(table.insert(), [
+            {
+                "id": str(uuid.uuid4()),
+                "source": source,
+                "series_id": series_id,
+                "metric": metric,
+                "period": period,
+                "bucket": str(buckets[i]),
+                "sample_count": int(counts[i]),
+                "value_sum": float(sums[i]),
+                "value_min": float(minimums[i]),
+                "value_max": float(maximums[i]),
+                "first_at": first_at[i],
+                "last_at": last_at[i],
+            }
+            for i in range(len(starts))
+        ])
+
+def query_telemetry_rollups(
+    db: Session,
+    source: str,
+    series_ids: List[str],
+    period: str,
+    metric: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> List[TelemetryRollupResponse]:
+    """Read rollup buckets for some series over a time range, served from the unique index"""
+    query = db.query(TelemetryRollup).filter(
+        TelemetryRollup.source == source,
+        TelemetryRollup.series_id.in_(series_ids),
+        TelemetryRollup.period == period
+    )
+    if metric:
+        query = query.filter(TelemetryRollup.metric == metric)
+    if start:
+        query = query.filter(TelemetryRollup.bucket >= telemetry_bucket(start, period))
+    if end:
+        query = query.filter(TelemetryRollup.bucket <= telemetry_bucket(end, period))
+    return [
+        TelemetryRollupResponse(
+            series_id=rollup.series_id,
+            metric=rollup.metric,
+            period=rollup.period,
+            bucket=rollup.bucket,
+            count=rollup.sample_count,
+            min=rollup.value_min,
+            max=rollup.value_max,
+            avg=rollup.value_sum / rollup.sample_count if rollup.sample_count else None,
+            first_at=rollup.first_at,
+            last_at=rollup.last_at
+        )
+        for rollup in query.order_by(TelemetryRollup.series_id, TelemetryRollup.metric, TelemetryRollup.bucket)
+    ]
+
+# Streaming anomaly detection: each reading updates an EWMA mean/variance per series in O(1) and may raise an alert
+
+from sqlalchemy import tuple_
+
+TELEMETRY_EWMA_ALPHA = 0.1
+TELEMETRY_WARMUP_SAMPLES = 20  # no outlier alerts until a series has this many readings
+TELEMETRY_OUTLIER_Z = 4.0
+TELEMETRY_MIN_STD_FRACTION = 0.01  # std floor as a fraction of |mean|, so flat series don't alert on tiny moves
+
+# (source, metric) -> (low, high) operating limits; None leaves that side open
+TELEMETRY_THRESHOLDS = {
+    ("diesel_generator", "coolant_temperature"): (None, 95),
+    ("diesel_generator", "oil_pressure"): (20, None),
+    ("diesel_generator", "frequency"): (49, 51),
+    ("swimming_pool", "ph_value"): (7.2, 7.8),
+    ("swimming_pool", "chlorine_value"): (1, 3),
+    ("wtp", "ph_level"): (6.5, 8.5),
+    ("wtp", "turbidity"): (None, 5),
+    ("stp", "ph_level"): (6.5, 9),
+    ("stp", "bod_outlet"): (None, 30),
+    ("stp", "cod_outlet"): (None, 250),
+}
+
+class TelemetryStat(Base):
+    __tablename__ = "telemetry_stats"
+    
+    source = Column(String, primary_key=True)
+    series_id = Column(String, primary_key=True)
+    metric = Column(String, primary_key=True)
+    sample_count = Column(Integer, nullable=False, default=0)
+    mean = Column(Float, nullable=False, default=0)  # exponentially weighted
+    variance = Column(Float, nullable=False, default=0)  # exponentially weighted
+    last_value = Column(Float, nullable=True)
+    last_at = Column(DateTime, nullable=True)
+    breached = Column(Boolean, nullable=False, default=False)  # last reading was outside TELEMETRY_THRESHOLDS
+    
+    __table_args__ = {"sqlite_with_rowid": False}
+
+class TelemetryAlert(Base):
+    __tablename__ = "telemetry_alerts"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    property_id = Column(String, nullable=False)
+    source = Column(String, nullable=False)
+    series_id = Column(String, nullable=False)
+    metric = Column(String, nullable=False)
+    kind = Column(String, nullable=False)  # outlier or threshold
+    value = Column(Float, nullable=False)
+    expected = Column(Float, nullable=True)  # rolling mean at the time of the reading
+    z_score = Column(Float, nullable=True)
+    message = Column(String, nullable=False)
+    recorded_at = Column(DateTime, nullable=False)
+    acknowledged = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_telemetry_alerts_property_time", "property_id", "recorded_at"),
+        Index("ix_telemetry_alerts_series", "source", "series_id", "recorded_at"),
+    )
+
+TelemetryStat.__table__.create(bind=engine, checkfirst=True)
+TelemetryAlert.__table__.create(bind=engine, checkfirst=True)
+
+class TelemetryAlertResponse(BaseModel):
+    id: str
+    property_id: str
+    source: str
+    series_id: str
+    metric: str
+    kind: str
+    value: float
+    expected: Optional[float] = None
+    z_score: Optional[float] = None
+    message: str
+    recorded_at: datetime
+    acknowledged: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+def analyze_telemetry_batch(db: Session, samples: List[tuple]) -> List[TelemetryAlert]:
+    """Run (property_id, source, series_id, metric, recorded_at, value) samples, in order, through the rolling stats (caller commits)"""
+    samples = [sample for sample in samples if sample[5] is not None]
+    if not samples:
+        return []
+    keys = {(source, series_id, metric) for _, source, series_id, metric, _, _ in samples}
+    stats = {
+        (stat.source, stat.series_id, stat.metric): stat
+        for stat in db.query(TelemetryStat).filter(
+            tuple_(TelemetryStat.source, TelemetryStat.series_id, TelemetryStat.metric).in_(list(keys))
+        )
+    }
+    
+    alerts = []
+    for property_id, source, series_id, metric, recorded_at, value in samples:
+        value = float(value)
+        stat = stats.get((source, series_id, metric))
+        if stat is None:
+            stat = TelemetryStat(source=source, series_id=series_id, metric=metric, sample_count=0, mean=0, variance=0, breached=False)
+            stats[(source, series_id, metric)] = stat
+            db.add(stat)
+        
+        # Score against the state before this reading, then fold the reading in
+        z_score = None
+        if stat.sample_count >= TELEMETRY_WARMUP_SAMPLES:
+            std = max(stat.variance ** 0.5, TELEMETRY_MIN_STD_FRACTION * abs(stat.mean), 1e-9)
+            z_score = (value - stat.mean) / std
+            if abs(z_score) >= TELEMETRY_OUTLIER_Z:
+                alerts.append(TelemetryAlert(
+                    property_id=property_id, source=source, series_id=series_id, metric=metric,
+                    kind="outlier", value=value, expected=stat.mean, z_score=z_score, recorded_at=recorded_at,
+                    message=f"{metric} {value:g} is {abs(z_score):.1f} standard deviations from its recent mean {stat.mean:.4g}"
+                ))
+        
+        low, high = TELEMETRY_THRESHOLDS.get((source, metric), (None, None))
+        breached = (low is not None and value < low) or (high is not None and value > high)
+        if breached and not stat.breached:
+            limit = f"below {low:g}" if low is not None and value < low else f"above {high:g}"
+            alerts.append(TelemetryAlert(
+                property_id=property_id, source=source, series_id=series_id, metric=metric,
+                kind="threshold", value=value, expected=stat.mean if stat.sample_count else None, z_score=z_score,
+                recorded_at=recorded_at, message=f"{metric} {value:g} is {limit}"
+            ))
+        stat.breached = breached
+        
+        if stat.sample_count == 0:
+            stat.mean, stat.variance = value, 0.0
+        else:
+            delta = value - stat.mean
+            stat.mean += TELEMETRY_EWMA_ALPHA * delta
+            stat.variance = (1 - TELEMETRY_EWMA_ALPHA) * (stat.variance + TELEMETRY_EWMA_ALPHA * delta * delta)
+        stat.sample_count += 1
+        stat.last_value = value
+        stat.last_at = recorded_at
+    
+    db.add_all(alerts)
+    return alerts
+
+def analyze_telemetry(db: Session, property_id: str, source: str, series_id: str, recorded_at: datetime, values: Dict[str, Any]) -> List[TelemetryAlert]:
+    """Analyze one reading's metrics (caller commits)"""
+    return analyze_telemetry_batch(db, [
+        (property_id, source, series_id, metric, recorded_at, value) for metric, value in values.items()
+    ])
+
+@app.get("/telemetry-alerts/", response_model=List[TelemetryAlertResponse], tags=["Telemetry Alerts"])
+def get_telemetry_alerts(
+    property_id: Optional[str] = None,
+    source: Optional[str] = None,
+    series_id: Optional[str] = None,
+    kind: Optional[Literal["outlier", "threshold"]] = None,
+    acknowledged: Optional[bool] = None,
+    since: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = Query(100, le=1000),
+    db: Session = Depends(get_db)
+):
+    """Alerts raised by the telemetry ingest paths, newest first"""
+    query = db.query(TelemetryAlert)
+    if property_id:
+        query = query.filter(TelemetryAlert.property_id == property_id)
+    if source:
+        query = query.filter(TelemetryAlert.source == source)
+    if series_id:
+        query = query.filter(TelemetryAlert.series_id == series_id)
+    if kind:
+        query = query.filter(TelemetryAlert.kind == kind)
+    if acknowledged is not None:
+        query = query.filter(TelemetryAlert.acknowledged == acknowledged)
+    if since:
+        query = query.filter(TelemetryAlert.recorded_at >= since)
+    return query.order_by(TelemetryAlert.recorded_at.desc()).offset(skip).limit(limit).all()
+
+@app.put("/telemetry-alerts/{alert_id}/acknowledge", response_model=TelemetryAlertResponse, tags=["Telemetry Alerts"])
+def acknowledge_telemetry_alert(alert_id: str, db: Session = Depends(get_db)):
+    """Mark an alert as seen"""
+    alert = db.query(TelemetryAlert).filter(TelemetryAlert.id == alert_id).first()
+    if alert is None:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    alert.acknowledged = True
+    db.commit()
+    db.refresh(alert)
+    return alert
+
 # WTP APIS
 @app.post("/wtp/", response_model=WTPResponse, tags=["WTP"])
 def create_wtp(wtp: WTPCreate, db: Session = Depends(get_db)):
@@ -1981,6 +3037,10 @@ def create_wtp(wtp: WTPCreate, db: Session = Depends(get_db)):
     
     db_wtp = WTP(**wtp.dict())
     db.add(db_wtp)
+    db.flush()
+    record_plant_parameters(db, "wtp", db_wtp, db_wtp.updated_time, {
+        parameter: getattr(db_wtp, parameter) for parameter in PLANT_PARAMETERS["wtp"]
+    })
     db.commit()
     db.refresh(db_wtp)
     return db_wtp
@@ -2006,10 +3066,14 @@ def update_wtp(wtp_id: str, wtp_update: WTPUpdate, db: Session = Depends(get_db)
     if wtp is None:
         raise HTTPException(status_code=404, detail="WTP not found")
     
-    for field, value in wtp_update.dict(exclude_unset=True).items():
+    update_data = wtp_update.dict(exclude_unset=True)
+    for field, value in update_data.items():
         setattr(wtp, field, value)
     
     wtp.updated_time = datetime.utcnow()
+    record_plant_parameters(db, "wtp", wtp, wtp.updated_time, {
+        parameter: update_data[parameter] for parameter in PLANT_PARAMETERS["wtp"] if parameter in update_data
+    })
     db.commit()
     db.refresh(wtp)
     return wtp
@@ -2020,6 +3084,15 @@ def delete_wtp(wtp_id: str, db: Session = Depends(get_db)):
     if wtp is None:
         raise HTTPException(status_code=404, detail="WTP not found")
     
+    db.query(PlantParameterReading).filter(PlantParameterReading.phase_id == wtp_id).delete(synchronize_session=False)
+    db.query(TelemetryRollup).filter(
+        TelemetryRollup.source == "wtp",
+        TelemetryRollup.series_id == wtp_id
+    ).delete(synchronize_session=False)
+    db.query(TelemetryStat).filter(
+        TelemetryStat.source == "wtp",
+        TelemetryStat.series_id == wtp_id
+    ).delete(synchronize_session=False)
     db.delete(wtp)
     db.commit()
     return {"message": "WTP deleted successfully"}
@@ -2034,6 +3107,10 @@ def create_stp(stp: STPCreate, db: Session = Depends(get_db)):
     
     db_stp = STP(**stp.dict())
     db.add(db_stp)
+    db.flush()
+    record_plant_parameters(db, "stp", db_stp, db_stp.updated_time, {
+        parameter: getattr(db_stp, parameter) for parameter in PLANT_PARAMETERS["stp"]
+    })
     db.commit()
     db.refresh(db_stp)
     return db_stp
@@ -2059,10 +3136,14 @@ def update_stp(stp_id: str, stp_update: STPUpdate, db: Session = Depends(get_db)
     if stp is None:
         raise HTTPException(status_code=404, detail="STP not found")
     
-    for field, value in stp_update.dict(exclude_unset=True).items():
+    update_data = stp_update.dict(exclude_unset=True)
+    for field, value in update_data.items():
         setattr(stp, field, value)
     
     stp.updated_time = datetime.utcnow()
+    record_plant_parameters(db, "stp", stp, stp.updated_time, {
+        parameter: update_data[parameter] for parameter in PLANT_PARAMETERS["stp"] if parameter in update_data
+    })
     db.commit()
     db.refresh(stp)
     return stp
@@ -2073,6 +3154,15 @@ def delete_stp(stp_id: str, db: Session = Depends(get_db)):
     if stp is None:
         raise HTTPException(status_code=404, detail="STP not found")
     
+    db.query(PlantParameterReading).filter(PlantParameterReading.phase_id == stp_id).delete(synchronize_session=False)
+    db.query(TelemetryRollup).filter(
+        TelemetryRollup.source == "stp",
+        TelemetryRollup.series_id == stp_id
+    ).delete(synchronize_session=False)
+    db.query(TelemetryStat).filter(
+        TelemetryStat.source == "stp",
+        TelemetryStat.series_id == stp_id
+    ).delete(synchronize_session=False)
     db.delete(stp)
     db.commit()
     return {"message": "STP deleted successfully"}
@@ -2098,6 +3188,232 @@ def get_property_stps(property_id: str, db: Session = Depends(get_db)):
     stps = db.query(STP).filter(STP.property_id == property_id).all()
     return stps
 
+# WTP/STP phase parameter history: one row per (phase, parameter, time), hourly/daily rollups in telemetry_rollups
+
+PLANT_MODELS = {"wtp": WTP, "stp": STP}
+PLANT_PARAMETERS = {
+    plant: tuple(column.name for column in model.__table__.columns if isinstance(column.type, (Float, Integer)))
+    for plant, model in PLANT_MODELS.items()
+}
+PLANT_BACKFILL_MAX_SAMPLES = 10000
+
+class PlantParameterReading(Base):
+    __tablename__ = "plant_parameter_readings"
+    
+    phase_id = Column(String, primary_key=True)  # wtp.id or stp.id
+    parameter = Column(String, primary_key=True)
+    recorded_at = Column(DateTime, primary_key=True)
+    plant = Column(String, nullable=False)  # wtp or stp
+    property_id = Column(String, nullable=False)
+    value = Column(Float, nullable=False)
+    ingested_at = Column(DateTime, nullable=True, default=datetime.utcnow)  # last write; the analytics export watermark
+    
+    # No rowid: one parameter's series is stored contiguously in time order
+    __table_args__ = {"sqlite_with_rowid": False}
+
+PlantParameterReading.__table__.create(bind=engine, checkfirst=True)
+if "ingested_at" not in {column["name"] for column in inspect(engine).get_columns("plant_parameter_readings")}:
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE plant_parameter_readings ADD COLUMN ingested_at DATETIME"))
+        conn.execute(text("UPDATE plant_parameter_readings SET ingested_at = recorded_at"))
+
+class PlantParameterSample(BaseModel):
+    recorded_at: datetime
+    values: Dict[str, Optional[float]]  # parameter -> value, e.g. {"bod_inlet": 210, "cod_inlet": 480}
+
+class PlantParameterReadingResponse(BaseModel):
+    phase_id: str
+    parameter: str
+    recorded_at: datetime
+    value: float
+
+    class Config:
+        from_attributes = True
+
+def record_plant_parameters(db: Session, plant: str, phase, recorded_at: datetime, values: Dict[str, Any]):
+    """Append a phase's parameter values at one instant and fold them into the rollups; repeated samples are ignored (caller commits)"""
+    values = {parameter: value for parameter, value in values.items() if value is not None}
+    if not values:
+        return
+    table = PlantParameterReading.__table__
+    inserted = db.execute(
+        sqlite_insert(table).values([
+            {
+                "phase_id": phase.id,
+                "parameter": parameter,
+                "recorded_at": recorded_at,
+                "plant": plant,
+                "property_id": phase.property_id,
+                "value": value,
+            }
+            for parameter, value in values.items()
+        ]).on_conflict_do_nothing().returning(table.c.parameter)
+    ).scalars().all()
+    values = {parameter: values[parameter] for parameter in inserted}
+    if not values:
+        return
+    record_telemetry_rollups(db, plant, phase.id, recorded_at, values)
+    analyze_telemetry(db, phase.property_id, plant, phase.id, recorded_at, values)
+
+def backfill_plant_parameters(db: Session, plant: str, phase, samples: List[PlantParameterSample]) -> int:
+    """Store samples that may be out of order, then rebuild the affected days' rollups from the raw series (caller commits)"""
+    rows = {}
+    for sample in samples:
+        recorded_at = sample.recorded_at
+        if recorded_at.tzinfo is not None:
+            recorded_at = recorded_at.astimezone(timezone.utc).replace(tzinfo=None)
+        for parameter, value in sample.values.items():
+            if value is not None:
+                rows[(parameter, recorded_at)] = value
+    if not rows:
+        return 0
+    
+    table = PlantParameterReading.__table__
+    stmt = sqlite_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["phase_id", "parameter", "recorded_at"],
+        set_={"value": stmt.excluded.value, "ingested_at": stmt.excluded.ingested_at}
+    )
+    db.execute(stmt, [
+        {
+            "phase_id": phase.id,
+            "parameter": parameter,
+            "recorded_at": recorded_at,
+            "plant": plant,
+            "property_id": phase.property_id,
+            "value": value,
+        }
+        for (parameter, recorded_at), value in rows.items()
+    ])
+    
+    # Rebuild whole days: reload each touched parameter's raw series over the span and recompute with NumPy
+    spans = {}
+    for parameter, recorded_at in rows:
+        first, last = spans.get(parameter, (recorded_at, recorded_at))
+        spans[parameter] = (min(first, recorded_at), max(last, recorded_at))
+    for parameter, (first, last) in spans.items():
+        span_start = datetime(first.year, first.month, first.day)
+        span_end = datetime(last.year, last.month, last.day) + timedelta(days=1)
+        series = db.query(PlantParameterReading.recorded_at, PlantParameterReading.value).filter(
+            PlantParameterReading.phase_id == phase.id,
+            PlantParameterReading.parameter == parameter,
+            PlantParameterReading.recorded_at >= span_start,
+            PlantParameterReading.recorded_at < span_end
+        ).order_by(PlantParameterReading.recorded_at).all()
+        rebuild_telemetry_rollups(
+            db, plant, phase.id, parameter,
+            np.array([row.recorded_at for row in series], dtype="datetime64[us]"),
+            np.array([row.value for row in series], dtype=float)
+        )
+    return len(rows)
+
+def get_plant_phase(db: Session, plant: str, phase_id: str):
+    phase = db.query(PLANT_MODELS[plant]).filter(PLANT_MODELS[plant].id == phase_id).first()
+    if phase is None:
+        raise HTTPException(status_code=404, detail=f"{plant.upper()} not found")
+    return phase
+
+def check_plant_parameter(plant: str, parameter: Optional[str]):
+    if parameter and parameter not in PLANT_PARAMETERS[plant]:
+        raise HTTPException(status_code=400, detail=f"Unknown {plant.upper()} parameter '{parameter}'")
+
+def ingest_plant_samples(db: Session, plant: str, phase_id: str, samples: List[PlantParameterSample]):
+    phase = get_plant_phase(db, plant, phase_id)
+    if len(samples) > PLANT_BACKFILL_MAX_SAMPLES:
+        raise HTTPException(status_code=400, detail=f"At most {PLANT_BACKFILL_MAX_SAMPLES} samples per request")
+    for sample in samples:
+        for parameter in sample.values:
+            check_plant_parameter(plant, parameter)
+    try:
+        stored = backfill_plant_parameters(db, plant, phase, samples)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error storing {plant.upper()} readings: {str(e)}")
+    return {"stored": stored}
+
+def read_plant_parameters(
+    db: Session, plant: str, phase_id: str, parameter: Optional[str],
+    start: Optional[datetime], end: Optional[datetime], skip: int, limit: int
+):
+    get_plant_phase(db, plant, phase_id)
+    check_plant_parameter(plant, parameter)
+    query = db.query(PlantParameterReading).filter(PlantParameterReading.phase_id == phase_id)
+    if parameter:
+        query = query.filter(PlantParameterReading.parameter == parameter)
+    if start:
+        query = query.filter(PlantParameterReading.recorded_at >= start)
+    if end:
+        query = query.filter(PlantParameterReading.recorded_at <= end)
+    return query.order_by(PlantParameterReading.parameter, PlantParameterReading.recorded_at).offset(skip).limit(limit).all()
+
+def read_property_plant_trends(db: Session, plant: str, property_id: str, parameter: Optional[str], period: str, days: int):
+    check_plant_parameter(plant, parameter)
+    model = PLANT_MODELS[plant]
+    phase_ids = [row.id for row in db.query(model.id).filter(model.property_id == property_id)]
+    if not phase_ids:
+        return []
+    start = datetime.utcnow() - timedelta(days=days)
+    return query_telemetry_rollups(db, plant, phase_ids, period, parameter, start)
+
+@app.post("/wtp/{wtp_id}/readings", tags=["WTP"])
+def create_wtp_readings(wtp_id: str, samples: List[PlantParameterSample], db: Session = Depends(get_db)):
+    """Log or backfill timestamped WTP parameter values; affected days' rollups are recomputed"""
+    return ingest_plant_samples(db, "wtp", wtp_id, samples)
+
+@app.get("/wtp/{wtp_id}/readings", response_model=List[PlantParameterReadingResponse], tags=["WTP"])
+def get_wtp_readings(
+    wtp_id: str,
+    parameter: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = Query(1000, le=10000),
+    db: Session = Depends(get_db)
+):
+    """Raw parameter history of a WTP phase"""
+    return read_plant_parameters(db, "wtp", wtp_id, parameter, start, end, skip, limit)
+
+@app.get("/properties/{property_id}/wtp/trends", response_model=List[TelemetryRollupResponse], tags=["WTP"])
+def get_property_wtp_trends(
+    property_id: str,
+    parameter: Optional[str] = None,
+    period: Literal["hour", "day"] = "day",
+    days: int = Query(90, ge=1, le=366),
+    db: Session = Depends(get_db)
+):
+    """Hourly or daily min/max/avg of every WTP phase of a property over the last N days"""
+    return read_property_plant_trends(db, "wtp", property_id, parameter, period, days)
+
+@app.post("/stp/{stp_id}/readings", tags=["STP"])
+def create_stp_readings(stp_id: str, samples: List[PlantParameterSample], db: Session = Depends(get_db)):
+    """Log or backfill timestamped STP parameter values; affected days' rollups are recomputed"""
+    return ingest_plant_samples(db, "stp", stp_id, samples)
+
+@app.get("/stp/{stp_id}/readings", response_model=List[PlantParameterReadingResponse], tags=["STP"])
+def get_stp_readings(
+    stp_id: str,
+    parameter: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = Query(1000, le=10000),
+    db: Session = Depends(get_db)
+):
+    """Raw parameter history of an STP phase"""
+    return read_plant_parameters(db, "stp", stp_id, parameter, start, end, skip, limit)
+
+@app.get("/properties/{property_id}/stp/trends", response_model=List[TelemetryRollupResponse], tags=["STP"])
+def get_property_stp_trends(
+    property_id: str,
+    parameter: Optional[str] = None,
+    period: Literal["hour", "day"] = "day",
+    days: int = Query(90, ge=1, le=366),
+    db: Session = Depends(get_db)
+):
+    """Hourly or daily min/max/avg of every STP phase of a property over the last N days"""
+    return read_property_plant_trends(db, "stp", property_id, parameter, period, days)
+
 @app.post("/properties/", response_model=PropertyResponse, status_code=status.HTTP_201_CREATED, tags=["Properties"])
 def create_property(property_data: PropertyCreate, db: Session = Depends(get_db)):
     db_property = Property(**property_data.dict())
@@ -2170,6 +3486,12 @@ def create_swimming_pool(pool_data: SwimmingPoolCreate, db: Session = Depends(ge
         db_pool.chlorine_updated_at = datetime.utcnow()
     
     db.add(db_pool)
+    db.flush()
+    if pool_data.ph_value is not None or pool_data.chlorine_value is not None:
+        record_swimming_pool_reading(db, db_pool, datetime.utcnow(), {
+            "ph_value": pool_data.ph_value,
+            "chlorine_value": pool_data.chlorine_value
+        })
     db.commit()
     db.refresh(db_pool)
     return db_pool
@@ -2218,6 +3540,9 @@ def update_swimming_pool(pool_id: str, pool_data: SwimmingPoolUpdate, db: Sessio
         setattr(db_pool, key, value)
     
     db_pool.updated_at = datetime.utcnow()
+    values = {metric: update_data.get(metric) for metric in SWIMMING_POOL_METRICS}
+    if any(value is not None for value in values.values()):
+        record_swimming_pool_reading(db, db_pool, db_pool.updated_at, values)
     db.commit()
     db.refresh(db_pool)
     return db_pool
@@ -2229,11 +3554,124 @@ def delete_swimming_pool(pool_id: str, db: Session = Depends(get_db)):
     if db_pool is None:
         raise HTTPException(status_code=404, detail="Swimming pool not found")
     
+    db.query(SwimmingPoolReading).filter(SwimmingPoolReading.pool_id == pool_id).delete(synchronize_session=False)
+    db.query(TelemetryRollup).filter(
+        TelemetryRollup.source == "swimming_pool",
+        TelemetryRollup.series_id == pool_id
+    ).delete(synchronize_session=False)
+    db.query(TelemetryStat).filter(
+        TelemetryStat.source == "swimming_pool",
+        TelemetryStat.series_id == pool_id
+    ).delete(synchronize_session=False)
     db.delete(db_pool)
     db.commit()
     return None
 
 
+# Swimming pool chemistry log: readings clustered by (pool_id, recorded_at), daily min/max kept in telemetry_rollups
+
+SWIMMING_POOL_METRICS = ("ph_value", "chlorine_value")
+
+class SwimmingPoolReading(Base):
+    __tablename__ = "swimming_pool_readings"
+    
+    pool_id = Column(String, ForeignKey("swimming_pools.id", ondelete="CASCADE"), primary_key=True)
+    recorded_at = Column(DateTime, primary_key=True)
+    ph_value = Column(Float, nullable=True)
+    chlorine_value = Column(Float, nullable=True)
+    
+    # No rowid: rows are stored in primary key order, so a pool's range scan reads contiguous pages
+    __table_args__ = {"sqlite_with_rowid": False}
+
+SwimmingPoolReading.__table__.create(bind=engine, checkfirst=True)
+
+class SwimmingPoolReadingCreate(BaseModel):
+    ph_value: Optional[float] = None
+    chlorine_value: Optional[float] = None
+    recorded_at: Optional[datetime] = None  # defaults to now (UTC)
+
+class SwimmingPoolReadingResponse(BaseModel):
+    pool_id: str
+    recorded_at: datetime
+    ph_value: Optional[float] = None
+    chlorine_value: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+def record_swimming_pool_reading(db: Session, pool: SwimmingPool, recorded_at: datetime, values: Dict[str, Optional[float]]) -> bool:
+    """Append one chemistry reading and fold it into the rollups; a repeated (pool, time) is ignored (caller commits)"""
+    table = SwimmingPoolReading.__table__
+    result = db.execute(
+        sqlite_insert(table).on_conflict_do_nothing(index_elements=["pool_id", "recorded_at"]),
+        {"pool_id": pool.id, "recorded_at": recorded_at, **values}
+    )
+    if not result.rowcount:
+        return False
+    record_telemetry_rollups(db, "swimming_pool", pool.id, recorded_at, values)
+    analyze_telemetry(db, pool.property_id, "swimming_pool", pool.id, recorded_at, values)
+    return True
+
+@app.post("/swimming-pools/{pool_id}/readings", response_model=SwimmingPoolReadingResponse, status_code=status.HTTP_201_CREATED, tags=["Swimming Pool"])
+def create_swimming_pool_reading(pool_id: str, reading: SwimmingPoolReadingCreate, db: Session = Depends(get_db)):
+    """Log a pH/chlorine reading; backdated readings are kept in the log without touching the pool's latest values"""
+    db_pool = db.query(SwimmingPool).filter(SwimmingPool.id == pool_id).first()
+    if db_pool is None:
+        raise HTTPException(status_code=404, detail="Swimming pool not found")
+    if reading.ph_value is None and reading.chlorine_value is None:
+        raise HTTPException(status_code=400, detail="Provide ph_value and/or chlorine_value")
+    
+    recorded_at = reading.recorded_at or datetime.utcnow()
+    if recorded_at.tzinfo is not None:
+        recorded_at = recorded_at.astimezone(timezone.utc).replace(tzinfo=None)
+    values = {metric: getattr(reading, metric) for metric in SWIMMING_POOL_METRICS}
+    if not record_swimming_pool_reading(db, db_pool, recorded_at, values):
+        raise HTTPException(status_code=400, detail="A reading already exists for this pool at that time")
+    
+    if reading.ph_value is not None and (db_pool.ph_updated_at is None or recorded_at >= db_pool.ph_updated_at):
+        db_pool.ph_value = reading.ph_value
+        db_pool.ph_updated_at = recorded_at
+    if reading.chlorine_value is not None and (db_pool.chlorine_updated_at is None or recorded_at >= db_pool.chlorine_updated_at):
+        db_pool.chlorine_value = reading.chlorine_value
+        db_pool.chlorine_updated_at = recorded_at
+    db.commit()
+    return SwimmingPoolReadingResponse(pool_id=pool_id, recorded_at=recorded_at, **values)
+
+@app.get("/swimming-pools/{pool_id}/readings", response_model=List[SwimmingPoolReadingResponse], tags=["Swimming Pool"])
+def get_swimming_pool_readings(
+    pool_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = Query(1000, le=10000),
+    db: Session = Depends(get_db)
+):
+    """Chemistry log of a pool in time order"""
+    if not db.query(SwimmingPool.id).filter(SwimmingPool.id == pool_id).first():
+        raise HTTPException(status_code=404, detail="Swimming pool not found")
+    
+    query = db.query(SwimmingPoolReading).filter(SwimmingPoolReading.pool_id == pool_id)
+    if start:
+        query = query.filter(SwimmingPoolReading.recorded_at >= start)
+    if end:
+        query = query.filter(SwimmingPoolReading.recorded_at <= end)
+    return query.order_by(SwimmingPoolReading.recorded_at).offset(skip).limit(limit).all()
+
+@app.get("/swimming-pools/{pool_id}/daily", response_model=List[TelemetryRollupResponse], tags=["Swimming Pool"])
+def get_swimming_pool_daily(
+    pool_id: str,
+    metric: Optional[Literal["ph_value", "chlorine_value"]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
+    """Per-day min/max/avg of a pool's pH and chlorine"""
+    if not db.query(SwimmingPool.id).filter(SwimmingPool.id == pool_id).first():
+        raise HTTPException(status_code=404, detail="Swimming pool not found")
+    
+    return query_telemetry_rollups(db, "swimming_pool", [pool_id], "day", metric, start, end)
+
+
 # Diesel Generator Endpoints
 @app.post("/diesel-generators/", response_model=DieselGeneratorResponse, status_code=status.HTTP_201_CREATED, tags=["Diesel Generator"])
 def create_diesel_generator(generator_data: DieselGeneratorCreate, db: Session = Depends(get_db)):
@@ -2253,6 +3691,8 @@ def create_diesel_generator(generator_data: DieselGeneratorCreate, db: Session =
     
     db_generator = DieselGenerator(**generator_data.dict())
     db.add(db_generator)
+    db.flush()
+    record_diesel_generator_reading(db, db_generator)
     db.commit()
     db.refresh(db_generator)
     return db_generator
@@ -2308,6 +3748,8 @@ def update_diesel_generator(generator_id: str, generator_data: DieselGeneratorUp
         setattr(db_generator, key, value)
     
     db_generator.updated_at = datetime.utcnow()
+    if any(field in update_data for field in DIESEL_GENERATOR_TELEMETRY_FIELDS):
+        record_diesel_generator_reading(db, db_generator)
     db.commit()
     db.refresh(db_generator)
     return db_generator
@@ -2319,11 +3761,133 @@ def delete_diesel_generator(generator_id: str, db: Session = Depends(get_db)):
     if db_generator is None:
         raise HTTPException(status_code=404, detail="Diesel generator not found")
     
+    db.query(DieselGeneratorReading).filter(DieselGeneratorReading.generator_id == generator_id).delete(synchronize_session=False)
+    db.query(TelemetryRollup).filter(
+        TelemetryRollup.source == "diesel_generator",
+        TelemetryRollup.series_id == generator_id
+    ).delete(synchronize_session=False)
+    db.query(TelemetryStat).filter(
+        TelemetryStat.source == "diesel_generator",
+        TelemetryStat.series_id == generator_id
+    ).delete(synchronize_session=False)
     db.delete(db_generator)
     db.commit()
     return None
 
 
+# Diesel generator telemetry: every create/update appends a reading, diesel_generators stays the latest-value view
+
+DIESEL_GENERATOR_TELEMETRY_FIELDS = (
+    "running_hours", "diesel_balance", "kwh_units", "battery_voltage", "voltage_line_to_line",
+    "voltage_line_to_neutral", "frequency", "oil_pressure", "rpm", "coolant_temperature", "diesel_topup",
+)
+# Cumulative meters only ever climb, so they are kept out of the outlier statistics
+DIESEL_GENERATOR_COUNTER_FIELDS = ("running_hours", "kwh_units")
+
+class DieselGeneratorReading(Base):
+    __tablename__ = "diesel_generator_readings"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    generator_id = Column(String, ForeignKey("diesel_generators.id", ondelete="CASCADE"), nullable=False)
+    property_id = Column(String, nullable=False)
+    recorded_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    running_hours = Column(Float, nullable=True)
+    diesel_balance = Column(Float, nullable=True)
+    kwh_units = Column(Float, nullable=True)
+    battery_voltage = Column(Float, nullable=True)
+    voltage_line_to_line = Column(Float, nullable=True)
+    voltage_line_to_neutral = Column(Float, nullable=True)
+    frequency = Column(Float, nullable=True)
+    oil_pressure = Column(Float, nullable=True)
+    rpm = Column(Integer, nullable=True)
+    coolant_temperature = Column(Float, nullable=True)
+    diesel_topup = Column(Float, nullable=True)
+    
+    __table_args__ = (
+        Index("ix_diesel_generator_readings_generator_time", "generator_id", "recorded_at"),
+    )
+
+DieselGeneratorReading.__table__.create(bind=engine, checkfirst=True)
+
+class DieselGeneratorReadingResponse(BaseModel):
+    id: str
+    generator_id: str
+    property_id: str
+    recorded_at: datetime
+    running_hours: Optional[float] = None
+    diesel_balance: Optional[float] = None
+    kwh_units: Optional[float] = None
+    battery_voltage: Optional[float] = None
+    voltage_line_to_line: Optional[float] = None
+    voltage_line_to_neutral: Optional[float] = None
+    frequency: Optional[float] = None
+    oil_pressure: Optional[float] = None
+    rpm: Optional[int] = None
+    coolant_temperature: Optional[float] = None
+    diesel_topup: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+def record_diesel_generator_reading(db: Session, generator: DieselGenerator) -> DieselGeneratorReading:
+    """Append the generator's current telemetry to its history and rollups (caller commits)"""
+    values = {field: getattr(generator, field) for field in DIESEL_GENERATOR_TELEMETRY_FIELDS}
+    previous = db.query(DieselGeneratorReading).filter(
+        DieselGeneratorReading.generator_id == generator.id
+    ).order_by(DieselGeneratorReading.recorded_at.desc()).first()
+    reading = DieselGeneratorReading(
+        generator_id=generator.id,
+        property_id=generator.property_id,
+        recorded_at=generator.updated_at or datetime.utcnow(),
+        **values
+    )
+    db.add(reading)
+    record_telemetry_rollups(db, "diesel_generator", generator.id, reading.recorded_at, values)
+    # An update re-sends every field; only values that moved since the last reading are new observations
+    analyze_telemetry(db, generator.property_id, "diesel_generator", generator.id, reading.recorded_at, {
+        field: value for field, value in values.items()
+        if field not in DIESEL_GENERATOR_COUNTER_FIELDS and (previous is None or getattr(previous, field) != value)
+    })
+    return reading
+
+@app.get("/diesel-generators/{generator_id}/readings", response_model=List[DieselGeneratorReadingResponse], tags=["Diesel Generator"])
+def get_diesel_generator_readings(
+    generator_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = Query(500, le=5000),
+    db: Session = Depends(get_db)
+):
+    """Raw telemetry history of a diesel generator, newest first"""
+    if not db.query(DieselGenerator.id).filter(DieselGenerator.id == generator_id).first():
+        raise HTTPException(status_code=404, detail="Diesel generator not found")
+    
+    query = db.query(DieselGeneratorReading).filter(DieselGeneratorReading.generator_id == generator_id)
+    if start:
+        query = query.filter(DieselGeneratorReading.recorded_at >= start)
+    if end:
+        query = query.filter(DieselGeneratorReading.recorded_at <= end)
+    return query.order_by(DieselGeneratorReading.recorded_at.desc()).offset(skip).limit(limit).all()
+
+@app.get("/diesel-generators/{generator_id}/rollups", response_model=List[TelemetryRollupResponse], tags=["Diesel Generator"])
+def get_diesel_generator_rollups(
+    generator_id: str,
+    period: Literal["hour", "day"] = "day",
+    metric: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
+    """Hourly or daily min/max/avg of a diesel generator's telemetry"""
+    if metric and metric not in DIESEL_GENERATOR_TELEMETRY_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric '{metric}'")
+    if not db.query(DieselGenerator.id).filter(DieselGenerator.id == generator_id).first():
+        raise HTTPException(status_code=404, detail="Diesel generator not found")
+    
+    return query_telemetry_rollups(db, "diesel_generator", [generator_id], period, metric, start, end)
+
+
 # Electricity Consumption Endpoints
 @app.post("/electricity-consumptions/", response_model=ElectricityConsumptionResponse, status_code=status.HTTP_201_CREATED, tags=["Electricity Consumption"])
 def create_electricity_consumption(consumption_data: ElectricityConsumptionCreate, db: Session = Depends(get_db)):
@@ -2362,6 +3926,8 @@ def create_electricity_consumption(consumption_data: ElectricityConsumptionCreat
     
     db_consumption = ElectricityConsumption(**consumption_data.dict())
     db.add(db_consumption)
+    db.flush()
+    record_electricity_reading(db, db_consumption, None)
     db.commit()
     db.refresh(db_consumption)
     return db_consumption
@@ -2449,10 +4015,13 @@ def update_electricity_consumption(consumption_id: str, consumption_data: Electr
                 detail=f"Electricity consumption for {new_consumption_type} '{entity_name}' already exists for this property"
             )
     
+    previous_reading = db_consumption.reading
     for key, value in update_data.items():
         setattr(db_consumption, key, value)
     
     db_consumption.updated_at = datetime.utcnow()
+    if update_data.get("reading") is not None:
+        record_electricity_reading(db, db_consumption, previous_reading)
     db.commit()
     db.refresh(db_consumption)
     return db_consumption
@@ -2464,11 +4033,205 @@ def delete_electricity_consumption(consumption_id: str, db: Session = Depends(ge
     if db_consumption is None:
         raise HTTPException(status_code=404, detail="Electricity consumption not found")
     
+    db.query(ElectricityMeterReading).filter(ElectricityMeterReading.consumption_id == consumption_id).delete(synchronize_session=False)
+    db.query(ElectricityConsumptionRollup).filter(ElectricityConsumptionRollup.consumption_id == consumption_id).delete(synchronize_session=False)
+    db.query(TelemetryStat).filter(
+        TelemetryStat.source == "electricity",
+        TelemetryStat.series_id == consumption_id
+    ).delete(synchronize_session=False)
     db.delete(db_consumption)
     db.commit()
     return None
 
 
+# Electricity meter reading history: every reading change is kept with its delta and folded into day/month rollups
+
+class ElectricityMeterReading(Base):
+    __tablename__ = "electricity_meter_readings"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    consumption_id = Column(String, ForeignKey("electricity_consumptions.id", ondelete="CASCADE"), nullable=False)
+    property_id = Column(String, nullable=False)
+    recorded_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    reading = Column(Float, nullable=False)  # in kWh
+    delta = Column(Float, nullable=True)  # kWh since the previous reading, null for the first reading or a meter reset
+    
+    __table_args__ = (
+        Index("ix_electricity_meter_readings_consumption_time", "consumption_id", "recorded_at"),
+    )
+
+class ElectricityConsumptionRollup(Base):
+    __tablename__ = "electricity_consumption_rollups"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    consumption_id = Column(String, nullable=False)
+    property_id = Column(String, nullable=False)
+    consumption_type = Column(String, nullable=False)
+    block_name = Column(String, nullable=False)
+    phase = Column(String, nullable=True)
+    period = Column(String, nullable=False)  # day or month
+    bucket = Column(String, nullable=False)  # '2024-06-09' for day, '2024-06' for month (UTC)
+    consumption = Column(Float, nullable=False, default=0)  # kWh
+    reading_count = Column(Integer, nullable=False, default=0)
+    first_reading = Column(Float, nullable=True)
+    last_reading = Column(Float, nullable=True)
+    last_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        Index("uq_electricity_consumption_rollups_bucket", "consumption_id", "period", "bucket", unique=True),
+        Index("ix_electricity_consumption_rollups_property", "property_id", "period", "bucket"),
+    )
+
+ElectricityMeterReading.__table__.create(bind=engine, checkfirst=True)
+ElectricityConsumptionRollup.__table__.create(bind=engine, checkfirst=True)
+
+class ElectricityMeterReadingResponse(BaseModel):
+    id: str
+    consumption_id: str
+    property_id: str
+    recorded_at: datetime
+    reading: float
+    delta: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+class ElectricityConsumptionRollupResponse(BaseModel):
+    consumption_id: str
+    property_id: str
+    consumption_type: str
+    block_name: str
+    phase: Optional[str] = None
+    period: str
+    bucket: str
+    consumption: float
+    reading_count: int
+    first_reading: Optional[float] = None
+    last_reading: Optional[float] = None
+    last_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+ELECTRICITY_ROLLUP_FORMATS = {"day": "%Y-%m-%d", "month": "%Y-%m"}
+
+def record_electricity_reading(db: Session, consumption: ElectricityConsumption, previous_reading: Optional[float]) -> ElectricityMeterReading:
+    """Append the meter's current reading with its delta and update the day/month rollups (caller commits)"""
+    reading_value = consumption.reading or 0
+    delta = None
+    if previous_reading is not None and reading_value >= previous_reading:
+        delta = reading_value - previous_reading
+    reading = ElectricityMeterReading(
+        consumption_id=consumption.id,
+        property_id=consumption.property_id,
+        recorded_at=consumption.updated_at or datetime.utcnow(),
+        reading=reading_value,
+        delta=delta
+    )
+    db.add(reading)
+    
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "consumption_id": consumption.id,
+            "property_id": consumption.property_id,
+            "consumption_type": consumption.consumption_type,
+            "block_name": consumption.block_name,
+            "phase": consumption.phase,
+            "period": period,
+            "bucket": reading.recorded_at.strftime(bucket_format),
+            "consumption": delta or 0,
+            "reading_count": 1,
+            "first_reading": reading_value,
+            "last_reading": reading_value,
+            "last_at": reading.recorded_at,
+        }
+        for period, bucket_format in ELECTRICITY_ROLLUP_FORMATS.items()
+    ]
+    table = ElectricityConsumptionRollup.__table__
+    stmt = sqlite_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["consumption_id", "period", "bucket"],
+        set_={
+            "consumption_type": stmt.excluded.consumption_type,
+            "block_name": stmt.excluded.block_name,
+            "phase": stmt.excluded.phase,
+            "consumption": table.c.consumption + stmt.excluded.consumption,
+            "reading_count": table.c.reading_count + 1,
+            "last_reading": stmt.excluded.last_reading,
+            "last_at": stmt.excluded.last_at,
+        },
+    )
+    db.execute(stmt, rows)
+    analyze_telemetry(db, consumption.property_id, "electricity", consumption.id, reading.recorded_at, {"consumption": delta})
+    return reading
+
+@app.get("/electricity-consumptions/{consumption_id}/readings", response_model=List[ElectricityMeterReadingResponse], tags=["Electricity Consumption"])
+def get_electricity_readings(
+    consumption_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = Query(500, le=5000),
+    db: Session = Depends(get_db)
+):
+    """Reading history of one block/STP phase meter, newest first"""
+    if not db.query(ElectricityConsumption.id).filter(ElectricityConsumption.id == consumption_id).first():
+        raise HTTPException(status_code=404, detail="Electricity consumption not found")
+    
+    query = db.query(ElectricityMeterReading).filter(ElectricityMeterReading.consumption_id == consumption_id)
+    if start:
+        query = query.filter(ElectricityMeterReading.recorded_at >= start)
+    if end:
+        query = query.filter(ElectricityMeterReading.recorded_at <= end)
+    return query.order_by(ElectricityMeterReading.recorded_at.desc()).offset(skip).limit(limit).all()
+
+@app.get("/electricity-consumptions/{consumption_id}/rollups", response_model=List[ElectricityConsumptionRollupResponse], tags=["Electricity Consumption"])
+def get_electricity_rollups(
+    consumption_id: str,
+    period: Literal["day", "month"] = "day",
+    start: Optional[str] = Query(None, description="First bucket, YYYY-MM-DD for day or YYYY-MM for month"),
+    end: Optional[str] = Query(None, description="Last bucket, YYYY-MM-DD for day or YYYY-MM for month"),
+    db: Session = Depends(get_db)
+):
+    """Daily or monthly consumption of one block/STP phase meter"""
+    if not db.query(ElectricityConsumption.id).filter(ElectricityConsumption.id == consumption_id).first():
+        raise HTTPException(status_code=404, detail="Electricity consumption not found")
+    
+    query = db.query(ElectricityConsumptionRollup).filter(
+        ElectricityConsumptionRollup.consumption_id == consumption_id,
+        ElectricityConsumptionRollup.period == period
+    )
+    if start:
+        query = query.filter(ElectricityConsumptionRollup.bucket >= start)
+    if end:
+        query = query.filter(ElectricityConsumptionRollup.bucket <= end)
+    return query.order_by(ElectricityConsumptionRollup.bucket).all()
+
+@app.get("/electricity-consumptions/property/{property_id}/monthly", response_model=List[ElectricityConsumptionRollupResponse], tags=["Electricity Consumption"])
+def get_property_monthly_electricity(
+    property_id: str,
+    start_month: Optional[str] = Query(None, description="YYYY-MM"),
+    end_month: Optional[str] = Query(None, description="YYYY-MM"),
+    db: Session = Depends(get_db)
+):
+    """Monthly consumption of every block and STP phase of a property"""
+    query = db.query(ElectricityConsumptionRollup).filter(
+        ElectricityConsumptionRollup.property_id == property_id,
+        ElectricityConsumptionRollup.period == "month"
+    )
+    if start_month:
+        query = query.filter(ElectricityConsumptionRollup.bucket >= start_month)
+    if end_month:
+        query = query.filter(ElectricityConsumptionRollup.bucket <= end_month)
+    return query.order_by(
+        ElectricityConsumptionRollup.bucket,
+        ElectricityConsumptionRollup.consumption_type,
+        ElectricityConsumptionRollup.block_name,
+        ElectricityConsumptionRollup.phase
+    ).all()
+
+
 # Diesel Stock Endpoints
 @app.post("/diesel-stocks/", response_model=DieselStockResponse, status_code=status.HTTP_201_CREATED, tags=["Diesel Stock"])
 def create_diesel_stock(stock_data: DieselStockCreate, db: Session = Depends(get_db)):
@@ -2484,6 +4247,8 @@ def create_diesel_stock(stock_data: DieselStockCreate, db: Session = Depends(get
     
     db_stock = DieselStock(**stock_data.dict())
     db.add(db_stock)
+    db.flush()
+    record_diesel_transaction(db, db_stock.property_id, "opening", db_stock.total_stock or 0, note="Opening balance")
     db.commit()
     db.refresh(db_stock)
     return db_stock
@@ -2519,24 +4284,292 @@ def update_diesel_stock(stock_id: str, stock_data: DieselStockUpdate, db: Sessio
         raise HTTPException(status_code=404, detail="Diesel stock not found")
     
     update_data = stock_data.dict(exclude_unset=True)
+    total_stock = update_data.pop("total_stock", None)
     for key, value in update_data.items():
         setattr(db_stock, key, value)
     
-    db_stock.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_stock)
-    return db_stock
+    # A hand-entered stock level becomes an adjustment entry so the ledger stays the source of truth
+    if total_stock is not None:
+        balance, _, _ = diesel_stock_balance(db, db_stock.property_id)
+        if total_stock != balance:
+            record_diesel_transaction(db, db_stock.property_id, "adjustment", total_stock - balance, note="Manual stock correction")
+        db_stock.total_stock = total_stock
+    
+    db_stock.updated_at = datetime.utcnow()
+    db.commit()
+    db.refresh(db_stock)
+    return db_stock
+
+
+@app.delete("/diesel-stocks/{stock_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Diesel Stock"])
+def delete_diesel_stock(stock_id: str, db: Session = Depends(get_db)):
+    db_stock = db.query(DieselStock).filter(DieselStock.id == stock_id).first()
+    if db_stock is None:
+        raise HTTPException(status_code=404, detail="Diesel stock not found")
+    
+    db.delete(db_stock)
+    db.commit()
+    return None
+
+
+# Diesel stock ledger: purchases, DG top-ups, consumption and adjustments, with periodic balance snapshots
+
+DIESEL_TRANSACTION_KINDS = ("opening", "purchase", "topup", "consumption", "adjustment")
+DIESEL_SNAPSHOT_INTERVAL = 50  # transactions between balance snapshots
+
+class DieselStockTransaction(Base):
+    __tablename__ = "diesel_stock_transactions"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    property_id = Column(String, ForeignKey("properties.id", ondelete="CASCADE"), nullable=False)
+    generator_id = Column(String, ForeignKey("diesel_generators.id"), nullable=True)  # for topup and consumption
+    kind = Column(String, nullable=False)  # opening, purchase, topup, consumption, adjustment
+    quantity = Column(Float, nullable=False)  # in liters, as entered
+    stock_delta = Column(Float, nullable=False)  # effect on the store stock: +purchase, -topup, 0 for consumption
+    note = Column(String, nullable=True)
+    recorded_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_diesel_stock_transactions_property_time", "property_id", "recorded_at"),
+    )
+
+class DieselStockSnapshot(Base):
+    __tablename__ = "diesel_stock_snapshots"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    property_id = Column(String, nullable=False)
+    as_of = Column(DateTime, nullable=False)  # covers every transaction recorded at or before this time
+    balance = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_diesel_stock_snapshots_property_time", "property_id", "as_of"),
+    )
+
+DieselStockTransaction.__table__.create(bind=engine, checkfirst=True)
+DieselStockSnapshot.__table__.create(bind=engine, checkfirst=True)
+
+class DieselStockTransactionCreate(BaseModel):
+    property_id: str
+    kind: Literal["purchase", "topup", "consumption", "adjustment"]
+    quantity: float  # liters; adjustments may be negative
+    generator_id: Optional[str] = None
+    note: Optional[str] = None
+    recorded_at: Optional[datetime] = None  # defaults to now (UTC); may be backdated
+
+class DieselStockTransactionResponse(BaseModel):
+    id: str
+    property_id: str
+    generator_id: Optional[str] = None
+    kind: str
+    quantity: float
+    stock_delta: float
+    note: Optional[str] = None
+    recorded_at: datetime
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class DieselStockBalanceResponse(BaseModel):
+    property_id: str
+    balance: float
+    snapshot_as_of: Optional[datetime] = None
+    snapshot_balance: Optional[float] = None
+    transactions_since_snapshot: int
+
+class DieselStockMonthResponse(BaseModel):
+    month: str
+    purchased: float
+    topped_up: float
+    consumed: float
+    adjusted: float
+    net_change: float
+    closing_balance: float
+
+def diesel_stock_balance(db: Session, property_id: str):
+    """Current store stock from the latest snapshot plus the transactions recorded after it"""
+    snapshot = db.query(DieselStockSnapshot).filter(
+        DieselStockSnapshot.property_id == property_id
+    ).order_by(DieselStockSnapshot.as_of.desc()).first()
+    query = db.query(
+        func.coalesce(func.sum(DieselStockTransaction.stock_delta), 0),
+        func.count(DieselStockTransaction.id)
+    ).filter(DieselStockTransaction.property_id == property_id)
+    if snapshot:
+        query = query.filter(DieselStockTransaction.recorded_at > snapshot.as_of)
+    delta, count = query.one()
+    if snapshot is None and count == 0:
+        # No ledger yet: the hand-entered stock is the balance until the first entry records it as the opening
+        stock = db.query(DieselStock).filter(DieselStock.property_id == property_id).first()
+        return (stock.total_stock or 0) if stock else 0, None, 0
+    return (snapshot.balance if snapshot else 0) + delta, snapshot, count
+
+def record_diesel_transaction(
+    db: Session,
+    property_id: str,
+    kind: str,
+    quantity: float,
+    generator_id: Optional[str] = None,
+    note: Optional[str] = None,
+    recorded_at: Optional[datetime] = None
+) -> DieselStockTransaction:
+    """Append a ledger entry, keep the snapshots valid and sync DieselStock.total_stock (caller commits)"""
+    recorded_at = recorded_at or datetime.utcnow()
+    stock = db.query(DieselStock).filter(DieselStock.property_id == property_id).first()
+    
+    # Properties that predate the ledger start from their hand-entered stock
+    if kind != "opening" and not db.query(DieselStockTransaction.id).filter(DieselStockTransaction.property_id == property_id).first():
+        opening_at = min(stock.created_at or recorded_at, recorded_at) if stock else recorded_at
+        db.add(DieselStockTransaction(
+            property_id=property_id, kind="opening", quantity=stock.total_stock if stock else 0,
+            stock_delta=stock.total_stock if stock else 0, recorded_at=opening_at, note="Opening balance"
+        ))
+    
+    stock_delta = {"opening": quantity, "purchase": quantity, "topup": -quantity, "consumption": 0, "adjustment": quantity}[kind]
+    transaction = DieselStockTransaction(
+        property_id=property_id, generator_id=generator_id, kind=kind, quantity=quantity,
+        stock_delta=stock_delta, note=note, recorded_at=recorded_at
+    )
+    db.add(transaction)
+    
+    # A backdated entry invalidates every snapshot that should have included it
+    db.query(DieselStockSnapshot).filter(
+        DieselStockSnapshot.property_id == property_id,
+        DieselStockSnapshot.as_of >= recorded_at
+    ).delete(synchronize_session=False)
+    db.flush()
+    
+    balance, snapshot, since_snapshot = diesel_stock_balance(db, property_id)
+    if since_snapshot >= DIESEL_SNAPSHOT_INTERVAL:
+        as_of = db.query(func.max(DieselStockTransaction.recorded_at)).filter(
+            DieselStockTransaction.property_id == property_id
+        ).scalar()
+        db.add(DieselStockSnapshot(property_id=property_id, as_of=as_of, balance=balance))
+    if stock:
+        stock.total_stock = balance
+        if kind == "purchase":
+            stock.purchase_amount = quantity
+        stock.updated_at = datetime.utcnow()
+    return transaction
+
+@app.post("/diesel-stock-transactions/", response_model=DieselStockTransactionResponse, status_code=status.HTTP_201_CREATED, tags=["Diesel Stock"])
+def create_diesel_stock_transaction(transaction: DieselStockTransactionCreate, db: Session = Depends(get_db)):
+    """Record a purchase, a DG top-up, DG consumption or a stock adjustment"""
+    try:
+        if not db.query(Property.id).filter(Property.id == transaction.property_id).first():
+            raise HTTPException(status_code=404, detail="Property not found")
+        if transaction.kind != "adjustment" and transaction.quantity <= 0:
+            raise HTTPException(status_code=400, detail="quantity must be positive")
+        
+        generator = None
+        if transaction.kind in ("topup", "consumption"):
+            if not transaction.generator_id:
+                raise HTTPException(status_code=400, detail=f"generator_id is required for {transaction.kind}")
+            generator = db.query(DieselGenerator).filter(
+                DieselGenerator.id == transaction.generator_id,
+                DieselGenerator.property_id == transaction.property_id
+            ).first()
+            if generator is None:
+                raise HTTPException(status_code=404, detail="Diesel generator not found")
+        
+        if transaction.kind == "topup":
+            balance, _, _ = diesel_stock_balance(db, transaction.property_id)
+            if transaction.quantity > balance:
+                raise HTTPException(status_code=400, detail=f"Top-up of {transaction.quantity:g} L exceeds the {balance:g} L in stock")
+        
+        recorded_at = transaction.recorded_at
+        if recorded_at is not None and recorded_at.tzinfo is not None:
+            recorded_at = recorded_at.astimezone(timezone.utc).replace(tzinfo=None)
+        db_transaction = record_diesel_transaction(
+            db, transaction.property_id, transaction.kind, transaction.quantity,
+            transaction.generator_id, transaction.note, recorded_at
+        )
+        
+        # Top-ups and consumption also move the generator's own tank level
+        if generator is not None:
+            if transaction.kind == "topup":
+                generator.diesel_topup = transaction.quantity
+                generator.diesel_balance = (generator.diesel_balance or 0) + transaction.quantity
+            else:
+                generator.diesel_balance = max((generator.diesel_balance or 0) - transaction.quantity, 0)
+            generator.updated_at = datetime.utcnow()
+            record_diesel_generator_reading(db, generator)
+        
+        db.commit()
+        db.refresh(db_transaction)
+        return db_transaction
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error recording diesel transaction: {str(e)}")
 
+@app.get("/diesel-stock-transactions/", response_model=List[DieselStockTransactionResponse], tags=["Diesel Stock"])
+def get_diesel_stock_transactions(
+    property_id: str,
+    kind: Optional[str] = None,
+    generator_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = Query(100, le=1000),
+    db: Session = Depends(get_db)
+):
+    """Ledger entries of a property, newest first"""
+    query = db.query(DieselStockTransaction).filter(DieselStockTransaction.property_id == property_id)
+    if kind:
+        query = query.filter(DieselStockTransaction.kind == kind)
+    if generator_id:
+        query = query.filter(DieselStockTransaction.generator_id == generator_id)
+    if start:
+        query = query.filter(DieselStockTransaction.recorded_at >= start)
+    if end:
+        query = query.filter(DieselStockTransaction.recorded_at <= end)
+    return query.order_by(DieselStockTransaction.recorded_at.desc()).offset(skip).limit(limit).all()
+
+@app.get("/diesel-stocks/property/{property_id}/balance", response_model=DieselStockBalanceResponse, tags=["Diesel Stock"])
+def get_diesel_stock_balance(property_id: str, db: Session = Depends(get_db)):
+    """Current store stock computed from the latest snapshot and the entries after it"""
+    balance, snapshot, since_snapshot = diesel_stock_balance(db, property_id)
+    return DieselStockBalanceResponse(
+        property_id=property_id,
+        balance=balance,
+        snapshot_as_of=snapshot.as_of if snapshot else None,
+        snapshot_balance=snapshot.balance if snapshot else None,
+        transactions_since_snapshot=since_snapshot
+    )
 
-@app.delete("/diesel-stocks/{stock_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Diesel Stock"])
-def delete_diesel_stock(stock_id: str, db: Session = Depends(get_db)):
-    db_stock = db.query(DieselStock).filter(DieselStock.id == stock_id).first()
-    if db_stock is None:
-        raise HTTPException(status_code=404, detail="Diesel stock not found")
-    
-    db.delete(db_stock)
-    db.commit()
-    return None
+@app.get("/diesel-stocks/property/{property_id}/monthly", response_model=List[DieselStockMonthResponse], tags=["Diesel Stock"])
+def get_diesel_stock_monthly(
+    property_id: str,
+    start_month: Optional[str] = Query(None, description="YYYY-MM"),
+    end_month: Optional[str] = Query(None, description="YYYY-MM"),
+    db: Session = Depends(get_db)
+):
+    """Purchases, top-ups and consumption per month with the running closing stock"""
+    rows = db.execute(text("""
+        SELECT month, purchased, topped_up, consumed, adjusted, net_change,
+               SUM(net_change) OVER (ORDER BY month) AS closing_balance
+        FROM (
+            SELECT strftime('%Y-%m', recorded_at) AS month,
+                   SUM(CASE WHEN kind = 'purchase' THEN quantity ELSE 0 END) AS purchased,
+                   SUM(CASE WHEN kind = 'topup' THEN quantity ELSE 0 END) AS topped_up,
+                   SUM(CASE WHEN kind = 'consumption' THEN quantity ELSE 0 END) AS consumed,
+                   SUM(CASE WHEN kind IN ('opening', 'adjustment') THEN quantity ELSE 0 END) AS adjusted,
+                   SUM(stock_delta) AS net_change
+            FROM diesel_stock_transactions
+            WHERE property_id = :property_id
+            GROUP BY month
+        )
+        ORDER BY month
+    """), {"property_id": property_id}).mappings().all()
+    return [
+        DieselStockMonthResponse(**row) for row in rows
+        if (not start_month or row["month"] >= start_month) and (not end_month or row["month"] <= end_month)
+    ]
 
 
 # Dashboard and Summary Endpoints
@@ -2648,13 +4681,8 @@ def get_property_dashboard(property_id: str, db: Session = Depends(get_db)):
 
 # --- Health check endpoint ---
 
-def generate_asset_pdf_and_qr(asset_id: str, db: Session):
-    asset = db.query(Asset).filter(Asset.id == asset_id).first()
-    property = db.query(Property).filter(Property.id == asset.property_id).first()
-    
-    if not asset:
-        raise HTTPException(status_code=404, detail="Asset not found")
-    
+def render_asset_pdf_and_qr(asset: Asset, property_name: str):
+    """Write the asset's PDF sheet and QR code image to disk"""
     # Create PDF
     pdf = FPDF()
     pdf.add_page()
@@ -2668,7 +4696,7 @@ def generate_asset_pdf_and_qr(asset_id: str, db: Session):
     
     # Property details
     pdf.set_font("Arial", "B", 12)
-    pdf.cell(0, 10, f"Property: {property.name}", 0, 1)
+    pdf.cell(0, 10, f"Property: {property_name}", 0, 1)
     
     # Asset details
     pdf.set_font("Arial", "", 12)
@@ -2712,6 +4740,17 @@ def generate_asset_pdf_and_qr(asset_id: str, db: Session):
     qr_filename = f"assets/qr/qr_{asset.id}.png"
     img.save(qr_filename)
     
+    return pdf_filename, qr_filename
+
+def generate_asset_pdf_and_qr(asset_id: str, db: Session):
+    asset = db.query(Asset).filter(Asset.id == asset_id).first()
+    property = db.query(Property).filter(Property.id == asset.property_id).first()
+    
+    if not asset:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    
+    pdf_filename, qr_filename = render_asset_pdf_and_qr(asset, property.name)
+    
     # Update asset with QR code URL
     asset.qr_code_url = f"{BASE_URL}/assets/qr/{asset.id}"
     db.commit()
@@ -3116,6 +5155,234 @@ def regenerate_inventory_files(
     db.refresh(inventory)
     return inventory
 
+# --- Bulk Asset and Inventory Import ---
+
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import UploadFile, File
+from openpyxl import load_workbook
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_ROWS = 50000
+IMPORT_MAX_REPORTED_ERRORS = 500
+IMPORT_RENDER_BATCH_SIZE = 200
+IMPORT_RENDER_WORKERS = 2
+
+_import_render_executor = None
+
+def get_import_render_executor():
+    """Lazily start the process pool that renders imported assets' PDFs and QR codes off the API process.
+
+    Kept apart from the report render pool, so a large import never queues ahead of an interactive download.
+    """
+    global _import_render_executor
+    if _import_render_executor is None:
+        _import_render_executor = ProcessPoolExecutor(max_workers=IMPORT_RENDER_WORKERS)
+    return _import_render_executor
+
+class BulkImportRowError(BaseModel):
+    row: int  # spreadsheet line number, the header being line 1
+    errors: List[str]
+
+class BulkImportResponse(BaseModel):
+    received: int
+    inserted: int
+    error_count: int
+    errors: List[BulkImportRowError]  # first IMPORT_MAX_REPORTED_ERRORS errors only
+    artifacts_queued: int
+
+def iter_upload_rows(upload: UploadFile):
+    """Yield (line_number, row_dict) from a CSV or XLSX upload without loading the whole file"""
+    filename = (upload.filename or "").lower()
+    if filename.endswith(".xlsx") or "spreadsheetml" in (upload.content_type or ""):
+        try:
+            workbook = load_workbook(upload.file, read_only=True, data_only=True)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Could not read the XLSX file")
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+            for line_number, values in enumerate(rows, start=2):
+                row = {
+                    key: value.strip() if isinstance(value, str) else value
+                    for key, value in zip(header, values)
+                    if key and value is not None and value != ""
+                }
+                if row:
+                    yield line_number, row
+        finally:
+            workbook.close()
+    elif filename.endswith(".csv") or "csv" in (upload.content_type or ""):
+        reader = csv.DictReader(io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline=""))
+        try:
+            for row in reader:
+                row = {
+                    key.strip(): value.strip()
+                    for key, value in row.items()
+                    if key and isinstance(value, str) and value.strip()
+                }
+                if row:
+                    yield reader.line_num, row
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+    else:
+        raise HTTPException(status_code=400, detail="Upload a .csv or .xlsx file")
+
+def bulk_import_rows(db: Session, upload: UploadFile, schema, table, unique_column, property_id: str, build_row, atomic: bool) -> dict:
+    """Validate uploaded rows against schema, check unique_column against one preloaded set and insert in chunks.
+
+    Everything runs in one transaction; chunks are flushed with executemany as they fill up.
+    """
+    # Preload existing keys once instead of one uniqueness SELECT per row
+    seen = {value for (value,) in db.query(unique_column).yield_per(IMPORT_CHUNK_SIZE) if value is not None}
+
+    received = 0
+    inserted_ids: List[str] = []
+    errors: List[dict] = []
+    error_count = 0
+    chunk: List[dict] = []
+    now = datetime.utcnow()
+
+    try:
+        for line_number, raw in iter_upload_rows(upload):
+            received += 1
+            if received > IMPORT_MAX_ROWS:
+                raise HTTPException(status_code=413, detail=f"At most {IMPORT_MAX_ROWS} rows per import")
+
+            row_errors = []
+            record = None
+            try:
+                record = schema(**{**raw, "property_id": property_id})
+            except ValidationError as e:
+                row_errors = [f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()]
+
+            if record is not None:
+                key = getattr(record, unique_column.key)
+                if key in seen:
+                    row_errors.append(f"{unique_column.key}: '{key}' already exists")
+                else:
+                    seen.add(key)
+
+            if row_errors:
+                error_count += 1
+                if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+                    errors.append({"row": line_number, "errors": row_errors})
+                continue
+            if atomic and error_count:
+                continue
+
+            row_id = str(uuid.uuid4())
+            chunk.append({**record.dict(), **build_row(row_id), "id": row_id, "created_at": now, "updated_at": now})
+            inserted_ids.append(row_id)
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                db.execute(table.insert(), chunk)
+                chunk = []
+
+        if atomic and error_count:
+            db.rollback()
+            inserted_ids = []
+        else:
+            if chunk:
+                db.execute(table.insert(), chunk)
+            log_bulk_inserts(db, table.name, inserted_ids)
+            db.commit()
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error importing rows: {str(e)}")
+
+    return {
+        "received": received,
+        "inserted": len(inserted_ids),
+        "inserted_ids": inserted_ids,
+        "error_count": error_count,
+        "errors": errors,
+    }
+
+def render_import_artifact_batch(kind: str, rows: List[dict], property_name: str, base_url: str) -> int:
+    """Render PDFs and QR codes for a batch of imported rows (plain dicts). Runs inside the render pool."""
+    rendered = 0
+    for row in rows:
+        try:
+            if kind == "asset":
+                render_asset_pdf_and_qr(Asset(**row), property_name)
+            else:
+                generate_pdf(row["id"], row)
+                generate_qr_code(base_url, row["id"])
+            rendered += 1
+        except Exception:
+            # The PDF/QR download endpoints regenerate missing files on demand
+            continue
+    return rendered
+
+def render_import_artifacts(kind: str, ids: List[str], property_name: str, base_url: str):
+    """Render every artifact of an import as one batch job, fanned out over the render pool"""
+    model = Asset if kind == "asset" else Inventory
+    columns = [column.name for column in model.__table__.columns]
+    db = SessionLocal()
+    try:
+        futures = []
+        for start in range(0, len(ids), IMPORT_RENDER_BATCH_SIZE):
+            chunk_ids = ids[start:start + IMPORT_RENDER_BATCH_SIZE]
+            rows = db.query(*[getattr(model, column) for column in columns]).filter(model.id.in_(chunk_ids)).all()
+            batch = [dict(zip(columns, row)) for row in rows]
+            futures.append(get_import_render_executor().submit(render_import_artifact_batch, kind, batch, property_name, base_url))
+        for future in futures:
+            future.result()
+    finally:
+        db.close()
+
+@app.post("/assets/import", response_model=BulkImportResponse, tags=["Assets"])
+def import_assets(
+    background_tasks: BackgroundTasks,
+    property_id: str = Query(..., description="Property the imported assets belong to"),
+    file: UploadFile = File(..., description="CSV or XLSX with AssetCreate column headers"),
+    atomic: bool = Query(False, description="Import nothing if any row is invalid"),
+    db: Session = Depends(get_db)
+):
+    """Import an asset register from a CSV/XLSX file"""
+    property = db.query(Property).filter(Property.id == property_id).first()
+    if not property:
+        raise HTTPException(status_code=404, detail="Property not found")
+
+    result = bulk_import_rows(
+        db, file, AssetCreate, Asset.__table__, Asset.tag_number, property_id,
+        lambda row_id: {"qr_code_url": f"{BASE_URL}/assets/qr/{row_id}"},
+        atomic,
+    )
+
+    # One background job renders every PDF/QR instead of one task (and commit) per asset
+    if result["inserted_ids"]:
+        background_tasks.add_task(render_import_artifacts, "asset", result["inserted_ids"], property.name, BASE_URL)
+    result["artifacts_queued"] = len(result.pop("inserted_ids"))
+    return result
+
+@app.post("/inventory/import", response_model=BulkImportResponse, tags=["Inventory"])
+def import_inventory(
+    background_tasks: BackgroundTasks,
+    property_id: str = Query(..., description="Property the imported stock belongs to"),
+    file: UploadFile = File(..., description="CSV or XLSX with InventoryCreate column headers"),
+    atomic: bool = Query(False, description="Import nothing if any row is invalid"),
+    base_url: str = Query("https://server.prktechindia.in", description="Base URL for QR code generation"),
+    db: Session = Depends(get_db)
+):
+    """Import inventory items from a CSV/XLSX file"""
+    property_exists = db.query(Property).filter(Property.id == property_id).first()
+    if not property_exists:
+        raise HTTPException(status_code=404, detail="Property not found")
+
+    result = bulk_import_rows(
+        db, file, InventoryCreate, Inventory.__table__, Inventory.stock_id, property_id,
+        lambda row_id: {"qr_code_url": f"{base_url}/inventory/pdf/{row_id}"},
+        atomic,
+    )
+
+    if result["inserted_ids"]:
+        background_tasks.add_task(render_import_artifacts, "inventory", result["inserted_ids"], property_exists.name, base_url)
+    result["artifacts_queued"] = len(result.pop("inserted_ids"))
+    return result
+
 # Initialize database tables
 
 @app.get("/health", tags=["Health Check"])
@@ -3180,6 +5447,9 @@ def delete_checklist(id: str, db: Session = Depends(get_db)):
     return {"message": "Deleted"}
 
 # ... existing code ...
+from sqlalchemy import Index, inspect, text, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
 class DailyTaskChecklistStatus(Base):
     __tablename__ = "daily_task_checklist_status"
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -3189,6 +5459,33 @@ class DailyTaskChecklistStatus(Base):
     updated_by = Column(String)  # user_id or name
     updated_at = Column(DateTime, default=datetime.utcnow)
     checklist = relationship("DailyTaskChecklist", backref="statuses")
+    __table_args__ = (
+        Index("uq_daily_task_checklist_status_period", "checklist_id", "period", unique=True),
+    )
+
+DailyTaskChecklistStatus.__table__.create(bind=engine, checkfirst=True)
+
+def ensure_checklist_status_unique_index():
+    """Drop duplicate (checklist_id, period) rows, keeping the latest, then add the unique index"""
+    index = next(ix for ix in DailyTaskChecklistStatus.__table__.indexes if ix.name == "uq_daily_task_checklist_status_period")
+    if index.name in {ix["name"] for ix in inspect(engine).get_indexes(DailyTaskChecklistStatus.__tablename__)}:
+        return
+    with engine.begin() as conn:
+        conn.execute(text("""
+            DELETE FROM daily_task_checklist_status
+            WHERE rowid NOT IN (
+                SELECT rowid FROM (
+                    SELECT rowid, ROW_NUMBER() OVER (
+                        PARTITION BY checklist_id, period
+                        ORDER BY updated_at DESC, rowid DESC
+                    ) AS rn
+                    FROM daily_task_checklist_status
+                ) WHERE rn = 1
+            )
+        """))
+        index.create(bind=conn, checkfirst=True)
+
+ensure_checklist_status_unique_index()
 
 # ... existing code ...
 class DailyTaskChecklistStatusBase(BaseModel):
@@ -3206,23 +5503,80 @@ class DailyTaskChecklistStatusResponse(DailyTaskChecklistStatusBase):
     class Config:
         from_attributes = True
 
+DAILY_TASK_STATUS_BATCH_MAX = 1000
+
+def upsert_checklist_statuses(db: Session, items: List[DailyTaskChecklistStatusCreate]):
+    """Insert or update statuses keyed on (checklist_id, period) in one statement; the last item per key wins"""
+    now = datetime.utcnow()
+    latest = {(item.checklist_id, item.period): item for item in items}
+    rows = [
+        {"id": str(uuid.uuid4()), "updated_at": now, **item.dict()}
+        for item in latest.values()
+    ]
+    # The upsert bypasses the ORM events, so read the rows it will overwrite to log what changed
+    existing = {
+        (row.checklist_id, row.period): row
+        for row in db.query(
+            DailyTaskChecklistStatus.id, DailyTaskChecklistStatus.checklist_id, DailyTaskChecklistStatus.period,
+            DailyTaskChecklistStatus.status, DailyTaskChecklistStatus.updated_by
+        ).filter(tuple_(DailyTaskChecklistStatus.checklist_id, DailyTaskChecklistStatus.period).in_(list(latest)))
+    }
+    inserted, updated = [], {}
+    for row in rows:
+        old = existing.get((row["checklist_id"], row["period"]))
+        if old is None:
+            inserted.append(row["id"])
+            continue
+        diff = {field: (getattr(old, field), row[field]) for field in ("status", "updated_by") if getattr(old, field) != row[field]}
+        if diff:
+            updated[old.id] = diff
+    stmt = sqlite_insert(DailyTaskChecklistStatus.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["checklist_id", "period"],
+        set_={
+            "status": stmt.excluded.status,
+            "updated_by": stmt.excluded.updated_by,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(stmt, rows)
+    log_bulk_inserts(db, DailyTaskChecklistStatus.__tablename__, inserted)
+    log_bulk_writes(db, DailyTaskChecklistStatus.__tablename__, "update", updated)
+    return list(latest)
+
 # ... existing code ...
 @app.post("/daily-task-checklist-status/", response_model=DailyTaskChecklistStatusResponse, tags=["Daily Task Checklist Status"])
 def create_or_update_status(item: DailyTaskChecklistStatusCreate, db: Session = Depends(get_db)):
-    status_obj = db.query(DailyTaskChecklistStatus).filter(
+    upsert_checklist_statuses(db, [item])
+    db.commit()
+    return db.query(DailyTaskChecklistStatus).filter(
         DailyTaskChecklistStatus.checklist_id == item.checklist_id,
         DailyTaskChecklistStatus.period == item.period
     ).first()
-    if status_obj:
-        status_obj.status = item.status
-        status_obj.updated_by = item.updated_by
-        status_obj.updated_at = datetime.utcnow()
-    else:
-        status_obj = DailyTaskChecklistStatus(**item.dict())
-        db.add(status_obj)
-    db.commit()
-    db.refresh(status_obj)
-    return status_obj
+
+@app.post("/daily-task-checklist-status/batch", response_model=List[DailyTaskChecklistStatusResponse], tags=["Daily Task Checklist Status"])
+def create_or_update_statuses(items: List[DailyTaskChecklistStatusCreate], db: Session = Depends(get_db)):
+    """Upsert a whole round of checklist statuses in one transaction"""
+    if not items:
+        return []
+    if len(items) > DAILY_TASK_STATUS_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {DAILY_TASK_STATUS_BATCH_MAX} statuses per batch")
+    checklist_ids = {item.checklist_id for item in items}
+    found = {
+        row.id for row in db.query(DailyTaskChecklist.id).filter(DailyTaskChecklist.id.in_(checklist_ids))
+    }
+    missing = sorted(checklist_ids - found)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Checklist not found: {', '.join(missing)}")
+    try:
+        keys = upsert_checklist_statuses(db, items)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error saving checklist statuses: {str(e)}")
+    return db.query(DailyTaskChecklistStatus).filter(
+        tuple_(DailyTaskChecklistStatus.checklist_id, DailyTaskChecklistStatus.period).in_(keys)
+    ).all()
 
 @app.get("/daily-task-checklist-status/{checklist_id}", response_model=List[DailyTaskChecklistStatusResponse], tags=["Daily Task Checklist Status"])
 def get_statuses(checklist_id: str, db: Session = Depends(get_db)):
@@ -3317,7 +5671,7 @@ class DailySummaryReportResponse(DailySummaryReportBase):
     created_at: datetime
     updated_at: datetime
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 from fastapi import Body
 
@@ -3394,6 +5748,8 @@ def get_daily_summaries_by_property_and_date(property_id: str, date: str, db: Se
 
 # --- Utility Panel Models, Schemas, and Endpoints ---
 
+from sqlalchemy import case
+
 class UtilityPanelCheckPoint(Base):
     __tablename__ = "utility_panel_checkpoints"
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -3456,6 +5812,10 @@ class CheckPointUpdate(BaseModel):
     frequency: Optional[str] = None
     daily_status: Optional[Dict[str, str]] = None
 
+class CheckPointDayStatusUpdate(BaseModel):
+    day: str  # day of the month, "1".."31" or "01".."31"
+    statuses: Dict[str, str]  # checkpoint_id -> status for that day
+
 class CheckPointResponse(CheckPointSchema):
     id: str
     utility_panel_id: str
@@ -3755,6 +6115,7 @@ def create_checkpoint(utility_panel_id: str, checkpoint: CheckPointCreate, db: S
         )
         
         db.add(db_checkpoint)
+        utility_panel.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(db_checkpoint)
         return db_checkpoint
@@ -3820,6 +6181,7 @@ def update_checkpoint(utility_panel_id: str, checkpoint_id: str, checkpoint_upda
             setattr(checkpoint, key, value)
         
         checkpoint.updated_at = datetime.utcnow()
+        db.query(UtilityPanel).filter(UtilityPanel.id == utility_panel_id).update({UtilityPanel.updated_at: checkpoint.updated_at})
         db.commit()
         db.refresh(checkpoint)
         return checkpoint
@@ -3843,6 +6205,7 @@ def delete_checkpoint(utility_panel_id: str, checkpoint_id: str, db: Session = D
             raise HTTPException(status_code=404, detail="Checkpoint not found")
         
         db.delete(checkpoint)
+        db.query(UtilityPanel).filter(UtilityPanel.id == utility_panel_id).update({UtilityPanel.updated_at: datetime.utcnow()})
         db.commit()
         return None
         
@@ -3852,6 +6215,67 @@ def delete_checkpoint(utility_panel_id: str, checkpoint_id: str, db: Session = D
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting checkpoint: {str(e)}")
 
+@app.patch("/utility-panels/{utility_panel_id}/daily-status", tags=["Utility Panel Checkpoints"])
+def update_checkpoints_day_status(utility_panel_id: str, day_update: CheckPointDayStatusUpdate, db: Session = Depends(get_db)):
+    """Set one day's status on many checkpoints of a panel without rewriting the rest of daily_status"""
+    try:
+        if not day_update.day.isdigit() or not 1 <= int(day_update.day) <= 31:
+            raise HTTPException(status_code=400, detail="day must be between 1 and 31")
+        day = f"{int(day_update.day):02d}"
+        if not day_update.statuses:
+            return {"day": day, "updated": 0}
+        
+        utility_panel = db.query(UtilityPanel).filter(UtilityPanel.id == utility_panel_id).first()
+        if not utility_panel:
+            raise HTTPException(status_code=404, detail="Utility panel not found")
+        
+        # The bulk UPDATE bypasses the ORM events, so read the day's current statuses to log what changed
+        previous = dict(db.query(
+            UtilityPanelCheckPoint.id, func.json_extract(UtilityPanelCheckPoint.daily_status, f'$."{day}"')
+        ).filter(
+            UtilityPanelCheckPoint.utility_panel_id == utility_panel_id,
+            UtilityPanelCheckPoint.id.in_(list(day_update.statuses))
+        ).all())
+        
+        # One UPDATE: json_set touches only the day's key, the CASE picks each checkpoint's status
+        now = datetime.utcnow()
+        updated = db.query(UtilityPanelCheckPoint).filter(
+            UtilityPanelCheckPoint.utility_panel_id == utility_panel_id,
+            UtilityPanelCheckPoint.id.in_(list(day_update.statuses))
+        ).update({
+            UtilityPanelCheckPoint.daily_status: func.json_set(
+                UtilityPanelCheckPoint.daily_status,
+                f'$."{day}"',
+                case(day_update.statuses, value=UtilityPanelCheckPoint.id)
+            ),
+            UtilityPanelCheckPoint.updated_at: now
+        }, synchronize_session=False)
+        
+        if updated != len(day_update.statuses):
+            db.rollback()
+            found = {
+                row.id for row in db.query(UtilityPanelCheckPoint.id).filter(
+                    UtilityPanelCheckPoint.utility_panel_id == utility_panel_id,
+                    UtilityPanelCheckPoint.id.in_(list(day_update.statuses))
+                )
+            }
+            missing = sorted(set(day_update.statuses) - found)
+            raise HTTPException(status_code=404, detail=f"Checkpoint not found: {', '.join(missing)}")
+        
+        log_bulk_writes(db, UtilityPanelCheckPoint.__tablename__, "update", {
+            checkpoint_id: {f"daily_status.{day}": (old, day_update.statuses[checkpoint_id])}
+            for checkpoint_id, old in previous.items() if old != day_update.statuses[checkpoint_id]
+        })
+        utility_panel.updated_at = now
+        db.commit()
+        return {"day": day, "updated": updated}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error updating checkpoint status: {str(e)}")
+
 # Additional utility endpoints
 
 @app.get("/utility-panels/property/{property_id}/month/{month}", response_model=List[UtilityPanelResponse], tags=["Utility Panel"])
@@ -4720,7 +7144,7 @@ class IncidentReportResponse(BaseModel):
     evidence_attachments: Optional[EvidenceResponse] = None
     root_cause_analysis: List[RootCauseResponse] = []
     immediate_actions: List[ImmediateActionResponse] = []
-    corrective_preventive_actions: List[CorrectiveActionResponse] = []
+    corrective_preventive_actions: List[CorrectiveActionResponse] = Field([], validation_alias="corrective_actions")
     incident_classification: Optional[ClassificationResponse] = None
     client_communication: Optional[ClientCommunicationResponse] = None
     approvals_signatures: List[ApprovalResponse] = []
@@ -4870,11 +7294,19 @@ def get_all_incident_reports(
     risk_level: Optional[str] = None,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
+    include: Optional[str] = Query(None, description="Comma-separated child collections to return, empty for headers only"),
     db: Session = Depends(get_db)
 ):
     """Get all incident reports with optional filtering"""
+    includes = IncludedRelationships(IncidentReportResponse, IncidentReport, include)
     try:
-        query = db.query(IncidentReport)
+        # The type and risk filters below read these children on every report
+        needed = []
+        if incident_type:
+            needed.append("site_details")
+        if risk_level:
+            needed.append("incident_classification")
+        query = includes.apply(db.query(IncidentReport), *needed)
         
         if property_id:
             query = query.filter(IncidentReport.property_id == property_id)
@@ -4902,9 +7334,9 @@ def get_all_incident_reports(
                 if include_report:
                     filtered_reports.append(report)
             
-            return filtered_reports
+            return model_list_response(includes.model, filtered_reports)
         
-        return incident_reports
+        return model_list_response(includes.model, incident_reports)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching incident reports: {str(e)}")
@@ -5457,6 +7889,590 @@ def get_incident_report_statistics(property_id: str, db: Session = Depends(get_d
         raise HTTPException(status_code=500, detail=f"Error fetching incident report statistics: {str(e)}")
 
 
+# --- Report PDF Export ---
+
+import calendar
+import glob
+import hashlib
+from xml.sax.saxutils import escape
+from sqlalchemy.orm import selectinload
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import landscape
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+
+REPORT_PDF_DIR = "assets/pdf/reports"
+REPORT_PDF_TIMEOUT = 120  # seconds
+REPORT_RENDER_WORKERS = 4
+
+os.makedirs(REPORT_PDF_DIR, exist_ok=True)
+
+_report_render_executor = None
+
+def get_report_render_executor():
+    """Lazily start the process pool for renders a request waits on (report PDFs, utility panel workbooks)"""
+    global _report_render_executor
+    if _report_render_executor is None:
+        _report_render_executor = ProcessPoolExecutor(max_workers=REPORT_RENDER_WORKERS)
+    return _report_render_executor
+
+def render_report_pdf(pdf_path: str, document: dict) -> str:
+    """Render a report document (plain dicts and strings only) to a PDF file.
+
+    Runs inside the worker pool, so it must not touch the database or ORM objects.
+    """
+    styles = getSampleStyleSheet()
+    cell_style = ParagraphStyle(
+        "ReportCell",
+        parent=styles["BodyText"],
+        fontSize=document.get("font_size", 8),
+        leading=document.get("font_size", 8) + 2,
+    )
+    label_style = ParagraphStyle("ReportLabel", parent=cell_style, fontName="Helvetica-Bold")
+    pagesize = landscape(A4) if document.get("landscape") else A4
+    margin = 24
+    available_width = pagesize[0] - 2 * margin
+
+    def cell(value, style=cell_style):
+        return Paragraph(escape(value), style)
+
+    def table(rows, col_weights, header=True):
+        total = float(sum(col_weights))
+        widths = [available_width * weight / total for weight in col_weights]
+        pdf_table = Table(rows, colWidths=widths, repeatRows=1 if header else 0)
+        table_style = [
+            ("FONTSIZE", (0, 0), (-1, -1), cell_style.fontSize),
+            ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("LEFTPADDING", (0, 0), (-1, -1), 2),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 2),
+        ]
+        if header:
+            table_style.append(("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey))
+        pdf_table.setStyle(TableStyle(table_style))
+        return pdf_table
+
+    story = []
+    for index, sheet in enumerate(document["sheets"]):
+        if index:
+            story.append(PageBreak())
+        story.append(Paragraph(escape(sheet["heading"]), styles["Title"]))
+        if sheet.get("fields"):
+            rows = [[cell(label, label_style), cell(value)] for label, value in sheet["fields"]]
+            story.append(table(rows, [1, 3], header=False))
+        for section in sheet.get("sections", []):
+            story.append(Spacer(1, 8))
+            story.append(Paragraph(escape(section["title"]), styles["Heading3"]))
+            if not section["rows"]:
+                story.append(Paragraph("No records", cell_style))
+                continue
+            # Only the leading text columns wrap; short status cells (day/week grids) stay plain
+            # strings, which keeps large month/year grids cheap to lay out
+            wrap = section.get("wrap", len(section["columns"]))
+            rows = [[cell(column, label_style) if i < wrap else column for i, column in enumerate(section["columns"])]]
+            rows += [[cell(value) if i < wrap else value for i, value in enumerate(row)] for row in section["rows"]]
+            story.append(table(rows, section.get("col_weights") or [1] * len(section["columns"])))
+
+    # Render to a private temp file so concurrent renders never expose a half-written PDF
+    tmp_path = f"{pdf_path}.{uuid.uuid4().hex}.tmp"
+    doc = SimpleDocTemplate(
+        tmp_path,
+        pagesize=pagesize,
+        leftMargin=margin,
+        rightMargin=margin,
+        topMargin=margin,
+        bottomMargin=margin,
+        title=document["title"],
+    )
+    doc.build(story)
+    os.replace(tmp_path, pdf_path)
+    return pdf_path
+
+def _pdf_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M")
+    return str(value)
+
+def _pdf_section(title: str, records, columns, col_weights=None) -> dict:
+    """Build a table section from ORM objects or dicts; columns is a list of (attribute, label)"""
+    def read(record, attr):
+        return record.get(attr) if isinstance(record, dict) else getattr(record, attr, None)
+
+    return {
+        "title": title,
+        "columns": [label for _, label in columns],
+        "rows": [[_pdf_value(read(record, attr)) for attr, _ in columns] for record in records if record is not None],
+        "col_weights": col_weights,
+    }
+
+def _report_pdf_cache_key(kind: str, *parts) -> str:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:16]
+    return f"{kind}_{digest}"
+
+def _report_pdf_version(records) -> str:
+    """Fingerprint of the (id, updated_at) pairs a rendered PDF depends on"""
+    stamp = "|".join(f"{record.id}:{_pdf_value(getattr(record, 'updated_at', None))}" for record in records)
+    return hashlib.sha1(stamp.encode()).hexdigest()[:16]
+
+def get_or_render_report_pdf(cache_key: str, version: str, build_document) -> str:
+    """Return the cached PDF for (cache_key, version), rendering it in the worker pool on a miss"""
+    pdf_path = os.path.join(REPORT_PDF_DIR, f"{cache_key}_{version}.pdf")
+    if os.path.exists(pdf_path):
+        return pdf_path
+
+    document = build_document()
+    get_report_render_executor().submit(render_report_pdf, pdf_path, document).result(timeout=REPORT_PDF_TIMEOUT)
+
+    # Drop renders of older versions of the same report
+    for stale_path in glob.glob(os.path.join(REPORT_PDF_DIR, f"{cache_key}_*.pdf")):
+        if stale_path != pdf_path:
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+    return pdf_path
+
+def _month_days(month: str, status_maps) -> List[str]:
+    """Day columns ("01".."31") for a "YYYY-MM" month, widened by any extra keys already recorded"""
+    try:
+        year, month_number = (int(part) for part in month.split("-")[:2])
+        day_count = calendar.monthrange(year, month_number)[1]
+    except (ValueError, calendar.IllegalMonthError):
+        day_count = 31
+    days = [f"{day:02d}" for day in range(1, day_count + 1)]
+    extra = sorted({key for status_map in status_maps for key in (status_map or {})} - set(days))
+    return days + extra
+
+def build_incident_report_document(report: IncidentReport) -> dict:
+    sheet = {
+        "heading": f"Incident Report - {report.incident_id}",
+        "fields": [
+            ("Incident ID", _pdf_value(report.incident_id)),
+            ("Date of Report", _pdf_value(report.date_of_report)),
+            ("Prepared By", _pdf_value(report.prepared_by)),
+            ("Organization", _pdf_value(report.organization)),
+            ("Incident Description", _pdf_value(report.incident_description)),
+        ],
+        "sections": [
+            _pdf_section("Site Details", [report.site_details], [
+                ("site_name", "Site Name"), ("location", "Location"), ("date_time_of_incident", "Date/Time"),
+                ("reported_by", "Reported By"), ("reported_to", "Reported To"),
+                ("department_involved", "Department"), ("incident_type", "Incident Type"),
+            ]),
+            _pdf_section("Personnel Involved", report.personnel_involved, [
+                ("name", "Name"), ("designation", "Designation"), ("department", "Department"), ("role_in_incident", "Role"),
+            ]),
+            _pdf_section("Evidence & Attachments", [report.evidence_attachments], [
+                ("cctv_footage", "CCTV Footage"), ("visitor_entry_logs", "Visitor Entry Logs"),
+                ("photographs", "Photographs"), ("site_map", "Site Map"),
+            ]),
+            _pdf_section("Root Cause Analysis", report.root_cause_analysis, [("cause_description", "Cause")]),
+            _pdf_section("Immediate Actions", report.immediate_actions, [
+                ("action", "Action"), ("by_whom", "By Whom"), ("time", "Time"),
+            ], col_weights=[4, 2, 1]),
+            _pdf_section("Corrective & Preventive Actions", report.corrective_actions, [
+                ("action", "Action"), ("responsible", "Responsible"), ("deadline", "Deadline"), ("status", "Status"),
+            ], col_weights=[4, 2, 1, 1]),
+            _pdf_section("Incident Classification", [report.incident_classification], [
+                ("risk_level", "Risk Level"), ("report_severity", "Severity"),
+            ]),
+            _pdf_section("Client Communication", [report.client_communication], [
+                ("client_contacted", "Client Contacted"), ("mode", "Mode"), ("date_time", "Date/Time"),
+                ("response_summary", "Response Summary"),
+            ], col_weights=[2, 1, 1, 4]),
+            _pdf_section("Approvals & Signatures", report.approvals_signatures, [
+                ("approval_type", "Type"), ("name", "Name"), ("signature", "Signature"), ("date", "Date"),
+            ]),
+        ],
+    }
+    return {"title": sheet["heading"], "sheets": [sheet]}
+
+def build_daily_summary_document(report: DailySummaryReport) -> dict:
+    sections = [
+        _pdf_section(f"Department: {department.get('name', '')}", department.get("tasks") or [], [
+            ("time", "Time"), ("description", "Description"),
+            ("person_responsible", "Person Responsible"), ("status", "Status"),
+        ], col_weights=[1, 4, 2, 1])
+        for department in report.departments or []
+    ]
+    sections.append(_pdf_section("Summary", report.summary or [], [
+        ("department", "Department"), ("tasks_planned", "Tasks Planned"), ("completed", "Completed"),
+        ("pending", "Pending"), ("remarks", "Remarks"),
+    ], col_weights=[2, 1, 1, 1, 3]))
+    sheet = {
+        "heading": f"Daily Summary Report - {report.date}",
+        "fields": [
+            ("Date", _pdf_value(report.date)),
+            ("Site Name", _pdf_value(report.site_name)),
+            ("Prepared By", _pdf_value(report.prepared_by)),
+            ("Shift", _pdf_value(report.shift)),
+        ],
+        "sections": sections,
+    }
+    return {"title": sheet["heading"], "sheets": [sheet]}
+
+def build_utility_panel_fields(panel: UtilityPanel) -> List[tuple]:
+    return [
+        ("Site Name", _pdf_value(panel.site_name)),
+        ("Document No / Version", f"{_pdf_value(panel.document_no)} / {_pdf_value(panel.version_no)}"),
+        ("Prepared By / Date", f"{_pdf_value(panel.prepared_by)} / {_pdf_value(panel.prepared_date)}"),
+        ("Reviewed By / Date", f"{_pdf_value(panel.reviewed_by)} / {_pdf_value(panel.reviewed_date)}"),
+        ("Implemented Date", _pdf_value(panel.implemented_date)),
+        ("Responsible SPOC", _pdf_value(panel.responsible_spoc)),
+        ("Incharge Signature", _pdf_value(panel.incharge_signature)),
+        ("Shift Staff Signature", _pdf_value(panel.shift_staff_signature)),
+        ("Comment", _pdf_value(panel.comment)),
+    ]
+
+def build_utility_panel_sheet(panel: UtilityPanel) -> dict:
+    checkpoints = sorted(panel.checkpoints, key=lambda checkpoint: checkpoint.sl_no or 0)
+    days = _month_days(panel.month, [checkpoint.daily_status for checkpoint in checkpoints])
+    rows = [
+        [_pdf_value(checkpoint.sl_no), _pdf_value(checkpoint.item), _pdf_value(checkpoint.action_required),
+         _pdf_value(checkpoint.standard), _pdf_value(checkpoint.frequency)]
+        + [_pdf_value((checkpoint.daily_status or {}).get(day)) for day in days]
+        for checkpoint in checkpoints
+    ]
+    return {
+        "heading": f"{panel.panel_name} - {panel.building_name} ({panel.month})",
+        "fields": build_utility_panel_fields(panel),
+        "sections": [{
+            "title": "Checkpoints",
+            "columns": ["Sl", "Item", "Action Required", "Standard", "Frequency"] + days,
+            "rows": rows,
+            "col_weights": [1, 4, 4, 3, 2] + [1] * len(days),
+            "wrap": 5,
+        }],
+    }
+
+def build_work_schedule_document(work_schedule: WorkSchedule) -> dict:
+    items = work_schedule.work_schedule_items
+    weeks = [f"W{week:02d}" for week in range(1, 53)]
+    weeks += sorted({key for item in items for key in (item.weekwise_status or {})} - set(weeks))
+    rows = [
+        [_pdf_value(item.asset_name), _pdf_value(item.category), _pdf_value(item.location), _pdf_value(item.schedule_type)]
+        + [_pdf_value((item.weekwise_status or {}).get(week)) for week in weeks]
+        for item in items
+    ]
+    sheet = {
+        "heading": f"Work Schedule {work_schedule.schedule_year} - {work_schedule.location}",
+        "fields": [
+            ("Company", _pdf_value(work_schedule.company)),
+            ("Schedule Year", _pdf_value(work_schedule.schedule_year)),
+            ("Location", _pdf_value(work_schedule.location)),
+            ("Facility Manager", _pdf_value(work_schedule.facility_manager)),
+            ("AFM", _pdf_value(work_schedule.afm)),
+            ("Generated On", _pdf_value(work_schedule.generated_on)),
+        ],
+        "sections": [{
+            "title": "Schedule (D/W/M/Q/H/Y)",
+            "columns": ["Asset", "Category", "Location", "Type"] + weeks,
+            "rows": rows,
+            "col_weights": [4, 3, 3, 1] + [1] * len(weeks),
+            "wrap": 4,
+        }],
+    }
+    return {"title": sheet["heading"], "sheets": [sheet], "landscape": True, "font_size": 5}
+
+@app.get("/incident-reports/{incident_report_id}/pdf", tags=["Report PDF Export"])
+def export_incident_report_pdf(incident_report_id: str, db: Session = Depends(get_db)):
+    """Printable PDF of an incident report with all of its sections"""
+    incident_report = db.query(IncidentReport).filter(IncidentReport.id == incident_report_id).first()
+    if not incident_report:
+        raise HTTPException(status_code=404, detail="Incident report not found")
+
+    pdf_path = get_or_render_report_pdf(
+        _report_pdf_cache_key("incident", incident_report.id),
+        _report_pdf_version([incident_report]),
+        lambda: build_incident_report_document(incident_report),
+    )
+    return FileResponse(pdf_path, media_type="application/pdf", filename=f"incident_{incident_report.incident_id}.pdf")
+
+@app.get("/daily-summary/{id}/pdf", tags=["Report PDF Export"])
+def export_daily_summary_pdf(id: str, db: Session = Depends(get_db)):
+    """Printable PDF of a daily summary report"""
+    db_item = db.query(DailySummaryReport).filter(DailySummaryReport.id == id).first()
+    if not db_item:
+        raise HTTPException(status_code=404, detail="Daily summary report not found")
+
+    pdf_path = get_or_render_report_pdf(
+        _report_pdf_cache_key("daily_summary", db_item.id),
+        _report_pdf_version([db_item]),
+        lambda: build_daily_summary_document(db_item),
+    )
+    return FileResponse(pdf_path, media_type="application/pdf", filename=f"daily_summary_{db_item.date}.pdf")
+
+@app.get("/utility-panels/{utility_panel_id}/pdf", tags=["Report PDF Export"])
+def export_utility_panel_pdf(utility_panel_id: str, db: Session = Depends(get_db)):
+    """Printable monthly checklist sheet of a single utility panel"""
+    utility_panel = db.query(UtilityPanel).options(selectinload(UtilityPanel.checkpoints)).filter(
+        UtilityPanel.id == utility_panel_id
+    ).first()
+    if not utility_panel:
+        raise HTTPException(status_code=404, detail="Utility panel not found")
+
+    def build_document():
+        sheet = build_utility_panel_sheet(utility_panel)
+        return {"title": sheet["heading"], "sheets": [sheet], "landscape": True, "font_size": 6}
+
+    pdf_path = get_or_render_report_pdf(
+        _report_pdf_cache_key("utility_panel", utility_panel.id),
+        _report_pdf_version([utility_panel] + list(utility_panel.checkpoints)),
+        build_document,
+    )
+    return FileResponse(pdf_path, media_type="application/pdf", filename=f"utility_panel_{utility_panel.month}.pdf")
+
+@app.get("/utility-panels/property/{property_id}/month/{month}/pdf", tags=["Report PDF Export"])
+def export_utility_panels_month_pdf(
+    property_id: str,
+    month: str,
+    building_name: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """All utility panel checklist sheets of a property for one month, one panel per page"""
+    property_exists = db.query(Property).filter(Property.id == property_id).first()
+    if not property_exists:
+        raise HTTPException(status_code=404, detail="Property not found")
+
+    query = db.query(UtilityPanel).options(selectinload(UtilityPanel.checkpoints)).filter(
+        UtilityPanel.property_id == property_id,
+        UtilityPanel.month == month
+    )
+    if building_name:
+        query = query.filter(UtilityPanel.building_name == building_name)
+    utility_panels = query.order_by(UtilityPanel.building_name, UtilityPanel.panel_name, UtilityPanel.id).all()
+    if not utility_panels:
+        raise HTTPException(status_code=404, detail="No utility panels found for this month")
+
+    def build_document():
+        return {
+            "title": f"Utility Panels - {month}",
+            "sheets": [build_utility_panel_sheet(panel) for panel in utility_panels],
+            "landscape": True,
+            "font_size": 6,
+        }
+
+    version_records = [record for panel in utility_panels for record in [panel] + list(panel.checkpoints)]
+    pdf_path = get_or_render_report_pdf(
+        _report_pdf_cache_key("utility_panels_month", property_id, month, building_name or ""),
+        _report_pdf_version(version_records),
+        build_document,
+    )
+    return FileResponse(pdf_path, media_type="application/pdf", filename=f"utility_panels_{month}.pdf")
+
+# --- Utility Panel Month Matrix ---
+
+from collections import OrderedDict
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Alignment, Font, PatternFill
+
+REPORT_XLSX_DIR = "assets/xlsx/reports"
+UTILITY_PANEL_MATRIX_CACHE_SIZE = 2048  # panels
+
+os.makedirs(REPORT_XLSX_DIR, exist_ok=True)
+
+class UtilityPanelMatrixRow(BaseModel):
+    checkpoint_id: str
+    sl_no: Optional[int]
+    item: str
+    action_required: str
+    standard: str
+    frequency: str
+    statuses: List[str]  # one entry per day in the panel's days, "" when not filled in
+
+class UtilityPanelMatrix(BaseModel):
+    panel_id: str
+    panel_name: str
+    building_name: str
+    month: str
+    updated_at: datetime
+    days: List[str]
+    rows: List[UtilityPanelMatrixRow]
+
+class UtilityPanelMonthMatrixResponse(BaseModel):
+    property_id: str
+    month: str
+    building_name: Optional[str]
+    panels: List[UtilityPanelMatrix]
+
+# panel id -> (updated_at, matrix); panel.updated_at is bumped by every panel and checkpoint write
+_utility_panel_matrix_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_utility_panel_matrix_lock = threading.Lock()
+
+def build_utility_panel_matrix(panel: UtilityPanel, checkpoints: List[UtilityPanelCheckPoint]) -> UtilityPanelMatrix:
+    checkpoints = sorted(checkpoints, key=lambda checkpoint: checkpoint.sl_no or 0)
+    days = _month_days(panel.month, [checkpoint.daily_status for checkpoint in checkpoints])
+    return UtilityPanelMatrix(
+        panel_id=panel.id,
+        panel_name=panel.panel_name,
+        building_name=panel.building_name,
+        month=panel.month,
+        updated_at=panel.updated_at,
+        days=days,
+        rows=[
+            UtilityPanelMatrixRow(
+                checkpoint_id=checkpoint.id,
+                sl_no=checkpoint.sl_no,
+                item=checkpoint.item,
+                action_required=checkpoint.action_required,
+                standard=checkpoint.standard,
+                frequency=checkpoint.frequency,
+                statuses=[(checkpoint.daily_status or {}).get(day) or "" for day in days],
+            )
+            for checkpoint in checkpoints
+        ],
+    )
+
+def get_utility_panel_matrices(db: Session, panels: List[UtilityPanel]) -> List[UtilityPanelMatrix]:
+    """Matrices for the given panels; checkpoints are loaded in one query, and only for panels not cached at their updated_at"""
+    matrices = {}
+    with _utility_panel_matrix_lock:
+        for panel in panels:
+            cached = _utility_panel_matrix_cache.get(panel.id)
+            if cached and cached[0] == panel.updated_at:
+                _utility_panel_matrix_cache.move_to_end(panel.id)
+                matrices[panel.id] = cached[1]
+
+    missing = [panel for panel in panels if panel.id not in matrices]
+    if missing:
+        checkpoints: Dict[str, List[UtilityPanelCheckPoint]] = {panel.id: [] for panel in missing}
+        for checkpoint in db.query(UtilityPanelCheckPoint).filter(UtilityPanelCheckPoint.utility_panel_id.in_(list(checkpoints))):
+            checkpoints[checkpoint.utility_panel_id].append(checkpoint)
+        with _utility_panel_matrix_lock:
+            for panel in missing:
+                matrix = build_utility_panel_matrix(panel, checkpoints[panel.id])
+                matrices[panel.id] = matrix
+                _utility_panel_matrix_cache[panel.id] = (panel.updated_at, matrix)
+                _utility_panel_matrix_cache.move_to_end(panel.id)
+            while len(_utility_panel_matrix_cache) > UTILITY_PANEL_MATRIX_CACHE_SIZE:
+                _utility_panel_matrix_cache.popitem(last=False)
+    return [matrices[panel.id] for panel in panels]
+
+def get_month_utility_panels(db: Session, property_id: str, month: str, building_name: Optional[str]) -> List[UtilityPanel]:
+    property_exists = db.query(Property).filter(Property.id == property_id).first()
+    if not property_exists:
+        raise HTTPException(status_code=404, detail="Property not found")
+    query = db.query(UtilityPanel).filter(UtilityPanel.property_id == property_id, UtilityPanel.month == month)
+    if building_name:
+        query = query.filter(UtilityPanel.building_name == building_name)
+    return query.order_by(UtilityPanel.building_name, UtilityPanel.panel_name, UtilityPanel.id).all()
+
+def render_utility_panels_xlsx(xlsx_path: str, sheets: List[dict]) -> str:
+    """Write one worksheet per panel matrix (plain dicts). Runs inside the worker pool."""
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    bold = Font(bold=True)
+    header_fill = PatternFill("solid", fgColor="D9D9D9")
+    used_titles = set()
+    for sheet in sheets:
+        # Sheet titles: max 31 chars, no []:*?/\ and unique within the workbook
+        base = "".join("_" if char in "[]:*?/\\" else char for char in f"{sheet['building_name']} {sheet['panel_name']}")[:28] or "Panel"
+        title, suffix = base, 2
+        while title.lower() in used_titles:
+            title, suffix = f"{base[:27]}~{suffix}", suffix + 1
+        used_titles.add(title.lower())
+        worksheet = workbook.create_sheet(title)
+
+        worksheet.append([f"{sheet['panel_name']} - {sheet['building_name']} ({sheet['month']})"])
+        worksheet["A1"].font = Font(bold=True, size=12)
+        for label, value in sheet["fields"]:
+            worksheet.append([label, ILLEGAL_CHARACTERS_RE.sub("", value)])
+            worksheet.cell(row=worksheet.max_row, column=1).font = bold
+        worksheet.append([])
+
+        header_row = worksheet.max_row + 1
+        worksheet.append(["Sl", "Item", "Action Required", "Standard", "Frequency"] + sheet["days"])
+        for cell in worksheet[header_row]:
+            cell.font = bold
+            cell.fill = header_fill
+            cell.alignment = Alignment(horizontal="center")
+        for row in sheet["rows"]:
+            worksheet.append(
+                [row["sl_no"], row["item"], row["action_required"], row["standard"], row["frequency"]]
+                + [ILLEGAL_CHARACTERS_RE.sub("", status) for status in row["statuses"]]
+            )
+
+        worksheet.freeze_panes = worksheet.cell(row=header_row + 1, column=6)
+        for column, width in zip("ABCDE", (5, 30, 30, 20, 12)):
+            worksheet.column_dimensions[column].width = width
+        for index in range(len(sheet["days"])):
+            worksheet.column_dimensions[worksheet.cell(row=header_row, column=6 + index).column_letter].width = 4
+        worksheet.page_setup.orientation = "landscape"
+        worksheet.page_setup.fitToWidth = 1
+        worksheet.sheet_properties.pageSetUpPr.fitToPage = True
+
+    tmp_path = f"{xlsx_path}.{uuid.uuid4().hex}.tmp"
+    workbook.save(tmp_path)
+    os.replace(tmp_path, xlsx_path)
+    return xlsx_path
+
+@app.get("/utility-panels/property/{property_id}/month/{month}/matrix", response_model=UtilityPanelMonthMatrixResponse, tags=["Utility Panel"])
+def get_utility_panels_month_matrix(
+    property_id: str,
+    month: str,
+    building_name: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Checkpoint x day grid of every panel of a property (or building) for one month"""
+    panels = get_month_utility_panels(db, property_id, month, building_name)
+    return UtilityPanelMonthMatrixResponse(
+        property_id=property_id,
+        month=month,
+        building_name=building_name,
+        panels=get_utility_panel_matrices(db, panels),
+    )
+
+@app.get("/utility-panels/property/{property_id}/month/{month}/xlsx", tags=["Report XLSX Export"])
+def export_utility_panels_month_xlsx(
+    property_id: str,
+    month: str,
+    building_name: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Month sheets of every panel of a property (or building) as one workbook, one worksheet per panel"""
+    panels = get_month_utility_panels(db, property_id, month, building_name)
+    if not panels:
+        raise HTTPException(status_code=404, detail="No utility panels found for this month")
+
+    cache_key = _report_pdf_cache_key("utility_panels_month_xlsx", property_id, month, building_name or "")
+    xlsx_path = os.path.join(REPORT_XLSX_DIR, f"{cache_key}_{_report_pdf_version(panels)}.xlsx")
+    if not os.path.exists(xlsx_path):
+        sheets = []
+        for panel, matrix in zip(panels, get_utility_panel_matrices(db, panels)):
+            sheets.append({**matrix.model_dump(), "fields": build_utility_panel_fields(panel)})
+        get_report_render_executor().submit(render_utility_panels_xlsx, xlsx_path, sheets).result(timeout=REPORT_PDF_TIMEOUT)
+        for stale_path in glob.glob(os.path.join(REPORT_XLSX_DIR, f"{cache_key}_*.xlsx")):
+            if stale_path != xlsx_path:
+                try:
+                    os.remove(stale_path)
+                except OSError:
+                    pass
+    return FileResponse(
+        xlsx_path,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename=f"utility_panels_{month}.xlsx",
+    )
+
+@app.get("/work-schedules/{work_schedule_id}/pdf", tags=["Report PDF Export"])
+def export_work_schedule_pdf(work_schedule_id: str, db: Session = Depends(get_db)):
+    """Printable yearly (52 week) plan of a work schedule"""
+    work_schedule = db.query(WorkSchedule).options(selectinload(WorkSchedule.work_schedule_items)).filter(
+        WorkSchedule.id == work_schedule_id
+    ).first()
+    if not work_schedule:
+        raise HTTPException(status_code=404, detail="Work schedule not found")
+
+    pdf_path = get_or_render_report_pdf(
+        _report_pdf_cache_key("work_schedule", work_schedule.id),
+        _report_pdf_version([work_schedule] + list(work_schedule.work_schedule_items)),
+        lambda: build_work_schedule_document(work_schedule),
+    )
+    return FileResponse(pdf_path, media_type="application/pdf", filename=f"work_schedule_{work_schedule.schedule_year}.pdf")
+
+
 # Security Patrolling Report Models
 class SecurityPatrollingReport(Base):
     __tablename__ = "security_patrolling_reports"
@@ -5638,8 +8654,8 @@ class SecurityPatrollingReportResponse(BaseModel):
     property_id: str
     site_info: Optional[SecuritySiteInfoResponse] = None
     patrolling_schedule_summary: Optional[SecurityPatrollingScheduleSummaryResponse] = None
-    area_wise_patrolling_log: List[SecurityAreaWisePatrollingLogResponse] = []
-    key_observations_or_violations: List[SecurityKeyObservationViolationResponse] = []
+    area_wise_patrolling_log: List[SecurityAreaWisePatrollingLogResponse] = Field([], validation_alias="area_wise_patrolling_logs")
+    key_observations_or_violations: List[SecurityKeyObservationViolationResponse] = Field([], validation_alias="key_observations_violations")
     immediate_actions_taken: List[SecurityImmediateActionResponse] = []
     supervisor_comments: Optional[SecuritySupervisorCommentResponse] = None
     photo_evidence: List[SecurityPhotoEvidenceResponse] = []
@@ -5763,10 +8779,12 @@ def get_all_security_patrolling_reports(
     shift: Optional[str] = None,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
+    include: Optional[str] = Query(None, description="Comma-separated child collections to return, empty for headers only"),
     db: Session = Depends(get_db)
 ):
+    includes = IncludedRelationships(SecurityPatrollingReportResponse, SecurityPatrollingReport, include)
     try:
-        query = db.query(SecurityPatrollingReport)
+        query = includes.apply(db.query(SecurityPatrollingReport))
 
         if property_id:
             query = query.filter(SecurityPatrollingReport.property_id == property_id)
@@ -5782,20 +8800,7 @@ def get_all_security_patrolling_reports(
                 query = query.filter(SecuritySiteInfo.date <= date_to)
 
         reports = query.offset(skip).limit(limit).all()
-
-        # Load all related data for each report
-        for report in reports:
-            db.refresh(report)
-            if report.site_info:
-                db.refresh(report.site_info)
-            if report.patrolling_schedule_summary:
-                db.refresh(report.patrolling_schedule_summary)
-            if report.supervisor_comments:
-                db.refresh(report.supervisor_comments)
-            if report.sign_off:
-                db.refresh(report.sign_off)
-
-        return reports
+        return model_list_response(includes.model, reports)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching security patrolling reports: {str(e)}")
@@ -6295,7 +9300,7 @@ def get_all_facility_technical_patrolling_reports(
 
         reports = query.offset(skip).limit(limit).all()
 
-        return reports
+        return model_list_response(FacilityTechnicalPatrollingReportResponse, reports)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching facility technical patrolling reports: {str(e)}")
@@ -6704,7 +9709,7 @@ def get_all_night_patrolling_reports(
             if report.officer_signature:
                 db.refresh(report.officer_signature)
 
-        return reports
+        return model_list_response(NightPatrollingReportResponse, reports)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching night patrolling reports: {str(e)}")
@@ -7328,17 +10333,18 @@ def create_visitor_management_report(report: VisitorManagementReportCreate, db:
 
 
 @app.get("/visitor-management-reports/", response_model=List[VisitorManagementReportResponse], tags=["Visitor Management Report"])
-def get_all_visitor_management_reports(skip: int = 0, limit: int = 100, property_id: Optional[str] = None, db: Session = Depends(get_db)):
+def get_all_visitor_management_reports(skip: int = 0, limit: int = 100, property_id: Optional[str] = None, include: Optional[str] = Query(None, description="Comma-separated child collections to return, empty for headers only"), db: Session = Depends(get_db)):
     """
     Retrieve all visitor management reports, with optional filtering by property_id.
     """
+    includes = IncludedRelationships(VisitorManagementReportResponse, VisitorManagementReport, include)
     try:
-        query = db.query(VisitorManagementReport)
+        query = includes.apply(db.query(VisitorManagementReport))
         if property_id:
             query = query.filter(VisitorManagementReport.property_id == property_id)
         
         reports = query.offset(skip).limit(limit).all()
-        return reports
+        return model_list_response(includes.model, reports)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching reports: {str(e)}")
@@ -7620,13 +10626,14 @@ def create_community_report(report: CommunityReportCreate, db: Session = Depends
         raise HTTPException(status_code=500, detail=f"Error creating report: {str(e)}")
 
 @app.get("/community-reports/", response_model=List[CommunityReportResponse], tags=["Community Management Report"])
-def get_all_community_reports(skip: int = 0, limit: int = 100, property_id: Optional[str] = None, db: Session = Depends(get_db)):
+def get_all_community_reports(skip: int = 0, limit: int = 100, property_id: Optional[str] = None, include: Optional[str] = Query(None, description="Comma-separated child collections to return, empty for headers only"), db: Session = Depends(get_db)):
+    includes = IncludedRelationships(CommunityReportResponse, CommunityReport, include)
     try:
-        query = db.query(CommunityReport)
+        query = includes.apply(db.query(CommunityReport))
         if property_id:
             query = query.filter(CommunityReport.property_id == property_id)
         reports = query.offset(skip).limit(limit).all()
-        return reports
+        return model_list_response(includes.model, reports)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching reports: {str(e)}")
 
@@ -7837,7 +10844,7 @@ def get_all_inventory_reports(skip: int = 0, limit: int = 100, property_id: Opti
         if property_id:
             query = query.filter(InventoryReport.property_id == property_id)
         reports = query.offset(skip).limit(limit).all()
-        return reports
+        return model_list_response(InventoryReportResponse, reports)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching reports: {str(e)}")
 
@@ -8036,7 +11043,7 @@ def get_all_asset_reports(skip: int = 0, limit: int = 100, property_id: Optional
         if property_id:
             query = query.filter(AssetReport.property_id == property_id)
         reports = query.offset(skip).limit(limit).all()
-        return reports
+        return model_list_response(AssetReportResponse, reports)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching reports: {str(e)}")
 
@@ -8240,7 +11247,7 @@ def get_all_quality_reports(skip: int = 0, limit: int = 100, property_id: Option
         if property_id:
             query = query.filter(QualityReport.property_id == property_id)
         reports = query.offset(skip).limit(limit).all()
-        return reports
+        return model_list_response(QualityReportResponse, reports)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching reports: {str(e)}")
 
@@ -9092,7 +12099,7 @@ def get_all_fire_safety_reports(skip: int = 0, limit: int = 100, property_id: Op
         if property_id:
             query = query.filter(FireSafetyReport.property_id == property_id)
         reports = query.offset(skip).limit(limit).all()
-        return [FireSafetyReportResponse.model_validate(r) for r in reports]
+        return model_list_response(FireSafetyReportResponse, reports)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching reports: {str(e)}")
 
@@ -9539,13 +12546,14 @@ def create_procurement_report(report: ProcurementReportCreate, db: Session = Dep
         raise HTTPException(status_code=500, detail=f"Error creating report: {str(e)}")
 
 @app.get("/procurement-reports/", response_model=List[ProcurementReportResponse], tags=["Procurement Report"])
-def get_all_procurement_reports(skip: int = 0, limit: int = 100, property_id: Optional[str] = None, db: Session = Depends(get_db)):
+def get_all_procurement_reports(skip: int = 0, limit: int = 100, property_id: Optional[str] = None, include: Optional[str] = Query(None, description="Comma-separated child collections to return, empty for headers only"), db: Session = Depends(get_db)):
+    includes = IncludedRelationships(ProcurementReportResponse, ProcurementReport, include)
     try:
-        query = db.query(ProcurementReport)
+        query = includes.apply(db.query(ProcurementReport))
         if property_id:
             query = query.filter(ProcurementReport.property_id == property_id)
         reports = query.offset(skip).limit(limit).all()
-        return [ProcurementReportResponse.model_validate(r) for r in reports]
+        return model_list_response(includes.model, reports)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching reports: {str(e)}")
 
@@ -10887,7 +13895,7 @@ def get_all_sla_reports(skip: int = 0, limit: int = 100, property_id: Optional[s
         if property_id:
             query = query.filter(SlaReport.property_id == property_id)
         reports = query.offset(skip).limit(limit).all()
-        return [SlaReportResponse.model_validate(r) for r in reports]
+        return model_list_response(SlaReportResponse, reports)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching SLA reports: {str(e)}")
 
@@ -11053,7 +14061,7 @@ def get_all_audit_reports(
             query = query.filter(AuditReport.status == status)
         
         reports = query.offset(skip).limit(limit).all()
-        return reports
+        return model_list_response(AuditReportResponse, reports)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching audit reports: {str(e)}")
 
@@ -12299,7 +15307,7 @@ class TransitionChecklistResponse(BaseModel):
             if item.section not in sections_data:
                 sections_data[item.section] = {"documents_to_be_customised": []}
             
-            item_schema = ChecklistItemSchema.from_orm(item)
+            item_schema = ChecklistItemSchema.model_validate(item)
             sections_data[item.section]["documents_to_be_customised"].append(item_schema)
 
         return cls(
@@ -12487,7 +15495,7 @@ class PostTransitionChecklistResponse(BaseModel):
             if item.section not in sections_data:
                 sections_data[item.section] = {"documents_to_be_customised": []}
             
-            item_schema = PostChecklistItemSchema.from_orm(item)
+            item_schema = PostChecklistItemSchema.model_validate(item)
             sections_data[item.section]["documents_to_be_customised"].append(item_schema)
 
         return cls(
@@ -12629,7 +15637,7 @@ class SiteReport(SiteReportBase):
     id: int
 
     class Config:
-        orm_mode = True # Enables Pydantic to read data from ORM models
+        from_attributes = True # Enables Pydantic to read data from ORM models
 
 # --- SQLAlchemy Model (Database Table) ---
 
@@ -12773,7 +15781,7 @@ class Schedule(ScheduleBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True # Enables Pydantic to read data from ORM models
+        from_attributes = True # Enables Pydantic to read data from ORM models
 
 # --- SQLAlchemy Model (Database Table) ---
 
@@ -14008,22 +17016,24 @@ def create_hot_work_permit(permit: HotWorkPermitCreate, db: Session = Depends(ge
     return db_permit
 
 @app.get("/hot-work-permit/", response_model=List[HotWorkPermit], tags=["Hot Work Permit"])
-def read_hot_work_permit(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def read_hot_work_permit(skip: int = 0, limit: int = 10, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all hot work permits with pagination.
     """
-    permit_records = db.query(HotWorkPermitDB).offset(skip).limit(limit).all()
-    return permit_records
+    sparse = SparseFields(HotWorkPermit, HotWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(HotWorkPermitDB)).offset(skip).limit(limit).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/hot-work-permit/{permit_id}", response_model=HotWorkPermit, tags=["Hot Work Permit"])
-def read_hot_work_permit_by_id(permit_id: int, db: Session = Depends(get_db)):
+def read_hot_work_permit_by_id(permit_id: int, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve a single hot work permit record by its ID.
     """
-    db_permit = db.query(HotWorkPermitDB).filter(HotWorkPermitDB.id == permit_id).first()
+    sparse = SparseFields(HotWorkPermit, HotWorkPermitDB, fields)
+    db_permit = sparse.apply(db.query(HotWorkPermitDB)).filter(HotWorkPermitDB.id == permit_id).first()
     if db_permit is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Hot work permit not found")
-    return db_permit
+    return sparse.response(db_permit)
 
 @app.get("/hot-work-permit/permit/{permit_no}", response_model=HotWorkPermit, tags=["Hot Work Permit"])
 def read_hot_work_permit_by_permit_no(permit_no: str, db: Session = Depends(get_db)):
@@ -14036,12 +17046,13 @@ def read_hot_work_permit_by_permit_no(permit_no: str, db: Session = Depends(get_
     return db_permit
 
 @app.get("/hot-work-permit/property/{property_id}", response_model=List[HotWorkPermit], tags=["Hot Work Permit"])
-def read_hot_work_permit_by_property(property_id: str, db: Session = Depends(get_db)):
+def read_hot_work_permit_by_property(property_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all hot work permits for a specific property.
     """
-    permit_records = db.query(HotWorkPermitDB).filter(HotWorkPermitDB.property_id == property_id).all()
-    return permit_records
+    sparse = SparseFields(HotWorkPermit, HotWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(HotWorkPermitDB)).filter(HotWorkPermitDB.property_id == property_id).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/hot-work-permit/date/{date}", response_model=List[HotWorkPermit], tags=["Hot Work Permit"])
 def read_hot_work_permit_by_date(date: str, db: Session = Depends(get_db)):
@@ -14241,22 +17252,24 @@ def create_cold_work_permit(permit: ColdWorkPermitCreate, db: Session = Depends(
     return db_permit
 
 @app.get("/cold-work-permit/", response_model=List[ColdWorkPermit], tags=["Cold Work Permit"])
-def read_cold_work_permit(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def read_cold_work_permit(skip: int = 0, limit: int = 10, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all cold work permits with pagination.
     """
-    permit_records = db.query(ColdWorkPermitDB).offset(skip).limit(limit).all()
-    return permit_records
+    sparse = SparseFields(ColdWorkPermit, ColdWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(ColdWorkPermitDB)).offset(skip).limit(limit).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/cold-work-permit/{permit_id}", response_model=ColdWorkPermit, tags=["Cold Work Permit"])
-def read_cold_work_permit_by_id(permit_id: int, db: Session = Depends(get_db)):
+def read_cold_work_permit_by_id(permit_id: int, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve a single cold work permit record by its ID.
     """
-    db_permit = db.query(ColdWorkPermitDB).filter(ColdWorkPermitDB.id == permit_id).first()
+    sparse = SparseFields(ColdWorkPermit, ColdWorkPermitDB, fields)
+    db_permit = sparse.apply(db.query(ColdWorkPermitDB)).filter(ColdWorkPermitDB.id == permit_id).first()
     if db_permit is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cold work permit not found")
-    return db_permit
+    return sparse.response(db_permit)
 
 @app.get("/cold-work-permit/permit/{permit_number}", response_model=ColdWorkPermit, tags=["Cold Work Permit"])
 def read_cold_work_permit_by_permit_number(permit_number: str, db: Session = Depends(get_db)):
@@ -14269,12 +17282,13 @@ def read_cold_work_permit_by_permit_number(permit_number: str, db: Session = Dep
     return db_permit
 
 @app.get("/cold-work-permit/property/{property_id}", response_model=List[ColdWorkPermit], tags=["Cold Work Permit"])
-def read_cold_work_permit_by_property(property_id: str, db: Session = Depends(get_db)):
+def read_cold_work_permit_by_property(property_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all cold work permits for a specific property.
     """
-    permit_records = db.query(ColdWorkPermitDB).filter(ColdWorkPermitDB.property_id == property_id).all()
-    return permit_records
+    sparse = SparseFields(ColdWorkPermit, ColdWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(ColdWorkPermitDB)).filter(ColdWorkPermitDB.property_id == property_id).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/cold-work-permit/date/{date}", response_model=List[ColdWorkPermit], tags=["Cold Work Permit"])
 def read_cold_work_permit_by_date(date: str, db: Session = Depends(get_db)):
@@ -14498,22 +17512,24 @@ def create_electrical_work_permit(permit: ElectricalWorkPermitCreate, db: Sessio
     return db_permit
 
 @app.get("/electrical-work-permit/", response_model=List[ElectricalWorkPermit], tags=["Electrical Work Permit"])
-def read_electrical_work_permit(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def read_electrical_work_permit(skip: int = 0, limit: int = 10, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all electrical work permits with pagination.
     """
-    permit_records = db.query(ElectricalWorkPermitDB).offset(skip).limit(limit).all()
-    return permit_records
+    sparse = SparseFields(ElectricalWorkPermit, ElectricalWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(ElectricalWorkPermitDB)).offset(skip).limit(limit).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/electrical-work-permit/{permit_id}", response_model=ElectricalWorkPermit, tags=["Electrical Work Permit"])
-def read_electrical_work_permit_by_id(permit_id: int, db: Session = Depends(get_db)):
+def read_electrical_work_permit_by_id(permit_id: int, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve a single electrical work permit record by its ID.
     """
-    db_permit = db.query(ElectricalWorkPermitDB).filter(ElectricalWorkPermitDB.id == permit_id).first()
+    sparse = SparseFields(ElectricalWorkPermit, ElectricalWorkPermitDB, fields)
+    db_permit = sparse.apply(db.query(ElectricalWorkPermitDB)).filter(ElectricalWorkPermitDB.id == permit_id).first()
     if db_permit is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Electrical work permit not found")
-    return db_permit
+    return sparse.response(db_permit)
 
 @app.get("/electrical-work-permit/permit/{permit_number}", response_model=ElectricalWorkPermit, tags=["Electrical Work Permit"])
 def read_electrical_work_permit_by_permit_number(permit_number: str, db: Session = Depends(get_db)):
@@ -14526,12 +17542,13 @@ def read_electrical_work_permit_by_permit_number(permit_number: str, db: Session
     return db_permit
 
 @app.get("/electrical-work-permit/property/{property_id}", response_model=List[ElectricalWorkPermit], tags=["Electrical Work Permit"])
-def read_electrical_work_permit_by_property(property_id: str, db: Session = Depends(get_db)):
+def read_electrical_work_permit_by_property(property_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all electrical work permits for a specific property.
     """
-    permit_records = db.query(ElectricalWorkPermitDB).filter(ElectricalWorkPermitDB.property_id == property_id).all()
-    return permit_records
+    sparse = SparseFields(ElectricalWorkPermit, ElectricalWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(ElectricalWorkPermitDB)).filter(ElectricalWorkPermitDB.property_id == property_id).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/electrical-work-permit/date/{date}", response_model=List[ElectricalWorkPermit], tags=["Electrical Work Permit"])
 def read_electrical_work_permit_by_date(date: str, db: Session = Depends(get_db)):
@@ -14706,7 +17723,7 @@ def delete_electrical_work_permit(permit_id: int, db: Session = Depends(get_db))
 #     updated_at: datetime
 
 #     class Config:
-#         orm_mode = True
+#         from_attributes = True
 
 # # --- SQLAlchemy Model (Database Table) ---
 
@@ -14944,22 +17961,24 @@ def create_height_work_permit(permit: HeightWorkPermitCreate, db: Session = Depe
     return db_permit
 
 @app.get("/height-work-permit/", response_model=List[HeightWorkPermit], tags=["Height Work Permit"])
-def read_height_work_permit(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def read_height_work_permit(skip: int = 0, limit: int = 10, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all height work permits with pagination.
     """
-    permit_records = db.query(HeightWorkPermitDB).offset(skip).limit(limit).all()
-    return permit_records
+    sparse = SparseFields(HeightWorkPermit, HeightWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(HeightWorkPermitDB)).offset(skip).limit(limit).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/height-work-permit/{permit_id}", response_model=HeightWorkPermit, tags=["Height Work Permit"])
-def read_height_work_permit_by_id(permit_id: int, db: Session = Depends(get_db)):
+def read_height_work_permit_by_id(permit_id: int, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve a single height work permit record by its ID.
     """
-    db_permit = db.query(HeightWorkPermitDB).filter(HeightWorkPermitDB.id == permit_id).first()
+    sparse = SparseFields(HeightWorkPermit, HeightWorkPermitDB, fields)
+    db_permit = sparse.apply(db.query(HeightWorkPermitDB)).filter(HeightWorkPermitDB.id == permit_id).first()
     if db_permit is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Height work permit not found")
-    return db_permit
+    return sparse.response(db_permit)
 
 @app.get("/height-work-permit/permit/{permit_number}", response_model=HeightWorkPermit, tags=["Height Work Permit"])
 def read_height_work_permit_by_permit_number(permit_number: str, db: Session = Depends(get_db)):
@@ -14972,12 +17991,13 @@ def read_height_work_permit_by_permit_number(permit_number: str, db: Session = D
     return db_permit
 
 @app.get("/height-work-permit/property/{property_id}", response_model=List[HeightWorkPermit], tags=["Height Work Permit"])
-def read_height_work_permit_by_property(property_id: str, db: Session = Depends(get_db)):
+def read_height_work_permit_by_property(property_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all height work permits for a specific property.
     """
-    permit_records = db.query(HeightWorkPermitDB).filter(HeightWorkPermitDB.property_id == property_id).all()
-    return permit_records
+    sparse = SparseFields(HeightWorkPermit, HeightWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(HeightWorkPermitDB)).filter(HeightWorkPermitDB.property_id == property_id).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/height-work-permit/date/{date}", response_model=List[HeightWorkPermit], tags=["Height Work Permit"])
 def read_height_work_permit_by_date(date: str, db: Session = Depends(get_db)):
@@ -15218,22 +18238,24 @@ def create_confined_space_work_permit(permit: ConfinedSpaceWorkPermitCreate, db:
     return db_permit
 
 @app.get("/confined-space-work-permit/", response_model=List[ConfinedSpaceWorkPermit], tags=["Confined Space Work Permit"])
-def read_confined_space_work_permit(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def read_confined_space_work_permit(skip: int = 0, limit: int = 10, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all confined space work permits with pagination.
     """
-    permit_records = db.query(ConfinedSpaceWorkPermitDB).offset(skip).limit(limit).all()
-    return permit_records
+    sparse = SparseFields(ConfinedSpaceWorkPermit, ConfinedSpaceWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(ConfinedSpaceWorkPermitDB)).offset(skip).limit(limit).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/confined-space-work-permit/{permit_id}", response_model=ConfinedSpaceWorkPermit, tags=["Confined Space Work Permit"])
-def read_confined_space_work_permit_by_id(permit_id: int, db: Session = Depends(get_db)):
+def read_confined_space_work_permit_by_id(permit_id: int, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve a single confined space work permit record by its ID.
     """
-    db_permit = db.query(ConfinedSpaceWorkPermitDB).filter(ConfinedSpaceWorkPermitDB.id == permit_id).first()
+    sparse = SparseFields(ConfinedSpaceWorkPermit, ConfinedSpaceWorkPermitDB, fields)
+    db_permit = sparse.apply(db.query(ConfinedSpaceWorkPermitDB)).filter(ConfinedSpaceWorkPermitDB.id == permit_id).first()
     if db_permit is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Confined space work permit not found")
-    return db_permit
+    return sparse.response(db_permit)
 
 @app.get("/confined-space-work-permit/permit/{permit_number}", response_model=ConfinedSpaceWorkPermit, tags=["Confined Space Work Permit"])
 def read_confined_space_work_permit_by_permit_number(permit_number: str, db: Session = Depends(get_db)):
@@ -15246,12 +18268,13 @@ def read_confined_space_work_permit_by_permit_number(permit_number: str, db: Ses
     return db_permit
 
 @app.get("/confined-space-work-permit/property/{property_id}", response_model=List[ConfinedSpaceWorkPermit], tags=["Confined Space Work Permit"])
-def read_confined_space_work_permit_by_property(property_id: str, db: Session = Depends(get_db)):
+def read_confined_space_work_permit_by_property(property_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all confined space work permits for a specific property.
     """
-    permit_records = db.query(ConfinedSpaceWorkPermitDB).filter(ConfinedSpaceWorkPermitDB.property_id == property_id).all()
-    return permit_records
+    sparse = SparseFields(ConfinedSpaceWorkPermit, ConfinedSpaceWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(ConfinedSpaceWorkPermitDB)).filter(ConfinedSpaceWorkPermitDB.property_id == property_id).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/confined-space-work-permit/date/{date}", response_model=List[ConfinedSpaceWorkPermit], tags=["Confined Space Work Permit"])
 def read_confined_space_work_permit_by_date(date: str, db: Session = Depends(get_db)):
@@ -15485,22 +18508,24 @@ def create_general_maintenance_permit(permit: GeneralMaintenancePermitCreate, db
     return db_permit
 
 @app.get("/general-maintenance-permit/", response_model=List[GeneralMaintenancePermit], tags=["General Maintenance Permit"])
-def read_general_maintenance_permit(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def read_general_maintenance_permit(skip: int = 0, limit: int = 10, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all general maintenance permits with pagination.
     """
-    permit_records = db.query(GeneralMaintenancePermitDB).offset(skip).limit(limit).all()
-    return permit_records
+    sparse = SparseFields(GeneralMaintenancePermit, GeneralMaintenancePermitDB, fields)
+    permit_records = sparse.apply(db.query(GeneralMaintenancePermitDB)).offset(skip).limit(limit).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/general-maintenance-permit/{permit_id}", response_model=GeneralMaintenancePermit, tags=["General Maintenance Permit"])
-def read_general_maintenance_permit_by_id(permit_id: int, db: Session = Depends(get_db)):
+def read_general_maintenance_permit_by_id(permit_id: int, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve a single general maintenance permit record by its ID.
     """
-    db_permit = db.query(GeneralMaintenancePermitDB).filter(GeneralMaintenancePermitDB.id == permit_id).first()
+    sparse = SparseFields(GeneralMaintenancePermit, GeneralMaintenancePermitDB, fields)
+    db_permit = sparse.apply(db.query(GeneralMaintenancePermitDB)).filter(GeneralMaintenancePermitDB.id == permit_id).first()
     if db_permit is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="General maintenance permit not found")
-    return db_permit
+    return sparse.response(db_permit)
 
 @app.get("/general-maintenance-permit/permit/{permit_number}", response_model=GeneralMaintenancePermit, tags=["General Maintenance Permit"])
 def read_general_maintenance_permit_by_permit_number(permit_number: str, db: Session = Depends(get_db)):
@@ -15513,12 +18538,13 @@ def read_general_maintenance_permit_by_permit_number(permit_number: str, db: Ses
     return db_permit
 
 @app.get("/general-maintenance-permit/property/{property_id}", response_model=List[GeneralMaintenancePermit], tags=["General Maintenance Permit"])
-def read_general_maintenance_permit_by_property(property_id: str, db: Session = Depends(get_db)):
+def read_general_maintenance_permit_by_property(property_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all general maintenance permits for a specific property.
     """
-    permit_records = db.query(GeneralMaintenancePermitDB).filter(GeneralMaintenancePermitDB.property_id == property_id).all()
-    return permit_records
+    sparse = SparseFields(GeneralMaintenancePermit, GeneralMaintenancePermitDB, fields)
+    permit_records = sparse.apply(db.query(GeneralMaintenancePermitDB)).filter(GeneralMaintenancePermitDB.property_id == property_id).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/general-maintenance-permit/date/{date}", response_model=List[GeneralMaintenancePermit], tags=["General Maintenance Permit"])
 def read_general_maintenance_permit_by_date(date: str, db: Session = Depends(get_db)):
@@ -15756,30 +18782,33 @@ def create_working_alone_permit(permit: WorkingAlonePermitCreate, db: Session =
     return db_permit
 
 @app.get("/working-alone-permit/", response_model=List[WorkingAlonePermit], tags=["Working Alone Permit"])
-def read_working_alone_permit(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def read_working_alone_permit(skip: int = 0, limit: int = 10, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all working alone permits with pagination.
     """
-    permit_records = db.query(WorkingAlonePermitDB).offset(skip).limit(limit).all()
-    return permit_records
+    sparse = SparseFields(WorkingAlonePermit, WorkingAlonePermitDB, fields)
+    permit_records = sparse.apply(db.query(WorkingAlonePermitDB)).offset(skip).limit(limit).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/working-alone-permit/{permit_id}", response_model=WorkingAlonePermit, tags=["Working Alone Permit"])
-def read_working_alone_permit_by_id(permit_id: int, db: Session = Depends(get_db)):
+def read_working_alone_permit_by_id(permit_id: int, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve a single working alone permit record by its ID.
     """
-    db_permit = db.query(WorkingAlonePermitDB).filter(WorkingAlonePermitDB.id == permit_id).first()
+    sparse = SparseFields(WorkingAlonePermit, WorkingAlonePermitDB, fields)
+    db_permit = sparse.apply(db.query(WorkingAlonePermitDB)).filter(WorkingAlonePermitDB.id == permit_id).first()
     if db_permit is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Working alone permit not found")
-    return db_permit
+    return sparse.response(db_permit)
 
 @app.get("/working-alone-permit/property/{property_id}", response_model=List[WorkingAlonePermit], tags=["Working Alone Permit"])
-def read_working_alone_permit_by_property(property_id: str, db: Session = Depends(get_db)):
+def read_working_alone_permit_by_property(property_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all working alone permits for a specific property.
     """
-    permit_records = db.query(WorkingAlonePermitDB).filter(WorkingAlonePermitDB.property_id == property_id).all()
-    return permit_records
+    sparse = SparseFields(WorkingAlonePermit, WorkingAlonePermitDB, fields)
+    permit_records = sparse.apply(db.query(WorkingAlonePermitDB)).filter(WorkingAlonePermitDB.property_id == property_id).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/working-alone-permit/date/{date}", response_model=List[WorkingAlonePermit], tags=["Working Alone Permit"])
 def read_working_alone_permit_by_date(date: str, db: Session = Depends(get_db)):
@@ -16116,22 +19145,24 @@ def create_excavation_work_permit(permit: ExcavationWorkPermitCreate, db: Sessio
     return db_permit
 
 @app.get("/excavation-work-permit/", response_model=List[ExcavationWorkPermit], tags=["Excavation Work Permit"])
-def read_excavation_work_permit(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def read_excavation_work_permit(skip: int = 0, limit: int = 10, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all excavation work permits with pagination.
     """
-    permit_records = db.query(ExcavationWorkPermitDB).offset(skip).limit(limit).all()
-    return permit_records
+    sparse = SparseFields(ExcavationWorkPermit, ExcavationWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(ExcavationWorkPermitDB)).offset(skip).limit(limit).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/excavation-work-permit/{permit_id}", response_model=ExcavationWorkPermit, tags=["Excavation Work Permit"])
-def read_excavation_work_permit_by_id(permit_id: int, db: Session = Depends(get_db)):
+def read_excavation_work_permit_by_id(permit_id: int, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve a single excavation work permit record by its ID.
     """
-    db_permit = db.query(ExcavationWorkPermitDB).filter(ExcavationWorkPermitDB.id == permit_id).first()
+    sparse = SparseFields(ExcavationWorkPermit, ExcavationWorkPermitDB, fields)
+    db_permit = sparse.apply(db.query(ExcavationWorkPermitDB)).filter(ExcavationWorkPermitDB.id == permit_id).first()
     if db_permit is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Excavation work permit not found")
-    return db_permit
+    return sparse.response(db_permit)
 
 @app.get("/excavation-work-permit/permit/{permit_number}", response_model=ExcavationWorkPermit, tags=["Excavation Work Permit"])
 def read_excavation_work_permit_by_permit_number(permit_number: str, db: Session = Depends(get_db)):
@@ -16144,12 +19175,13 @@ def read_excavation_work_permit_by_permit_number(permit_number: str, db: Session
     return db_permit
 
 @app.get("/excavation-work-permit/property/{property_id}", response_model=List[ExcavationWorkPermit], tags=["Excavation Work Permit"])
-def read_excavation_work_permit_by_property(property_id: str, db: Session = Depends(get_db)):
+def read_excavation_work_permit_by_property(property_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all excavation work permits for a specific property.
     """
-    permit_records = db.query(ExcavationWorkPermitDB).filter(ExcavationWorkPermitDB.property_id == property_id).all()
-    return permit_records
+    sparse = SparseFields(ExcavationWorkPermit, ExcavationWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(ExcavationWorkPermitDB)).filter(ExcavationWorkPermitDB.property_id == property_id).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/excavation-work-permit/date/{date}", response_model=List[ExcavationWorkPermit], tags=["Excavation Work Permit"])
 def read_excavation_work_permit_by_date(date: str, db: Session = Depends(get_db)):
@@ -16374,22 +19406,24 @@ def create_lockout_tagout_permit(permit: LockoutTagoutPermitCreate, db: Session
     return db_permit
 
 @app.get("/lockout-tagout-permit/", response_model=List[LockoutTagoutPermit], tags=["Lockout/Tagout Permit"])
-def read_lockout_tagout_permit(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def read_lockout_tagout_permit(skip: int = 0, limit: int = 10, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all lockout/tagout permits with pagination.
     """
-    permit_records = db.query(LockoutTagoutPermitDB).offset(skip).limit(limit).all()
-    return permit_records
+    sparse = SparseFields(LockoutTagoutPermit, LockoutTagoutPermitDB, fields)
+    permit_records = sparse.apply(db.query(LockoutTagoutPermitDB)).offset(skip).limit(limit).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/lockout-tagout-permit/{permit_id}", response_model=LockoutTagoutPermit, tags=["Lockout/Tagout Permit"])
-def read_lockout_tagout_permit_by_id(permit_id: int, db: Session = Depends(get_db)):
+def read_lockout_tagout_permit_by_id(permit_id: int, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve a single lockout/tagout permit record by its ID.
     """
-    db_permit = db.query(LockoutTagoutPermitDB).filter(LockoutTagoutPermitDB.id == permit_id).first()
+    sparse = SparseFields(LockoutTagoutPermit, LockoutTagoutPermitDB, fields)
+    db_permit = sparse.apply(db.query(LockoutTagoutPermitDB)).filter(LockoutTagoutPermitDB.id == permit_id).first()
     if db_permit is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lockout/tagout permit not found")
-    return db_permit
+    return sparse.response(db_permit)
 
 @app.get("/lockout-tagout-permit/permit/{permit_number}", response_model=LockoutTagoutPermit, tags=["Lockout/Tagout Permit"])
 def read_lockout_tagout_permit_by_permit_number(permit_number: str, db: Session = Depends(get_db)):
@@ -16402,12 +19436,13 @@ def read_lockout_tagout_permit_by_permit_number(permit_number: str, db: Session
     return db_permit
 
 @app.get("/lockout-tagout-permit/property/{property_id}", response_model=List[LockoutTagoutPermit], tags=["Lockout/Tagout Permit"])
-def read_lockout_tagout_permit_by_property(property_id: str, db: Session = Depends(get_db)):
+def read_lockout_tagout_permit_by_property(property_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all lockout/tagout permits for a specific property.
     """
-    permit_records = db.query(LockoutTagoutPermitDB).filter(LockoutTagoutPermitDB.property_id == property_id).all()
-    return permit_records
+    sparse = SparseFields(LockoutTagoutPermit, LockoutTagoutPermitDB, fields)
+    permit_records = sparse.apply(db.query(LockoutTagoutPermitDB)).filter(LockoutTagoutPermitDB.property_id == property_id).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/lockout-tagout-permit/date/{date}", response_model=List[LockoutTagoutPermit], tags=["Lockout/Tagout Permit"])
 def read_lockout_tagout_permit_by_date(date: str, db: Session = Depends(get_db)):
@@ -16646,22 +19681,24 @@ def create_chemical_handling_permit(permit: ChemicalHandlingPermitCreate, db: Se
     return db_permit
 
 @app.get("/chemical-handling-permit/", response_model=List[ChemicalHandlingPermit], tags=["Chemical Handling Permit"])
-def read_chemical_handling_permit(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def read_chemical_handling_permit(skip: int = 0, limit: int = 10, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all chemical handling permits with pagination.
     """
-    permit_records = db.query(ChemicalHandlingPermitDB).offset(skip).limit(limit).all()
-    return permit_records
+    sparse = SparseFields(ChemicalHandlingPermit, ChemicalHandlingPermitDB, fields)
+    permit_records = sparse.apply(db.query(ChemicalHandlingPermitDB)).offset(skip).limit(limit).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/chemical-handling-permit/{permit_id}", response_model=ChemicalHandlingPermit, tags=["Chemical Handling Permit"])
-def read_chemical_handling_permit_by_id(permit_id: int, db: Session = Depends(get_db)):
+def read_chemical_handling_permit_by_id(permit_id: int, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve a single chemical handling permit record by its ID.
     """
-    db_permit = db.query(ChemicalHandlingPermitDB).filter(ChemicalHandlingPermitDB.id == permit_id).first()
+    sparse = SparseFields(ChemicalHandlingPermit, ChemicalHandlingPermitDB, fields)
+    db_permit = sparse.apply(db.query(ChemicalHandlingPermitDB)).filter(ChemicalHandlingPermitDB.id == permit_id).first()
     if db_permit is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chemical handling permit not found")
-    return db_permit
+    return sparse.response(db_permit)
 
 @app.get("/chemical-handling-permit/permit/{permit_number}", response_model=ChemicalHandlingPermit, tags=["Chemical Handling Permit"])
 def read_chemical_handling_permit_by_permit_number(permit_number: str, db: Session = Depends(get_db)):
@@ -16674,12 +19711,13 @@ def read_chemical_handling_permit_by_permit_number(permit_number: str, db: Sessi
     return db_permit
 
 @app.get("/chemical-handling-permit/property/{property_id}", response_model=List[ChemicalHandlingPermit], tags=["Chemical Handling Permit"])
-def read_chemical_handling_permit_by_property(property_id: str, db: Session = Depends(get_db)):
+def read_chemical_handling_permit_by_property(property_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all chemical handling permits for a specific property.
     """
-    permit_records = db.query(ChemicalHandlingPermitDB).filter(ChemicalHandlingPermitDB.property_id == property_id).all()
-    return permit_records
+    sparse = SparseFields(ChemicalHandlingPermit, ChemicalHandlingPermitDB, fields)
+    permit_records = sparse.apply(db.query(ChemicalHandlingPermitDB)).filter(ChemicalHandlingPermitDB.property_id == property_id).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/chemical-handling-permit/date/{date}", response_model=List[ChemicalHandlingPermit], tags=["Chemical Handling Permit"])
 def read_chemical_handling_permit_by_date(date: str, db: Session = Depends(get_db)):
@@ -16933,22 +19971,24 @@ def create_lifting_work_permit(permit: LiftingWorkPermitCreate, db: Session = De
     return db_permit
 
 @app.get("/lifting-work-permit/", response_model=List[LiftingWorkPermit], tags=["Lifting Work Permit"])
-def read_lifting_work_permit(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def read_lifting_work_permit(skip: int = 0, limit: int = 10, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all lifting work permits with pagination.
     """
-    permit_records = db.query(LiftingWorkPermitDB).offset(skip).limit(limit).all()
-    return permit_records
+    sparse = SparseFields(LiftingWorkPermit, LiftingWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(LiftingWorkPermitDB)).offset(skip).limit(limit).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/lifting-work-permit/{permit_id}", response_model=LiftingWorkPermit, tags=["Lifting Work Permit"])
-def read_lifting_work_permit_by_id(permit_id: int, db: Session = Depends(get_db)):
+def read_lifting_work_permit_by_id(permit_id: int, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve a single lifting work permit record by its ID.
     """
-    db_permit = db.query(LiftingWorkPermitDB).filter(LiftingWorkPermitDB.id == permit_id).first()
+    sparse = SparseFields(LiftingWorkPermit, LiftingWorkPermitDB, fields)
+    db_permit = sparse.apply(db.query(LiftingWorkPermitDB)).filter(LiftingWorkPermitDB.id == permit_id).first()
     if db_permit is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lifting work permit not found")
-    return db_permit
+    return sparse.response(db_permit)
 
 @app.get("/lifting-work-permit/permit/{permit_number}", response_model=LiftingWorkPermit, tags=["Lifting Work Permit"])
 def read_lifting_work_permit_by_permit_number(permit_number: str, db: Session = Depends(get_db)):
@@ -16961,12 +20001,13 @@ def read_lifting_work_permit_by_permit_number(permit_number: str, db: Session =
     return db_permit
 
 @app.get("/lifting-work-permit/property/{property_id}", response_model=List[LiftingWorkPermit], tags=["Lifting Work Permit"])
-def read_lifting_work_permit_by_property(property_id: str, db: Session = Depends(get_db)):
+def read_lifting_work_permit_by_property(property_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all lifting work permits for a specific property.
     """
-    permit_records = db.query(LiftingWorkPermitDB).filter(LiftingWorkPermitDB.property_id == property_id).all()
-    return permit_records
+    sparse = SparseFields(LiftingWorkPermit, LiftingWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(LiftingWorkPermitDB)).filter(LiftingWorkPermitDB.property_id == property_id).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/lifting-work-permit/date/{date}", response_model=List[LiftingWorkPermit], tags=["Lifting Work Permit"])
 def read_lifting_work_permit_by_date(date: str, db: Session = Depends(get_db)):
@@ -17250,22 +20291,24 @@ def create_demolition_work_permit(permit: DemolitionWorkPermitCreate, db: Sessio
     return db_permit
 
 @app.get("/demolition-work-permit/", response_model=List[DemolitionWorkPermit], tags=["Demolition Work Permit"])
-def read_demolition_work_permit(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def read_demolition_work_permit(skip: int = 0, limit: int = 10, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all demolition work permits with pagination.
     """
-    permit_records = db.query(DemolitionWorkPermitDB).offset(skip).limit(limit).all()
-    return permit_records
+    sparse = SparseFields(DemolitionWorkPermit, DemolitionWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(DemolitionWorkPermitDB)).offset(skip).limit(limit).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/demolition-work-permit/{permit_id}", response_model=DemolitionWorkPermit, tags=["Demolition Work Permit"])
-def read_demolition_work_permit_by_id(permit_id: int, db: Session = Depends(get_db)):
+def read_demolition_work_permit_by_id(permit_id: int, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve a single demolition work permit record by its ID.
     """
-    db_permit = db.query(DemolitionWorkPermitDB).filter(DemolitionWorkPermitDB.id == permit_id).first()
+    sparse = SparseFields(DemolitionWorkPermit, DemolitionWorkPermitDB, fields)
+    db_permit = sparse.apply(db.query(DemolitionWorkPermitDB)).filter(DemolitionWorkPermitDB.id == permit_id).first()
     if db_permit is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Demolition work permit not found")
-    return db_permit
+    return sparse.response(db_permit)
 
 @app.get("/demolition-work-permit/permit/{permit_number}", response_model=DemolitionWorkPermit, tags=["Demolition Work Permit"])
 def read_demolition_work_permit_by_permit_number(permit_number: str, db: Session = Depends(get_db)):
@@ -17278,12 +20321,13 @@ def read_demolition_work_permit_by_permit_number(permit_number: str, db: Session
     return db_permit
 
 @app.get("/demolition-work-permit/property/{property_id}", response_model=List[DemolitionWorkPermit], tags=["Demolition Work Permit"])
-def read_demolition_work_permit_by_property(property_id: str, db: Session = Depends(get_db)):
+def read_demolition_work_permit_by_property(property_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all demolition work permits for a specific property.
     """
-    permit_records = db.query(DemolitionWorkPermitDB).filter(DemolitionWorkPermitDB.property_id == property_id).all()
-    return permit_records
+    sparse = SparseFields(DemolitionWorkPermit, DemolitionWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(DemolitionWorkPermitDB)).filter(DemolitionWorkPermitDB.property_id == property_id).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/demolition-work-permit/date/{date}", response_model=List[DemolitionWorkPermit], tags=["Demolition Work Permit"])
 def read_demolition_work_permit_by_date(date: str, db: Session = Depends(get_db)):
@@ -17567,22 +20611,24 @@ def create_temporary_structure_installation_permit(permit: TemporaryStructureIns
     return db_permit
 
 @app.get("/temporary-structure-installation-permit/", response_model=List[TemporaryStructureInstallationPermit], tags=["Temporary Structure Installation Permit"])
-def read_temporary_structure_installation_permit(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def read_temporary_structure_installation_permit(skip: int = 0, limit: int = 10, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all temporary structure installation permits with pagination.
     """
-    permit_records = db.query(TemporaryStructureInstallationPermitDB).offset(skip).limit(limit).all()
-    return permit_records
+    sparse = SparseFields(TemporaryStructureInstallationPermit, TemporaryStructureInstallationPermitDB, fields)
+    permit_records = sparse.apply(db.query(TemporaryStructureInstallationPermitDB)).offset(skip).limit(limit).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/temporary-structure-installation-permit/{permit_id}", response_model=TemporaryStructureInstallationPermit, tags=["Temporary Structure Installation Permit"])
-def read_temporary_structure_installation_permit_by_id(permit_id: int, db: Session = Depends(get_db)):
+def read_temporary_structure_installation_permit_by_id(permit_id: int, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve a single temporary structure installation permit record by its ID.
     """
-    db_permit = db.query(TemporaryStructureInstallationPermitDB).filter(TemporaryStructureInstallationPermitDB.id == permit_id).first()
+    sparse = SparseFields(TemporaryStructureInstallationPermit, TemporaryStructureInstallationPermitDB, fields)
+    db_permit = sparse.apply(db.query(TemporaryStructureInstallationPermitDB)).filter(TemporaryStructureInstallationPermitDB.id == permit_id).first()
     if db_permit is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Temporary structure installation permit not found")
-    return db_permit
+    return sparse.response(db_permit)
 
 @app.get("/temporary-structure-installation-permit/permit/{permit_number}", response_model=TemporaryStructureInstallationPermit, tags=["Temporary Structure Installation Permit"])
 def read_temporary_structure_installation_permit_by_permit_number(permit_number: str, db: Session = Depends(get_db)):
@@ -17595,12 +20641,13 @@ def read_temporary_structure_installation_permit_by_permit_number(permit_number:
     return db_permit
 
 @app.get("/temporary-structure-installation-permit/property/{property_id}", response_model=List[TemporaryStructureInstallationPermit], tags=["Temporary Structure Installation Permit"])
-def read_temporary_structure_installation_permit_by_property(property_id: str, db: Session = Depends(get_db)):
+def read_temporary_structure_installation_permit_by_property(property_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all temporary structure installation permits for a specific property.
     """
-    permit_records = db.query(TemporaryStructureInstallationPermitDB).filter(TemporaryStructureInstallationPermitDB.property_id == property_id).all()
-    return permit_records
+    sparse = SparseFields(TemporaryStructureInstallationPermit, TemporaryStructureInstallationPermitDB, fields)
+    permit_records = sparse.apply(db.query(TemporaryStructureInstallationPermitDB)).filter(TemporaryStructureInstallationPermitDB.property_id == property_id).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/temporary-structure-installation-permit/date/{date}", response_model=List[TemporaryStructureInstallationPermit], tags=["Temporary Structure Installation Permit"])
 def read_temporary_structure_installation_permit_by_date(date: str, db: Session = Depends(get_db)):
@@ -17873,22 +20920,24 @@ def create_vehicle_entry_permit(permit: VehicleEntryPermitCreate, db: Session =
     return db_permit
 
 @app.get("/vehicle-entry-permit/", response_model=List[VehicleEntryPermit], tags=["Vehicle Entry Permit"])
-def read_vehicle_entry_permit(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def read_vehicle_entry_permit(skip: int = 0, limit: int = 10, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all vehicle entry permits with pagination.
     """
-    permit_records = db.query(VehicleEntryPermitDB).offset(skip).limit(limit).all()
-    return permit_records
+    sparse = SparseFields(VehicleEntryPermit, VehicleEntryPermitDB, fields)
+    permit_records = sparse.apply(db.query(VehicleEntryPermitDB)).offset(skip).limit(limit).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/vehicle-entry-permit/{permit_id}", response_model=VehicleEntryPermit, tags=["Vehicle Entry Permit"])
-def read_vehicle_entry_permit_by_id(permit_id: int, db: Session = Depends(get_db)):
+def read_vehicle_entry_permit_by_id(permit_id: int, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve a single vehicle entry permit record by its ID.
     """
-    db_permit = db.query(VehicleEntryPermitDB).filter(VehicleEntryPermitDB.id == permit_id).first()
+    sparse = SparseFields(VehicleEntryPermit, VehicleEntryPermitDB, fields)
+    db_permit = sparse.apply(db.query(VehicleEntryPermitDB)).filter(VehicleEntryPermitDB.id == permit_id).first()
     if db_permit is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vehicle entry permit not found")
-    return db_permit
+    return sparse.response(db_permit)
 
 @app.get("/vehicle-entry-permit/permit/{permit_number}", response_model=VehicleEntryPermit, tags=["Vehicle Entry Permit"])
 def read_vehicle_entry_permit_by_permit_number(permit_number: str, db: Session = Depends(get_db)):
@@ -17901,12 +20950,13 @@ def read_vehicle_entry_permit_by_permit_number(permit_number: str, db: Session =
     return db_permit
 
 @app.get("/vehicle-entry-permit/property/{property_id}", response_model=List[VehicleEntryPermit], tags=["Vehicle Entry Permit"])
-def read_vehicle_entry_permit_by_property(property_id: str, db: Session = Depends(get_db)):
+def read_vehicle_entry_permit_by_property(property_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all vehicle entry permits for a specific property.
     """
-    permit_records = db.query(VehicleEntryPermitDB).filter(VehicleEntryPermitDB.property_id == property_id).all()
-    return permit_records
+    sparse = SparseFields(VehicleEntryPermit, VehicleEntryPermitDB, fields)
+    permit_records = sparse.apply(db.query(VehicleEntryPermitDB)).filter(VehicleEntryPermitDB.property_id == property_id).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/vehicle-entry-permit/date/{date}", response_model=List[VehicleEntryPermit], tags=["Vehicle Entry Permit"])
 def read_vehicle_entry_permit_by_date(date: str, db: Session = Depends(get_db)):
@@ -18155,22 +21205,24 @@ def create_interior_work_permit(permit: InteriorWorkPermitCreate, db: Session =
     return db_permit
 
 @app.get("/interior-work-permit/", response_model=List[InteriorWorkPermit], tags=["Interior Work Permit"])
-def read_interior_work_permit(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+def read_interior_work_permit(skip: int = 0, limit: int = 10, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all interior work permits with pagination.
     """
-    permit_records = db.query(InteriorWorkPermitDB).offset(skip).limit(limit).all()
-    return permit_records
+    sparse = SparseFields(InteriorWorkPermit, InteriorWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(InteriorWorkPermitDB)).offset(skip).limit(limit).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/interior-work-permit/{permit_id}", response_model=InteriorWorkPermit, tags=["Interior Work Permit"])
-def read_interior_work_permit_by_id(permit_id: int, db: Session = Depends(get_db)):
+def read_interior_work_permit_by_id(permit_id: int, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve a single interior work permit record by its ID.
     """
-    db_permit = db.query(InteriorWorkPermitDB).filter(InteriorWorkPermitDB.id == permit_id).first()
+    sparse = SparseFields(InteriorWorkPermit, InteriorWorkPermitDB, fields)
+    db_permit = sparse.apply(db.query(InteriorWorkPermitDB)).filter(InteriorWorkPermitDB.id == permit_id).first()
     if db_permit is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Interior work permit not found")
-    return db_permit
+    return sparse.response(db_permit)
 
 @app.get("/interior-work-permit/permit/{permit_number}", response_model=InteriorWorkPermit, tags=["Interior Work Permit"])
 def read_interior_work_permit_by_permit_number(permit_number: str, db: Session = Depends(get_db)):
@@ -18183,12 +21235,13 @@ def read_interior_work_permit_by_permit_number(permit_number: str, db: Session =
     return db_permit
 
 @app.get("/interior-work-permit/property/{property_id}", response_model=List[InteriorWorkPermit], tags=["Interior Work Permit"])
-def read_interior_work_permit_by_property(property_id: str, db: Session = Depends(get_db)):
+def read_interior_work_permit_by_property(property_id: str, fields: Optional[str] = Query(None, description="Comma-separated fields to return"), db: Session = Depends(get_db)):
     """
     Retrieve all interior work permits for a specific property.
     """
-    permit_records = db.query(InteriorWorkPermitDB).filter(InteriorWorkPermitDB.property_id == property_id).all()
-    return permit_records
+    sparse = SparseFields(InteriorWorkPermit, InteriorWorkPermitDB, fields)
+    permit_records = sparse.apply(db.query(InteriorWorkPermitDB)).filter(InteriorWorkPermitDB.property_id == property_id).all()
+    return model_list_response(sparse.model, permit_records)
 
 @app.get("/interior-work-permit/date/{date}", response_model=List[InteriorWorkPermit], tags=["Interior Work Permit"])
 def read_interior_work_permit_by_date(date: str, db: Session = Depends(get_db)):
@@ -18287,4 +21340,1571 @@ def delete_interior_work_permit(permit_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_permit)
     db.commit()
-    return {"ok": True}
\ No newline at end of file
+    return {"ok": True}
+
+# --- Permit Search ---
+import re
+from sqlalchemy import text, inspect
+
+# One FTS5 index over all permit modules, kept in sync by triggers on each permit table.
+# Each permit type has a fixed code so its rows live at rowid = code * PERMIT_SEARCH_ROWID_STRIDE + id,
+# which lets the triggers replace or drop an entry by rowid instead of scanning the index.
+# Codes are stored in the index: append new permit types, never renumber existing ones.
+PERMIT_SEARCH_ROWID_STRIDE = 1 << 32
+
+PERMIT_SEARCH_FIELDS = {
+    "hot-work-permit": {
+        "code": 1, "table": "hot_work_permit", "number": "permit_no", "date": "date_of_issue",
+        "contractor": ["person_or_agency_performing_work"],
+        "location": ["location_of_work"],
+        "work": [],
+        "description": ["description_of_hot_work"],
+    },
+    "cold-work-permit": {
+        "code": 2, "table": "cold_work_permit", "number": "permit_number", "date": "date_of_issue",
+        "contractor": ["person_or_agency_performing_work"],
+        "location": ["site_location_of_work", "floor_zone_area_details"],
+        "work": ["nature_of_tools_used"],
+        "description": ["description_of_work"],
+    },
+    "electrical-work-permit": {
+        "code": 3, "table": "electrical_work_permit", "number": "permit_number", "date": "date_of_issue",
+        "contractor": ["contractor_agency_name"],
+        "location": ["work_location", "equipment_panel_area_to_be_worked_on"],
+        "work": ["nature_of_work"],
+        "description": ["description_of_electrical_task"],
+    },
+    "height-work-permit": {
+        "code": 4, "table": "height_work_permit", "number": "permit_number", "date": "date_of_issue",
+        "contractor": ["contractor_agency_name"],
+        "location": ["site_location_of_work"],
+        "work": ["scaffolding_or_ladder_type_used"],
+        "description": ["description_of_task"],
+    },
+    "confined-space-work-permit": {
+        "code": 5, "table": "confined_space_work_permit", "number": "permit_number", "date": "date_of_issue",
+        "contractor": ["contractor_agency_name"],
+        "location": ["site_location_of_confined_space", "specific_space_name_or_number"],
+        "work": ["nature_of_work"],
+        "description": ["remarks_or_precautions"],
+    },
+    "general-maintenance-permit": {
+        "code": 6, "table": "general_maintenance_permit", "number": "permit_number", "date": "date_of_issue",
+        "contractor": ["contractor_or_maintenance_agency_name", "requesting_department_or_resident_name"],
+        "location": ["location_of_work"],
+        "work": ["nature_of_work"],
+        "description": ["detailed_description_of_work"],
+    },
+    "working-alone-permit": {
+        "code": 7, "table": "working_alone_permit", "number": None, "date": "Date",
+        "contractor": ["Employee_Name", "Supervisor_Name"],
+        "location": ["Site_Location_of_Work"],
+        "work": ["Nature_of_Task"],
+        "description": ["Reason_for_Working_Alone", "Special_Instructions"],
+    },
+    "excavation-work-permit": {
+        "code": 8, "table": "excavation_work_permit", "number": "permit_number", "date": "date_of_issue",
+        "contractor": ["contractor_agency_name"],
+        "location": ["site_location_of_excavation"],
+        "work": ["purpose_of_excavation"],
+        "description": ["remarks_or_observations"],
+    },
+    "lockout-tagout-permit": {
+        "code": 9, "table": "lockout_tagout_permit", "number": "permit_number", "date": "date_of_issue",
+        "contractor": ["contractor_agency_name"],
+        "location": ["location_of_equipment"],
+        "work": ["equipment_system_to_be_isolated"],
+        "description": ["reason_for_lockout_tagout", "remarks_or_observations"],
+    },
+    "chemical-handling-permit": {
+        "code": 10, "table": "chemical_handling_permit", "number": "permit_number", "date": "date_of_issue",
+        "contractor": ["contractor_agency_name"],
+        "location": ["site_location_of_work"],
+        "work": ["nature_of_chemical_work"],
+        "description": ["remarks_or_observations"],
+    },
+    "lifting-work-permit": {
+        "code": 11, "table": "lifting_work_permit", "number": "permit_number", "date": "date_of_issue",
+        "contractor": ["contractor_agency_name"],
+        "location": ["site_location_of_lifting"],
+        "work": ["nature_of_lifting_work", "equipment_to_be_lifted"],
+        "description": ["lifting_equipment_used"],
+    },
+    "demolition-work-permit": {
+        "code": 12, "table": "demolition_work_permit", "number": "permit_number", "date": "date_of_issue",
+        "contractor": ["contractor_agency_name"],
+        "location": ["site_location_of_demolition"],
+        "work": ["nature_of_demolition_work", "structure_to_be_demolished"],
+        "description": ["demolition_method"],
+    },
+    "temporary-structure-installation-permit": {
+        "code": 13, "table": "temporary_structure_installation_permit", "number": "permit_number", "date": "date_of_issue",
+        "contractor": ["contractor_agency_name"],
+        "location": ["site_location_of_installation"],
+        "work": ["nature_of_temporary_structure", "type_of_temporary_structure"],
+        "description": ["foundation_type"],
+    },
+    "vehicle-entry-permit": {
+        "code": 14, "table": "vehicle_entry_permit", "number": "permit_number", "date": "date_of_issue",
+        "contractor": ["contractor_agency_name"],
+        "location": ["site_location_of_entry", "parking_area_assigned"],
+        "work": ["nature_of_vehicle_work"],
+        "description": [],
+    },
+    "interior-work-permit": {
+        "code": 15, "table": "interior_work_permit", "number": "permit_number", "date": "date_of_issue",
+        "contractor": ["contractor_agency_name"],
+        "location": ["site_location_of_interior_work"],
+        "work": ["nature_of_interior_work", "type_of_interior_work"],
+        "description": ["remarks_or_observations"],
+    },
+}
+
+PERMIT_SEARCH_COLUMNS = ["contractor", "location", "work", "description"]
+# bm25 weights, in index column order: permit_type, permit_id, property_id, permit_date (unindexed), permit_number, then PERMIT_SEARCH_COLUMNS
+PERMIT_SEARCH_WEIGHTS = "0, 0, 0, 0, 5.0, 3.0, 2.0, 2.0, 1.0"
+
+def _permit_search_values(permit_type: str, config: dict, row: str) -> dict:
+    """SQL expressions for one index entry, read from the NEW or OLD row of a permit table"""
+    def joined(columns):
+        if not columns:
+            return "NULL"
+        if len(columns) == 1:
+            return f"{row}.{columns[0]}"
+        return "TRIM(" + " || ' ' || ".join(f"COALESCE({row}.{c}, '')" for c in columns) + ")"
+    values = {
+        "rowid": f"{config['code']} * {PERMIT_SEARCH_ROWID_STRIDE} + {row}.id",
+        "permit_type": f"'{permit_type}'",
+        "permit_id": f"{row}.id",
+        "property_id": f"{row}.property_id",
+        "permit_date": f"{row}.{config['date']}",
+        "permit_number": f"{row}.{config['number']}" if config["number"] else "NULL",
+    }
+    for column in PERMIT_SEARCH_COLUMNS:
+        values[column] = joined(config[column])
+    return values
+
+def _permit_search_triggers(permit_type: str, config: dict) -> List[str]:
+    table = config["table"]
+    watched = ["property_id", config["date"]] + ([config["number"]] if config["number"] else [])
+    watched += [c for column in PERMIT_SEARCH_COLUMNS for c in config[column]]
+    new = _permit_search_values(permit_type, config, "NEW")
+    insert = f"INSERT INTO permit_search ({', '.join(new)}) VALUES ({', '.join(new.values())});"
+    delete = f"DELETE FROM permit_search WHERE rowid = {config['code']} * {PERMIT_SEARCH_ROWID_STRIDE} + OLD.id;"
+    return [
+        f"CREATE TRIGGER permit_search_{table}_insert AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER permit_search_{table}_update AFTER UPDATE OF {', '.join(watched)} ON {table} BEGIN {delete} {insert} END",
+        f"CREATE TRIGGER permit_search_{table}_delete AFTER DELETE ON {table} BEGIN {delete} END",
+    ]
+
+def ensure_permit_search():
+    """Create the permit FTS5 index and its triggers, filling it from existing permits the first time"""
+    seed = not inspect(engine).has_table("permit_search")
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS permit_search USING fts5(
+                permit_type UNINDEXED, permit_id UNINDEXED, property_id UNINDEXED, permit_date UNINDEXED,
+                permit_number, contractor, location, work, description,
+                tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+            )
+        """))
+        for permit_type, config in PERMIT_SEARCH_FIELDS.items():
+            # Dropped and recreated on every start so edits to PERMIT_SEARCH_FIELDS reach existing databases
+            for event in ("insert", "update", "delete"):
+                conn.execute(text(f"DROP TRIGGER IF EXISTS permit_search_{config['table']}_{event}"))
+            for trigger in _permit_search_triggers(permit_type, config):
+                conn.execute(text(trigger))
+            if seed:
+                values = _permit_search_values(permit_type, config, config["table"])
+                conn.execute(text(
+                    f"INSERT INTO permit_search ({', '.join(values)}) SELECT {', '.join(values.values())} FROM {config['table']}"
+                ))
+
+ensure_permit_search()
+
+def permit_search_match(q: str, fields: Optional[List[str]] = None) -> str:
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix"""
+    terms = re.findall(r"\w+", q, flags=re.UNICODE)
+    if not terms:
+        return ""
+    phrases = [f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*']
+    match = " AND ".join(phrases)
+    if fields:
+        match = "{" + " ".join(fields) + "} : (" + match + ")"
+    return match
+
+class PermitSearchHit(BaseModel):
+    permit_type: str
+    permit_id: int
+    property_id: Optional[str] = None
+    permit_number: Optional[str] = None
+    permit_date: Optional[str] = None
+    contractor: Optional[str] = None
+    location: Optional[str] = None
+    work: Optional[str] = None
+    snippet: Optional[str] = None
+    score: float
+
+@app.get("/permits/search", response_model=List[PermitSearchHit], tags=["Permits"])
+def search_permits(
+    q: str = Query(..., min_length=1),
+    property_id: str = Query(...),
+    permit_type: Optional[List[str]] = Query(None),
+    field: Optional[List[str]] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """
+    Ranked full-text search over contractor, location, nature/type of work and description
+    of every permit module for one property. Restrict with ?permit_type= and ?field=.
+    """
+    unknown = [t for t in permit_type or [] if t not in PERMIT_SEARCH_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown permit_type: {', '.join(unknown)}")
+    bad_fields = [f for f in field or [] if f not in PERMIT_SEARCH_COLUMNS + ["permit_number"]]
+    if bad_fields:
+        raise HTTPException(status_code=400, detail=f"Unknown field: {', '.join(bad_fields)}")
+    match = permit_search_match(q, field)
+    if not match:
+        return []
+    params = {"match": match, "property_id": property_id, "limit": limit, "offset": offset}
+    type_filter = ""
+    if permit_type:
+        # Each permit type owns a contiguous rowid range, so this narrows by rowid rather than by column
+        ranges = []
+        for i, name in enumerate(permit_type):
+            params[f"lo{i}"] = PERMIT_SEARCH_FIELDS[name]["code"] * PERMIT_SEARCH_ROWID_STRIDE
+            params[f"hi{i}"] = params[f"lo{i}"] + PERMIT_SEARCH_ROWID_STRIDE
+            ranges.append(f"(rowid >= :lo{i} AND rowid < :hi{i})")
+        type_filter = "AND (" + " OR ".join(ranges) + ")"
+    rows = db.execute(text(f"""
+        SELECT permit_type, permit_id, property_id, permit_number, permit_date, contractor, location, work,
+               snippet(permit_search, -1, '[', ']', '...', 12) AS snippet,
+               bm25(permit_search, {PERMIT_SEARCH_WEIGHTS}) AS score
+        FROM permit_search
+        WHERE permit_search MATCH :match AND property_id = :property_id {type_filter}
+        ORDER BY score
+        LIMIT :limit OFFSET :offset
+    """), params).mappings().all()
+    # bm25 is lower-is-better; flip it so clients can treat a higher score as a better match
+    return [PermitSearchHit(**{**row, "score": -row["score"]}) for row in rows]
+
+# --- Property Search ---
+from sqlalchemy import UniqueConstraint
+
+# A second FTS5 index for the non-permit modules, queried together with permit_search by one endpoint.
+# These tables use string ids, so property_search_keys hands out the integer rowid for each
+# (entity_type, entity_id). Triggers keep both tables in sync inside the writing transaction, which
+# means the index changes become visible at commit, including for bulk and raw SQL writes.
+class PropertySearchKey(Base):
+    __tablename__ = "property_search_keys"
+
+    docid = Column(Integer, primary_key=True)
+    entity_type = Column(String, nullable=False)
+    entity_id = Column(String, nullable=False)
+
+    __table_args__ = (UniqueConstraint("entity_type", "entity_id", name="uq_property_search_keys_entity"),)
+
+# Rows without their own property_id name the parent report that carries it
+PROPERTY_SEARCH_SOURCES = {
+    "incident": {
+        "table": "incident_reports", "date": "date_of_report",
+        "title": ["incident_id", "organization"],
+        "body": ["incident_description", "prepared_by"],
+    },
+    "ticket": {
+        "table": "tickets", "parent": ("community_reports", "community_report_id"), "date": "reported_date",
+        "title": ["ticket_id", "issue_type"],
+        "body": ["resident_name", "contact_number", "address", "description", "assigned_team", "security_officer", "remarks"],
+    },
+    "gate_pass": {
+        "table": "gate_pass_management", "parent": ("visitor_management_reports", "report_id"), "date": "entry_date",
+        "title": ["pass_id", "name"],
+        "body": ["contact_number", "purpose", "vehicle_no", "gate_no", "security_officer", "remarks"],
+    },
+    "visitor_log": {
+        "table": "visitor_management_log", "parent": ("visitor_management_reports", "report_id"), "date": "entry_date",
+        "title": ["name", "record_id"],
+        "body": ["type", "contact_number", "purpose", "company_supplier", "item_description", "vehicle_no",
+                 "driver_name", "gate_no", "security_officer", "remarks"],
+    },
+    "asset": {
+        "table": "assets", "date": "purchase_date",
+        "title": ["asset_name", "tag_number"],
+        "body": ["asset_category", "location", "vendor_name", "additional_info"],
+    },
+    "inventory": {
+        "table": "inventories", "date": "date_of_purchase",
+        "title": ["stock_name", "stock_id"],
+        "body": ["department", "inventory_subledger", "custodian", "location", "description"],
+    },
+}
+
+PropertySearchEntity = Literal["incident", "ticket", "gate_pass", "visitor_log", "asset", "inventory", "permit"]
+
+# bm25 weights, in index column order: entity_type, entity_id, property_id, entity_date (unindexed), scope, title, body.
+# Snippets come from body (column 6); scope always matches and title is returned whole.
+PROPERTY_SEARCH_WEIGHTS = "0, 0, 0, 0, 0, 4.0, 1.0"
+# bm25 scores from property_search and permit_search come from different weights and corpus statistics, so hits
+# are merged by their rank within their own index (reciprocal rank fusion with this constant), not by raw score
+PROPERTY_SEARCH_RANK_CONSTANT = 60
+
+def _property_search_values(entity_type: str, config: dict, row: str) -> dict:
+    """SQL expressions for one index entry, read from the NEW or OLD row (or the table itself when seeding)"""
+    if "parent" in config:
+        parent_table, parent_key = config["parent"]
+        property_id = f"(SELECT property_id FROM {parent_table} WHERE id = {row}.{parent_key})"
+    else:
+        property_id = f"{row}.property_id"
+    def joined(columns):
+        return "TRIM(" + " || ' ' || ".join(f"COALESCE({row}.{c}, '')" for c in columns) + ")"
+    return {
+        "rowid": f"(SELECT docid FROM property_search_keys WHERE entity_type = '{entity_type}' AND entity_id = {row}.id)",
+        "entity_type": f"'{entity_type}'",
+        "entity_id": f"{row}.id",
+        "property_id": property_id,
+        "entity_date": f"{row}.{config['date']}",
+        # Hyphens dropped so a property id is a single token that the MATCH can scope on
+        "scope": f"REPLACE({property_id}, '-', '')",
+        "title": joined(config["title"]),
+        "body": joined(config["body"]),
+    }
+
+def _property_search_triggers(entity_type: str, config: dict) -> List[str]:
+    table = config["table"]
+    watched = [config["date"]] + config["title"] + config["body"]
+    watched.append(config["parent"][1] if "parent" in config else "property_id")
+    new = _property_search_values(entity_type, config, "NEW")
+    insert = (
+        f"INSERT OR IGNORE INTO property_search_keys (entity_type, entity_id) VALUES ('{entity_type}', NEW.id); "
+        f"INSERT INTO property_search ({', '.join(new)}) VALUES ({', '.join(new.values())});"
+    )
+    delete = (
+        f"DELETE FROM property_search WHERE rowid = "
+        f"(SELECT docid FROM property_search_keys WHERE entity_type = '{entity_type}' AND entity_id = OLD.id); "
+        f"DELETE FROM property_search_keys WHERE entity_type = '{entity_type}' AND entity_id = OLD.id;"
+    )
+    triggers = [
+        f"CREATE TRIGGER property_search_{table}_insert AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER property_search_{table}_update AFTER UPDATE OF {', '.join(watched)} ON {table} BEGIN {delete} {insert} END",
+        f"CREATE TRIGGER property_search_{table}_delete AFTER DELETE ON {table} BEGIN {delete} END",
+    ]
+    if "parent" in config:
+        # Moving a report to another property re-scopes its children through their update trigger
+        parent_table, parent_key = config["parent"]
+        triggers.append(
+            f"CREATE TRIGGER property_search_{table}_parent AFTER UPDATE OF property_id ON {parent_table} "
+            f"BEGIN UPDATE {table} SET {parent_key} = {parent_key} WHERE {parent_key} = NEW.id; END"
+        )
+    return triggers
+
+def ensure_property_search():
+    """Create the property FTS5 index, its key table and triggers, filling them from existing rows the first time"""
+    seed = not inspect(engine).has_table("property_search")
+    with engine.begin() as conn:
+        PropertySearchKey.__table__.create(bind=conn, checkfirst=True)
+        conn.execute(text("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS property_search USING fts5(
+                entity_type UNINDEXED, entity_id UNINDEXED, property_id UNINDEXED, entity_date UNINDEXED,
+                scope, title, body,
+                tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+            )
+        """))
+        if seed:
+            conn.execute(text("DELETE FROM property_search_keys"))
+        for entity_type, config in PROPERTY_SEARCH_SOURCES.items():
+            table = config["table"]
+            for event in ("insert", "update", "delete", "parent"):
+                conn.execute(text(f"DROP TRIGGER IF EXISTS property_search_{table}_{event}"))
+            for trigger in _property_search_triggers(entity_type, config):
+                conn.execute(text(trigger))
+            if seed:
+                values = _property_search_values(entity_type, config, table)
+                conn.execute(text(
+                    f"INSERT INTO property_search_keys (entity_type, entity_id) SELECT '{entity_type}', id FROM {table}"
+                ))
+                conn.execute(text(
+                    f"INSERT INTO property_search ({', '.join(values)}) SELECT {', '.join(values.values())} FROM {table}"
+                ))
+
+ensure_property_search()
+
+class PropertySearchHit(BaseModel):
+    entity_type: PropertySearchEntity
+    entity_id: str
+    permit_type: Optional[str] = None
+    title: Optional[str] = None
+    date: Optional[str] = None
+    snippet: Optional[str] = None
+    score: float
+
+@app.get("/properties/{property_id}/search", response_model=List[PropertySearchHit], tags=["Search"])
+def search_property(
+    property_id: str,
+    q: str = Query(..., min_length=1),
+    types: Optional[List[PropertySearchEntity]] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """
+    Ranked search across incidents, tickets, gate passes, visitor logs, assets, inventory and permits
+    of one property. Restrict to some modules with ?types=.
+    """
+    terms = permit_search_match(q)
+    if not terms:
+        return []
+    scope = " ".join(re.findall(r"[^\W_]+", property_id.replace("-", "")))
+    # Each index only needs to rank as deep as the requested page
+    params = {"property_id": property_id, "limit": limit, "offset": offset, "depth": offset + limit}
+    selects = []
+    entity_types = [t for t in types or PROPERTY_SEARCH_SOURCES if t != "permit"]
+    if entity_types:
+        # The terms must not reach scope: a prefix of the property id would otherwise match every row of the property
+        params["match"] = f'scope : "{scope}" AND ' + permit_search_match(q, ["title", "body"])
+        type_filter = ""
+        if types:
+            for i, entity_type in enumerate(entity_types):
+                params[f"type{i}"] = entity_type
+            type_filter = "AND entity_type IN (" + ", ".join(f":type{i}" for i in range(len(entity_types))) + ")"
+        selects.append(f"""
+            SELECT entity_type, entity_id, NULL AS permit_type, title, entity_date AS date,
+                   snippet(property_search, 6, '[', ']', '...', 12) AS snippet,
+                   bm25(property_search, {PROPERTY_SEARCH_WEIGHTS}) AS score
+            FROM property_search
+            WHERE property_search MATCH :match {type_filter}
+            ORDER BY score LIMIT :depth
+        """)
+    if not types or "permit" in types:
+        params["permit_match"] = terms
+        selects.append(f"""
+            SELECT 'permit' AS entity_type, CAST(permit_id AS TEXT) AS entity_id, permit_type,
+                   TRIM(COALESCE(permit_number, '') || ' ' || COALESCE(contractor, '')) AS title, permit_date AS date,
+                   snippet(permit_search, -1, '[', ']', '...', 12) AS snippet,
+                   bm25(permit_search, {PERMIT_SEARCH_WEIGHTS}) AS score
+            FROM permit_search
+            WHERE permit_search MATCH :permit_match AND property_id = :property_id
+            ORDER BY score LIMIT :depth
+        """)
+    # Interleave the indexes by rank; equal ranks go to the hit closer to its own index's best score
+    ranked = [
+        f"""SELECT *, row_number() OVER (ORDER BY score) AS source_rank,
+                   COALESCE(score / NULLIF(min(score) OVER (), 0), 1) AS relevance
+            FROM ({select})"""
+        for select in selects
+    ]
+    rows = db.execute(text(
+        " UNION ALL ".join(ranked) + " ORDER BY source_rank, relevance DESC LIMIT :limit OFFSET :offset"
+    ), params).mappings().all()
+    return [
+        PropertySearchHit(**{
+            **{key: value for key, value in row.items() if key not in ("source_rank", "relevance")},
+            "score": 1 / (PROPERTY_SEARCH_RANK_CONSTANT + row["source_rank"]),
+        })
+        for row in rows
+    ]
+
+# --- Vehicle Index ---
+from datetime import date, timedelta
+from sqlalchemy import Index, event, inspect as sa_inspect, select
+
+# Every table that records a vehicle number, with where its property and dates live.
+# "parent" names the report table carrying property_id for child rows; the other keys name source columns.
+VEHICLE_INDEX_SOURCES = {
+    "parking_sticker": {"model": ParkingSticker, "parent": ("community_reports", "community_report_id"),
+                        "date": "sticker_issue_date", "valid_until": "sticker_expiry_date", "status": "status"},
+    "vehicle_entry_permit": {"model": VehicleEntryPermitDB, "plates": "vehicle_registration_numbers", "date": "date_of_issue",
+                             "valid_from": "permit_valid_from", "valid_until": "permit_valid_to"},
+    "gate_pass": {"model": GatePassManagement, "parent": ("visitor_management_reports", "report_id"),
+                  "date": "entry_date", "exit": ("exit_date", "exit_time")},
+    "visitor_log": {"model": VisitorManagementLog, "parent": ("visitor_management_reports", "report_id"),
+                    "date": "entry_date", "exit": ("exit_date", "exit_time"), "valid_until": "expected_return_date"},
+    "daily_entry": {"model": DailyEntryDetails, "parent": ("visitor_management_reports", "report_id"),
+                    "date": "entry_date", "exit": ("exit_time",)},
+    "water_tanker": {"model": WaterTankerManagement, "parent": ("visitor_management_reports", "report_id"), "date": "entry_date"},
+    "inward_returnable": {"model": InwardReturnable, "parent": ("visitor_management_reports", "report_id"),
+                          "date": "entry_date", "valid_until": "expected_return_date"},
+    "inward_non_returnable": {"model": InwardNonReturnable, "parent": ("visitor_management_reports", "report_id"), "date": "entry_date"},
+    "outward_returnable": {"model": OutwardReturnable, "parent": ("visitor_management_reports", "report_id"),
+                           "date": "outward_date", "valid_until": "expected_return_date"},
+    "outward_non_returnable": {"model": OutwardNonReturnable, "parent": ("visitor_management_reports", "report_id"), "date": "outward_date"},
+    "move_in": {"model": MoveIn, "parent": ("visitor_management_reports", "report_id"), "date": "move_in_date"},
+    "move_out": {"model": MoveOut, "parent": ("visitor_management_reports", "report_id"), "date": "move_out_date"},
+    "move_in_coordination": {"model": MoveInCoordination, "parent": ("community_reports", "community_report_id"), "date": "move_in_date"},
+    "move_out_coordination": {"model": MoveOutCoordination, "parent": ("community_reports", "community_report_id"), "date": "move_out_date"},
+}
+
+VEHICLE_INDEX_MODELS = {config["model"]: source for source, config in VEHICLE_INDEX_SOURCES.items()}
+VEHICLE_ENTRY_SOURCES = {"visitor_log", "daily_entry", "water_tanker", "inward_returnable", "inward_non_returnable",
+                         "outward_returnable", "outward_non_returnable", "move_in", "move_out",
+                         "move_in_coordination", "move_out_coordination", "gate_pass"}
+VEHICLE_STICKER_INACTIVE_STATUSES = {"expired", "inactive", "revoked", "cancelled", "canceled", "blocked", "suspended"}
+VEHICLE_RECENT_DAYS = 30
+VEHICLE_RECENT_LIMIT = 20
+
+# Indian registration: state, RTO district, optional series letters, number ("MH-1-ab-123" -> "MH01AB0123")
+VEHICLE_PLATE_PATTERN = re.compile(r"^([A-Z]{2})(\d{1,2})([A-Z]{0,3})(\d{1,4})$")
+
+class VehicleIndexEntry(Base):
+    __tablename__ = "vehicle_index"
+
+    # Written from the ORM flush of the source tables, one row per plate mentioned by a source row. Deletes and
+    # parent report moves are also applied by SQLite triggers, so bulk query().delete() and Core writes are covered.
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    plate = Column(String, nullable=False)  # canonical_plate() of raw
+    raw = Column(String, nullable=False)
+    source = Column(String, nullable=False)  # key of VEHICLE_INDEX_SOURCES
+    source_id = Column(String, nullable=False)
+    property_id = Column(String, nullable=True)
+    event_date = Column(String, nullable=True)
+    valid_from = Column(String, nullable=True)
+    valid_until = Column(String, nullable=True)
+    status = Column(String, nullable=True)
+    is_open = Column(Boolean, nullable=False, default=False)  # entered and no exit recorded yet
+
+    __table_args__ = (
+        Index("ix_vehicle_index_plate", "plate", "property_id"),
+        Index("ix_vehicle_index_source", "source", "source_id"),
+    )
+
+def canonical_plate(raw: Optional[str]) -> Optional[str]:
+    """Uppercase, strip separators and zero-pad Indian registrations so every spelling of a plate compares equal"""
+    if not raw:
+        return None
+    plate = re.sub(r"[^0-9A-Z]", "", str(raw).upper())
+    if not plate:
+        return None
+    match = VEHICLE_PLATE_PATTERN.match(plate)
+    if match:
+        state, district, series, number = match.groups()
+        plate = f"{state}{int(district):02d}{series}{int(number):04d}"
+    return plate
+
+def _vehicle_plates(value) -> List[str]:
+    """Raw plate strings held by a column: a JSON list, or free text with several plates split by , or ;"""
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value if item]
+    return [part.strip() for part in re.split(r"[,;]", str(value)) if part.strip()]
+
+def _vehicle_index_rows(source: str, values: dict, property_id: Optional[str]) -> List[dict]:
+    """Index rows for one source row, given its column values"""
+    config = VEHICLE_INDEX_SOURCES[source]
+    is_open = bool(config.get("exit")) and not any(values.get(column) for column in config["exit"])
+    rows = []
+    seen = set()
+    for raw in _vehicle_plates(values.get(config.get("plates", "vehicle_no"))):
+        plate = canonical_plate(raw)
+        if not plate or plate in seen:
+            continue
+        seen.add(plate)
+        rows.append({
+            "plate": plate,
+            "raw": raw,
+            "source": source,
+            "source_id": str(values["id"]),
+            "property_id": property_id,
+            "event_date": values.get(config["date"]),
+            "valid_from": values.get(config["valid_from"]) if "valid_from" in config else None,
+            "valid_until": values.get(config["valid_until"]) if "valid_until" in config else None,
+            "status": values.get(config["status"]) if "status" in config else None,
+            "is_open": is_open,
+        })
+    return rows
+
+def _vehicle_parent_properties(conn, parent_table: str, parent_ids) -> Dict[str, str]:
+    parent_ids = {parent_id for parent_id in parent_ids if parent_id}
+    if not parent_ids:
+        return {}
+    parent = Base.metadata.tables[parent_table]
+    return dict(conn.execute(select(parent.c.id, parent.c.property_id).where(parent.c.id.in_(parent_ids))).all())
+
+def build_vehicle_index_rows(conn, source: str, records: List[dict]) -> List[dict]:
+    """Index rows for many source rows of one source, resolving property_id through the parent report"""
+    config = VEHICLE_INDEX_SOURCES[source]
+    if "parent" in config:
+        parent_table, parent_key = config["parent"]
+        properties = _vehicle_parent_properties(conn, parent_table, (record.get(parent_key) for record in records))
+        resolve = lambda record: properties.get(record.get(parent_key))
+    else:
+        resolve = lambda record: record.get("property_id")
+    rows = []
+    for record in records:
+        rows.extend(_vehicle_index_rows(source, record, resolve(record)))
+    return rows
+
+def ensure_vehicle_index():
+    """Create the vehicle index, filling it from every source table the first time"""
+    if sa_inspect(engine).has_table(VehicleIndexEntry.__tablename__):
+        return
+    with engine.begin() as conn:
+        VehicleIndexEntry.__table__.create(bind=conn)
+        for source, config in VEHICLE_INDEX_SOURCES.items():
+            table = config["model"].__table__
+            plates = table.c[config.get("plates", "vehicle_no")]
+            result = conn.execute(select(table).where(plates.isnot(None))).mappings()
+            while True:
+                records = [dict(record) for record in result.fetchmany(5000)]
+                if not records:
+                    break
+                rows = build_vehicle_index_rows(conn, source, records)
+                if rows:
+                    conn.execute(VehicleIndexEntry.__table__.insert(), rows)
+
+ensure_vehicle_index()
+
+def ensure_vehicle_index_triggers():
+    """(Re)create the triggers that drop index rows of deleted source rows and follow children when a report moves property"""
+    children: Dict[str, List[tuple]] = {}
+    with engine.begin() as conn:
+        for source, config in VEHICLE_INDEX_SOURCES.items():
+            table = config["model"].__tablename__
+            conn.execute(text(f"DROP TRIGGER IF EXISTS vehicle_index_{table}_delete"))
+            conn.execute(text(f"""
+                CREATE TRIGGER vehicle_index_{table}_delete AFTER DELETE ON {table} BEGIN
+                    DELETE FROM vehicle_index WHERE source = '{source}' AND source_id = OLD.id;
+                END
+            """))
+            if "parent" in config:
+                parent_table, parent_key = config["parent"]
+                children.setdefault(parent_table, []).append((source, table, parent_key))
+        for parent_table, sources in children.items():
+            conn.execute(text(f"DROP TRIGGER IF EXISTS vehicle_index_{parent_table}_property"))
+            updates = "".join(
+                f"""
+                    UPDATE vehicle_index SET property_id = NEW.property_id
+                    WHERE source = '{source}' AND source_id IN (SELECT id FROM {table} WHERE {parent_key} = NEW.id);"""
+                for source, table, parent_key in sources
+            )
+            conn.execute(text(f"""
+                CREATE TRIGGER vehicle_index_{parent_table}_property AFTER UPDATE OF property_id ON {parent_table}
+                WHEN NEW.property_id IS NOT OLD.property_id BEGIN{updates}
+                END
+            """))
+
+ensure_vehicle_index_triggers()
+
+@event.listens_for(Session, "after_flush")
+def sync_vehicle_index(session, flush_context):
+    """Re-index vehicle numbers of flushed source rows inside the same transaction, so the index commits with them"""
+    changed: Dict[str, Dict[str, Optional[dict]]] = {}
+    for objects, deleted in ((session.new, False), (session.dirty, False), (session.deleted, True)):
+        for obj in objects:
+            source = VEHICLE_INDEX_MODELS.get(type(obj))
+            if source is None:
+                continue
+            mapper = sa_inspect(obj).mapper
+            values = None if deleted else {attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs}
+            changed.setdefault(source, {})[str(obj.id)] = values
+    if not changed:
+        return
+    conn = session.connection()
+    table = VehicleIndexEntry.__table__
+    for source, records in changed.items():
+        conn.execute(table.delete().where(table.c.source == source, table.c.source_id.in_(list(records))))
+        rows = build_vehicle_index_rows(conn, source, [values for values in records.values() if values is not None])
+        if rows:
+            conn.execute(table.insert(), rows)
+
+def _gate_date(value: Optional[str]) -> Optional[date]:
+    try:
+        return date.fromisoformat(str(value)[:10]) if value else None
+    except ValueError:
+        return None
+
+class VehicleIndexHit(BaseModel):
+    source: str
+    source_id: str
+    raw: str
+    event_date: Optional[str] = None
+    valid_from: Optional[str] = None
+    valid_until: Optional[str] = None
+    status: Optional[str] = None
+    is_open: bool
+
+    class Config:
+        from_attributes = True
+
+class VehicleGateLookup(BaseModel):
+    plate: str
+    property_id: str
+    has_valid_sticker: bool
+    has_active_permit: bool
+    has_open_gate_pass: bool
+    stickers: List[VehicleIndexHit]
+    active_permits: List[VehicleIndexHit]
+    open_gate_passes: List[VehicleIndexHit]
+    recent_entries: List[VehicleIndexHit]
+
+@app.get("/gate/vehicles/{plate}", response_model=VehicleGateLookup, tags=["Gate"])
+def lookup_vehicle_at_gate(plate: str, property_id: str = Query(...), db: Session = Depends(get_db)):
+    """
+    Everything the gate needs to know about a vehicle in one indexed lookup: its parking stickers,
+    active vehicle entry permits, open gate passes and entries in the last VEHICLE_RECENT_DAYS days.
+    """
+    canonical = canonical_plate(plate)
+    if not canonical:
+        raise HTTPException(status_code=400, detail="Vehicle number has no letters or digits")
+    entries = db.query(VehicleIndexEntry).filter(
+        VehicleIndexEntry.plate == canonical,
+        VehicleIndexEntry.property_id == property_id,
+    ).all()
+    today = date.today()
+    # Permit validity is stored as "%Y-%m-%dT%H:%M:%S" text and compared as such, like the permit endpoints do
+    now = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    stickers, active_permits, open_gate_passes, recent_entries = [], [], [], []
+    has_valid_sticker = False
+    for entry in entries:
+        if entry.source == "parking_sticker":
+            stickers.append(entry)
+            expiry = _gate_date(entry.valid_until)
+            inactive = (entry.status or "").strip().lower() in VEHICLE_STICKER_INACTIVE_STATUSES
+            if not inactive and (not entry.valid_until or (expiry is not None and expiry >= today)):
+                has_valid_sticker = True
+        elif entry.source == "vehicle_entry_permit":
+            if (entry.valid_from or "") <= now <= (entry.valid_until or ""):
+                active_permits.append(entry)
+        if entry.source == "gate_pass" and entry.is_open:
+            open_gate_passes.append(entry)
+        if entry.source in VEHICLE_ENTRY_SOURCES:
+            entered = _gate_date(entry.event_date)
+            if entered is not None and entered >= today - timedelta(days=VEHICLE_RECENT_DAYS):
+                recent_entries.append(entry)
+    recent_entries.sort(key=lambda entry: entry.event_date or "", reverse=True)
+    return VehicleGateLookup(
+        plate=canonical,
+        property_id=property_id,
+        has_valid_sticker=has_valid_sticker,
+        has_active_permit=bool(active_permits),
+        has_open_gate_pass=bool(open_gate_passes),
+        stickers=stickers,
+        active_permits=active_permits,
+        open_gate_passes=open_gate_passes,
+        recent_entries=recent_entries[:VEHICLE_RECENT_LIMIT],
+    )
+
+# --- Gate Blocklist Check ---
+import hashlib
+import unicodedata
+from typing import Tuple
+
+BLOCKLIST_INDEX_MAX_AGE = 60  # seconds; bounds staleness when another worker process wrote the blocklist
+BLOCKLIST_STATUS_BLOCKED = "Blocked"
+BLOCKLIST_STATUS_CLEAR = "Clear"
+
+def normalize_blocklist_name(name: Optional[str]) -> Optional[str]:
+    """Casefolded letters and single spaces only, so 'Ravi  KUMAR.' and 'ravi kumar' compare equal"""
+    if not name:
+        return None
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(ch for ch in name if not unicodedata.combining(ch)).casefold()
+    name = " ".join(re.findall(r"[^\W\d_]+", name))
+    return name or None
+
+def normalize_blocklist_phone(phone: Optional[str]) -> Optional[str]:
+    """Last ten digits, which drops +91 / 0 prefixes and any separators"""
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-10:] if len(digits) >= 6 else None
+
+def _blocklist_key(kind: str, value: Optional[str]) -> Optional[bytes]:
+    if value is None:
+        return None
+    return hashlib.blake2b(f"{kind}:{value}".encode(), digest_size=8).digest()
+
+class BlocklistIndex:
+    """Per-property map from hashed normalized names and phone numbers to blocklist entries, rebuilt lazily after writes"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.properties: Dict[str, Tuple[float, Dict[bytes, List[dict]]]] = {}
+
+    def invalidate(self, property_ids):
+        with self.lock:
+            for property_id in property_ids:
+                self.properties.pop(property_id, None)
+
+    def _build(self, db: Session, property_id: str) -> Dict[bytes, List[dict]]:
+        rows = db.query(BlocklistManagement).join(
+            VisitorManagementReport, BlocklistManagement.report_id == VisitorManagementReport.id
+        ).filter(VisitorManagementReport.property_id == property_id).all()
+        keys: Dict[bytes, List[dict]] = {}
+        for row in rows:
+            entry = {"id": row.id, "blocklist_id": row.blocklist_id, "name": row.name, "reason_for_block": row.reason_for_block}
+            for kind, key in (("name", _blocklist_key("name", normalize_blocklist_name(row.name))),
+                              ("contact_number", _blocklist_key("phone", normalize_blocklist_phone(row.contact_number)))):
+                if key is not None:
+                    keys.setdefault(key, []).append({**entry, "matched_on": kind})
+        return keys
+
+    def get(self, db: Session, property_id: str, store: bool = True) -> Dict[bytes, List[dict]]:
+        """The property's index; pass store=False when db may hold uncommitted writes, so they never reach the cache"""
+        cached = self.properties.get(property_id)
+        if cached is not None and time.monotonic() - cached[0] < BLOCKLIST_INDEX_MAX_AGE:
+            return cached[1]
+        keys = self._build(db, property_id)
+        if store:
+            with self.lock:
+                self.properties[property_id] = (time.monotonic(), keys)
+        return keys
+
+    def check(self, db: Session, property_id: str, name: Optional[str], contact_number: Optional[str]) -> List[dict]:
+        return self.match(self.get(db, property_id), name, contact_number)
+
+    @staticmethod
+    def match(keys: Dict[bytes, List[dict]], name: Optional[str], contact_number: Optional[str]) -> List[dict]:
+        if not keys:
+            return []
+        matches = []
+        for key in (_blocklist_key("name", normalize_blocklist_name(name)),
+                    _blocklist_key("phone", normalize_blocklist_phone(contact_number))):
+            if key is not None:
+                matches.extend(keys.get(key, ()))
+        return matches
+
+blocklist_index = BlocklistIndex()
+
+def _report_property_id(session: Session, report_id: Optional[str]) -> Optional[str]:
+    if not report_id:
+        return None
+    report = session.get(VisitorManagementReport, report_id)
+    return report.property_id if report is not None else None
+
+@event.listens_for(Session, "before_flush")
+def stamp_visitor_blocklist_status(session, flush_context, instances):
+    """Set blocklist_status on new visitor log entries from the property's blocklist"""
+    # This transaction may already have replaced blocklist rows and can still roll back,
+    # so an index built here is used for this flush only and never cached
+    indexes: Dict[str, Dict[bytes, List[dict]]] = {}
+    for obj in session.new:
+        if not isinstance(obj, VisitorManagementLog):
+            continue
+        with session.no_autoflush:
+            property_id = _report_property_id(session, obj.report_id)
+            if property_id is None:
+                continue
+            if property_id not in indexes:
+                indexes[property_id] = blocklist_index.get(session, property_id, store=False)
+        matches = blocklist_index.match(indexes[property_id], obj.name, obj.contact_number)
+        if matches:
+            obj.blocklist_status = BLOCKLIST_STATUS_BLOCKED
+        elif not obj.blocklist_status:
+            obj.blocklist_status = BLOCKLIST_STATUS_CLEAR
+
+@event.listens_for(Session, "after_flush")
+def collect_blocklist_changes(session, flush_context):
+    """Note properties whose blocklist changed; reports are included because their children are replaced in bulk"""
+    touched = session.info.setdefault("blocklist_properties", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, BlocklistManagement):
+            touched.add(_report_property_id(session, obj.report_id))
+        elif isinstance(obj, VisitorManagementReport):
+            touched.add(obj.property_id)
+            touched.update(sa_inspect(obj).attrs.property_id.history.deleted or ())
+
+@event.listens_for(Session, "after_commit")
+def refresh_blocklist_index(session):
+    blocklist_index.invalidate(session.info.pop("blocklist_properties", set()) - {None})
+
+@event.listens_for(Session, "after_rollback")
+def discard_blocklist_changes(session):
+    # Nothing built inside a transaction is cached, but drop the touched properties anyway rather than trust that
+    blocklist_index.invalidate(session.info.pop("blocklist_properties", set()) - {None})
+
+class GateBlocklistMatch(BaseModel):
+    id: str
+    blocklist_id: str
+    name: str
+    reason_for_block: str
+    matched_on: str  # name or contact_number
+
+class GateBlocklistCheck(BaseModel):
+    blocked: bool
+    matches: List[GateBlocklistMatch]
+
+@app.get("/gate/check", response_model=GateBlocklistCheck, tags=["Gate"])
+def check_visitor_at_gate(
+    property_id: str = Query(...),
+    name: Optional[str] = Query(None),
+    contact_number: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Check a visitor's name and/or contact number against the property's blocklist.
+    Answered from memory; the index is rebuilt on the first check after a blocklist write.
+    """
+    if not name and not contact_number:
+        raise HTTPException(status_code=400, detail="Provide name or contact_number")
+    matches = blocklist_index.check(db, property_id, name, contact_number)
+    return GateBlocklistCheck(blocked=bool(matches), matches=matches)
+
+# --- Streaming Exports ---
+
+import json
+import math
+import zipfile
+from datetime import date
+from xml.sax.saxutils import escape
+from fastapi.responses import StreamingResponse
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+EXPORT_CHUNK_SIZE = 1000  # rows fetched per round trip and written per yielded CSV/XLSX chunk
+XLSX_MAX_ROWS = 1048576  # per sheet, header included
+XLSX_MAX_CELL_LENGTH = 32767
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Resource name -> table, optional parent report it hangs off (with join condition),
+# the column holding the property and the column the date filter applies to.
+# String date columns hold ISO dates ("YYYY-MM-DD..."), so they are compared as text.
+EXPORT_RESOURCES = {
+    "water-readings": {"table": WaterReading.__table__, "property": WaterReading.property_id, "date": WaterReading.reading_date},
+    "visitor-logs": {
+        "table": VisitorManagementLog.__table__,
+        "join": (VisitorManagementReport, VisitorManagementLog.report_id == VisitorManagementReport.id),
+        "property": VisitorManagementReport.property_id,
+        "date": VisitorManagementLog.entry_date,
+    },
+    "facility-patrolling-entries": {
+        "table": FacilityTechnicalPatrollingEntry.__table__,
+        "join": (FacilityTechnicalPatrollingReport, FacilityTechnicalPatrollingEntry.facility_technical_patrolling_report_id == FacilityTechnicalPatrollingReport.id),
+        "property": FacilityTechnicalPatrollingReport.property_id,
+        "date": FacilityTechnicalPatrollingEntry.date,
+    },
+    "security-patrolling-logs": {
+        "table": SecurityAreaWisePatrollingLog.__table__,
+        "join": (SecurityPatrollingReport, SecurityAreaWisePatrollingLog.security_patrolling_report_id == SecurityPatrollingReport.id),
+        "property": SecurityPatrollingReport.property_id,
+        "date": SecurityPatrollingReport.created_at,
+    },
+    "night-patrolling-observations": {
+        "table": NightPatrollingObservation.__table__,
+        "join": (NightPatrollingReport, NightPatrollingObservation.night_patrolling_report_id == NightPatrollingReport.id),
+        "property": NightPatrollingReport.property_id,
+        "date": NightPatrollingReport.created_at,
+    },
+    "patrolling-details": {"table": PatrollingDetailsDB.__table__, "property": PatrollingDetailsDB.property_id, "date": PatrollingDetailsDB.created_at},
+    "kpi-records": {"table": KpiRecord.__table__, "property": KpiRecord.property_id, "date": KpiRecord.created_at},
+    "audit-reports": {"table": AuditReport.__table__, "property": AuditReport.property_id, "date": AuditReport.audit_date},
+}
+# The name HotWorkPermit was later reused for a schema, so take the hot_work_permits table from the metadata
+legacy_hot_work_permits = Base.metadata.tables["hot_work_permits"]
+EXPORT_RESOURCES["hot-work-permits"] = {
+    "table": legacy_hot_work_permits, "property": legacy_hot_work_permits.c.property_id, "date": legacy_hot_work_permits.c.date_of_issue,
+}
+for permit_model in (
+    HotWorkPermitDB, ColdWorkPermitDB, ElectricalWorkPermitDB, HeightWorkPermitDB, ConfinedSpaceWorkPermitDB,
+    GeneralMaintenancePermitDB, ExcavationWorkPermitDB, LockoutTagoutPermitDB,
+    ChemicalHandlingPermitDB, LiftingWorkPermitDB, DemolitionWorkPermitDB, TemporaryStructureInstallationPermitDB,
+    VehicleEntryPermitDB, InteriorWorkPermitDB,
+):
+    EXPORT_RESOURCES[permit_model.__tablename__.replace("_", "-")] = {
+        "table": permit_model.__table__, "property": permit_model.property_id, "date": permit_model.date_of_issue,
+    }
+EXPORT_RESOURCES["working-alone-permit"] = {
+    "table": WorkingAlonePermitDB.__table__, "property": WorkingAlonePermitDB.property_id, "date": WorkingAlonePermitDB.Date,
+}
+
+def export_query(db: Session, resource: dict, property_id: Optional[str], start: Optional[date], end: Optional[date]):
+    """Plain column tuples (no ORM objects) for one resource, oldest first, fetched EXPORT_CHUNK_SIZE at a time"""
+    table = resource["table"]
+    columns = list(table.columns)
+    if "join" in resource:
+        columns.append(resource["property"].label("property_id"))
+    query = db.query(*columns)
+    if "join" in resource:
+        query = query.join(*resource["join"])
+
+    date_column = resource["date"]
+    is_text = isinstance(date_column.type, String)
+    if start:
+        lower = start.isoformat() if is_text else datetime.combine(start, datetime.min.time())
+        query = query.filter(date_column >= lower)
+    if end:
+        upper = (end + timedelta(days=1)).isoformat() if is_text else datetime.combine(end + timedelta(days=1), datetime.min.time())
+        query = query.filter(date_column < upper)
+    if property_id:
+        query = query.filter(resource["property"] == property_id)
+    query = query.order_by(date_column, *table.primary_key.columns)
+    return [column.key for column in columns], query.yield_per(EXPORT_CHUNK_SIZE)
+
+def export_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return value
+
+def iter_csv_export(resource: dict, property_id: Optional[str], start: Optional[date], end: Optional[date]):
+    # The generator outlives the request handler, so it owns its session
+    db = SessionLocal()
+    try:
+        header, rows = export_query(db, resource, property_id, start, end)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        for count, row in enumerate(rows, 1):
+            writer.writerow([export_cell(value) for value in row])
+            if count % EXPORT_CHUNK_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    finally:
+        db.close()
+
+def xlsx_cell(value):
+    value = export_cell(value)
+    if isinstance(value, str):
+        value = ILLEGAL_CHARACTERS_RE.sub("", value)
+        if len(value) > XLSX_MAX_CELL_LENGTH:
+            value = value[:XLSX_MAX_CELL_LENGTH]
+    return value
+
+XLSX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">\
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>\
+<Default Extension="xml" ContentType="application/xml"/>\
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>\
+<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>\
+{sheets}</Types>"""
+XLSX_ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">\
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>\
+</Relationships>"""
+XLSX_WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" \
+xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>{sheets}</sheets></workbook>"""
+XLSX_WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">\
+<Relationship Id="rId0" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>\
+{sheets}</Relationships>"""
+XLSX_STYLES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">\
+<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>\
+<fills count="1"><fill><patternFill patternType="none"/></fill></fills>\
+<borders count="1"><border/></borders>\
+<cellStyleXfs count="1"><xf/></cellStyleXfs><cellXfs count="1"><xf/></cellXfs></styleSheet>"""
+XLSX_SHEET_START = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>"""
+XLSX_SHEET_END = "</sheetData></worksheet>"
+
+class ExportSink(io.RawIOBase):
+    """Unseekable target for zipfile: collects the archive bytes written so far until the response drains them"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+def xlsx_row_xml(values) -> str:
+    cells = []
+    for value in values:
+        value = xlsx_cell(value)
+        if isinstance(value, bool):
+            cells.append(f'<c t="b"><v>{int(value)}</v></c>')
+        elif isinstance(value, (int, float)) and math.isfinite(value):
+            cells.append(f"<c><v>{value!r}</v></c>")
+        else:
+            text_value = value.isoformat() if isinstance(value, date) else str(value)
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{escape(text_value)}</t></is></c>')
+    return f"<row>{''.join(cells)}</row>"
+
+def iter_xlsx_export(resource: dict, property_id: Optional[str], start: Optional[date], end: Optional[date]):
+    """Stream an XLSX as it is built: rows are written as inline-string sheet XML into a zip whose bytes are yielded per chunk.
+
+    openpyxl only assembles the archive on save(), which would hold the first byte back until every row was read.
+    """
+    db = SessionLocal()
+    try:
+        header, rows = export_query(db, resource, property_id, start, end)
+        sink = ExportSink()
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+            sheet_count = 0
+            sheet = None
+            sheet_rows = XLSX_MAX_ROWS
+            pending = []
+            for row in rows:
+                if sheet_rows == XLSX_MAX_ROWS:
+                    if sheet is not None:
+                        sheet.write("".join(pending).encode() + XLSX_SHEET_END.encode())
+                        sheet.close()
+                    sheet_count += 1
+                    sheet = archive.open(f"xl/worksheets/sheet{sheet_count}.xml", "w")
+                    pending = [XLSX_SHEET_START, xlsx_row_xml(header)]
+                    sheet_rows = 1
+                pending.append(xlsx_row_xml(row))
+                sheet_rows += 1
+                if len(pending) >= EXPORT_CHUNK_SIZE:
+                    sheet.write("".join(pending).encode())
+                    pending = []
+                    chunk = sink.drain()
+                    if chunk:
+                        yield chunk
+            if sheet is None:
+                sheet_count = 1
+                sheet = archive.open("xl/worksheets/sheet1.xml", "w")
+                pending = [XLSX_SHEET_START, xlsx_row_xml(header)]
+            sheet.write("".join(pending).encode() + XLSX_SHEET_END.encode())
+            sheet.close()
+            db.close()
+
+            numbers = range(1, sheet_count + 1)
+            archive.writestr("[Content_Types].xml", XLSX_CONTENT_TYPES.format(sheets="".join(
+                f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+                f'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for n in numbers
+            )))
+            archive.writestr("_rels/.rels", XLSX_ROOT_RELS)
+            archive.writestr("xl/workbook.xml", XLSX_WORKBOOK.format(sheets="".join(
+                f'<sheet name="{"Export" if n == 1 else f"Export {n}"}" sheetId="{n}" r:id="rId{n}"/>' for n in numbers
+            )))
+            archive.writestr("xl/_rels/workbook.xml.rels", XLSX_WORKBOOK_RELS.format(sheets="".join(
+                f'<Relationship Id="rId{n}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                f'Target="worksheets/sheet{n}.xml"/>'
+                for n in numbers
+            )))
+            archive.writestr("xl/styles.xml", XLSX_STYLES)
+        yield sink.drain()
+    finally:
+        db.close()
+
+@app.get("/exports/", tags=["Exports"])
+def get_export_resources():
+    """Resources that can be exported with /exports/{resource}"""
+    return sorted(EXPORT_RESOURCES)
+
+@app.get("/exports/{resource}", tags=["Exports"])
+def export_resource(
+    resource: str,
+    format: str = Query("csv", pattern="^(csv|xlsx)$"),
+    property_id: Optional[str] = None,
+    start: Optional[date] = Query(None, description="First day to include"),
+    end: Optional[date] = Query(None, description="Last day to include"),
+):
+    """Stream every matching row of a module as CSV or XLSX without loading it into memory"""
+    if resource not in EXPORT_RESOURCES:
+        raise HTTPException(status_code=404, detail=f"Unknown export resource '{resource}'")
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    iterate = iter_csv_export if format == "csv" else iter_xlsx_export
+    filename = f"{resource}-{datetime.utcnow():%Y%m%d}.{format}"
+    return StreamingResponse(
+        iterate(EXPORT_RESOURCES[resource], property_id, start, end),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# --- Analytics (Parquet) Export ---
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Boolean as SABoolean
+
+ANALYTICS_EXPORT_DIR = "assets/analytics"
+ANALYTICS_CHUNK_SIZE = 50000  # rows per Arrow table / Parquet write
+ANALYTICS_MAX_PARTITIONS = 100000  # property x month partitions a single chunk may touch
+ANALYTICS_SETTLE_SECONDS = 60  # timestamp watermarks skip rows this recent, so slower concurrent commits are not skipped
+ANALYTICS_SNAPSHOT_VERSIONS = 2  # snapshot versions kept on disk, so a query that started on the previous one can finish
+
+class AnalyticsExportWatermark(Base):
+    __tablename__ = "analytics_export_watermarks"
+    
+    dataset = Column(String, primary_key=True)
+    watermark = Column(String, nullable=True)  # ISO timestamp of the last exported key; None for snapshot datasets
+    row_count = Column(Integer, nullable=False, default=0)  # rows exported over all runs
+    exported_at = Column(DateTime, nullable=True)
+
+AnalyticsExportWatermark.__table__.create(bind=engine, checkfirst=True)
+
+class AnalyticsExportWatermarkResponse(BaseModel):
+    dataset: str
+    watermark: Optional[str]
+    row_count: int
+    exported_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class AnalyticsExportRunResponse(BaseModel):
+    dataset: str
+    rows: int
+    files: int
+    watermark: Optional[str]
+
+# Dataset -> model, optional parent join, property column, column the month partition comes from, and watermark key.
+# Only plant readings are exported incrementally, by ingested_at. A backfill correction re-exports a plant reading
+# with a newer ingested_at, so plant readings also name their natural key ("unique"); readers keep the latest copy
+# per key. Tables whose rows are edited or deleted are snapshot datasets, rewritten in full on every run.
+ANALYTICS_DATASETS = {
+    "water_readings": {"model": WaterReading, "property": WaterReading.property_id, "date": WaterReading.reading_date, "snapshot": True},
+    # Telemetry histories are bulk-deleted with their meter or generator, and SQLite reuses the freed top rowids
+    # (no AUTOINCREMENT), so rowid is not a usable watermark
+    "electricity_meter_readings": {
+        "model": ElectricityMeterReading, "property": ElectricityMeterReading.property_id,
+        "date": ElectricityMeterReading.recorded_at, "snapshot": True,
+    },
+    "diesel_generator_readings": {
+        "model": DieselGeneratorReading, "property": DieselGeneratorReading.property_id,
+        "date": DieselGeneratorReading.recorded_at, "snapshot": True,
+    },
+    "plant_parameter_readings": {
+        "model": PlantParameterReading, "property": PlantParameterReading.property_id,
+        "date": PlantParameterReading.recorded_at, "key": PlantParameterReading.ingested_at,
+        "unique": ("phase_id", "parameter", "recorded_at"),
+    },
+    # Report updates delete and re-insert every log row, so rows have no stable identity across runs
+    "visitor_management_log": {
+        "model": VisitorManagementLog,
+        "join": (VisitorManagementReport, VisitorManagementLog.report_id == VisitorManagementReport.id),
+        "property": VisitorManagementReport.property_id,
+        "date": VisitorManagementLog.entry_date,
+        "snapshot": True,
+    },
+    "incident_reports": {"model": IncidentReport, "property": IncidentReport.property_id, "date": IncidentReport.created_at, "snapshot": True},
+    "kpi_records": {"model": KpiRecord, "property": KpiRecord.property_id, "date": KpiRecord.created_at, "snapshot": True},
+    "electricity_consumptions": {
+        "model": ElectricityConsumption, "property": ElectricityConsumption.property_id,
+        "date": ElectricityConsumption.created_at, "snapshot": True,
+    },
+}
+
+analytics_export_lock = threading.Lock()
+
+def arrow_type(column) -> pa.DataType:
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column.type, SABoolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    return pa.string()
+
+def analytics_columns(dataset: dict) -> list:
+    return [column for column in dataset["model"].__table__.columns if column.key != "property_id"]
+
+def analytics_schema(dataset: dict) -> pa.Schema:
+    return pa.schema(
+        [(column.key, arrow_type(column)) for column in analytics_columns(dataset)]
+        + [("property_id", pa.string()), ("month", pa.string())]
+    )
+
+def analytics_dataset_dir(name: str) -> str:
+    """Directory holding a dataset's current Parquet files.
+
+    A snapshot dataset is written to a new version directory under its root, then published by atomically
+    replacing the root's ".current" pointer file, so readers never see a half-written or missing snapshot.
+    """
+    root = os.path.join(ANALYTICS_EXPORT_DIR, name)
+    if not ANALYTICS_DATASETS[name].get("snapshot"):
+        return root
+    try:
+        with open(f"{root}.current") as f:
+            return os.path.join(root, f.read().strip())
+    except FileNotFoundError:
+        return root  # not exported since versioning was introduced
+
+def publish_analytics_snapshot(root: str, version: str):
+    """Point readers at a complete snapshot version, then drop all but the newest versions"""
+    pointer = f"{root}.current"
+    with open(f"{pointer}.tmp-{version}", "w") as f:
+        f.write(version)
+    os.replace(f"{pointer}.tmp-{version}", pointer)
+    # Entries other than version directories are partitions from the unversioned layout
+    versions = sorted(entry for entry in os.listdir(root) if entry[:1].isdigit())
+    keep = set(versions[-ANALYTICS_SNAPSHOT_VERSIONS:]) | {version}
+    for entry in os.listdir(root):
+        if entry not in keep:
+            shutil.rmtree(os.path.join(root, entry), ignore_errors=True)
+
+def partition_month(value) -> str:
+    if value is None:
+        return "unknown"
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m")
+    return str(value)[:7]
+
+def export_analytics_dataset(db: Session, name: str) -> AnalyticsExportRunResponse:
+    """Append rows added since the last watermark as Parquet files partitioned by property_id and month.
+
+    The upper bound is fixed when the run starts; if any write fails, this run's files are removed
+    and the watermark stays put, so a rerun picks up the same rows. Snapshot datasets are written
+    to a fresh version directory that is published once complete.
+    """
+    dataset = ANALYTICS_DATASETS[name]
+    model = dataset["model"]
+    snapshot = dataset.get("snapshot", False)
+    key = dataset.get("key")
+
+    state = db.query(AnalyticsExportWatermark).filter(AnalyticsExportWatermark.dataset == name).first()
+    if state is None:
+        state = AnalyticsExportWatermark(dataset=name, row_count=0)
+        db.add(state)
+    lower = upper = None
+    if not snapshot:
+        if state.watermark is not None:
+            lower = datetime.fromisoformat(state.watermark)
+        upper = db.query(func.max(key)).select_from(model).filter(
+            key < datetime.utcnow() - timedelta(seconds=ANALYTICS_SETTLE_SECONDS)
+        ).scalar()
+        if upper is None or (lower is not None and upper <= lower):
+            state.exported_at = datetime.utcnow()
+            db.commit()
+            return AnalyticsExportRunResponse(dataset=name, rows=0, files=0, watermark=state.watermark)
+
+    columns = analytics_columns(dataset)
+    schema = analytics_schema(dataset)
+    query = db.query(*columns, dataset["property"], dataset["date"])
+    if "join" in dataset:
+        query = query.join(*dataset["join"])
+    if upper is not None:
+        query = query.filter(key <= upper)
+    if lower is not None:
+        query = query.filter(key > lower)
+
+    run_id = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    root = os.path.join(ANALYTICS_EXPORT_DIR, name)
+    target = os.path.join(root, run_id) if snapshot else root
+    written: List[str] = []
+    rows = 0
+
+    def write_chunk(chunk: List[tuple], number: int):
+        arrays = [pa.array([row[i] for row in chunk], type=field.type) for i, field in enumerate(list(schema)[:-1])]
+        arrays.append(pa.array([partition_month(row[-1]) for row in chunk], type=pa.string()))
+        pq.write_to_dataset(
+            pa.Table.from_arrays(arrays, schema=schema),
+            target,
+            partition_cols=["property_id", "month"],
+            max_partitions=ANALYTICS_MAX_PARTITIONS,
+            basename_template=f"part-{run_id}-{number}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_visitor=lambda written_file: written.append(written_file.path),
+        )
+
+    try:
+        chunk = []
+        for row in query.yield_per(ANALYTICS_CHUNK_SIZE):
+            chunk.append(tuple(row))
+            if len(chunk) == ANALYTICS_CHUNK_SIZE:
+                write_chunk(chunk, rows // ANALYTICS_CHUNK_SIZE)
+                rows += len(chunk)
+                chunk = []
+        if chunk:
+            write_chunk(chunk, rows // ANALYTICS_CHUNK_SIZE)
+            rows += len(chunk)
+    except Exception:
+        if snapshot:
+            shutil.rmtree(target, ignore_errors=True)
+        for path in written:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    if snapshot:
+        os.makedirs(target, exist_ok=True)
+        publish_analytics_snapshot(root, run_id)
+        state.watermark = None
+        state.row_count = rows
+    else:
+        state.watermark = upper.isoformat()
+        state.row_count = (state.row_count or 0) + rows
+    state.exported_at = datetime.utcnow()
+    db.commit()
+    return AnalyticsExportRunResponse(dataset=name, rows=rows, files=len(written), watermark=state.watermark)
+
+@app.post("/analytics/exports/", response_model=List[AnalyticsExportRunResponse], tags=["Analytics Export"])
+def run_analytics_export(dataset: Optional[str] = None, db: Session = Depends(get_db)):
+    """Export new rows of one dataset (or all of them) to Parquet under assets/analytics"""
+    if dataset is not None and dataset not in ANALYTICS_DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset '{dataset}'")
+    if not analytics_export_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="An analytics export is already running")
+    try:
+        return [export_analytics_dataset(db, name) for name in ([dataset] if dataset else ANALYTICS_DATASETS)]
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error exporting analytics data: {str(e)}")
+    finally:
+        analytics_export_lock.release()
+
+@app.get("/analytics/exports/", response_model=List[AnalyticsExportWatermarkResponse], tags=["Analytics Export"])
+def get_analytics_export_watermarks(db: Session = Depends(get_db)):
+    """Where each dataset's incremental export currently stands"""
+    states = {state.dataset: state for state in db.query(AnalyticsExportWatermark).all()}
+    return [
+        states.get(name) or AnalyticsExportWatermarkResponse(dataset=name, watermark=None, row_count=0, exported_at=None)
+        for name in ANALYTICS_DATASETS
+    ]
+
+
+# --- Portfolio Analytics (DuckDB) ---
+
+import duckdb
+from typing import Tuple
+
+# Analytics endpoints read the Parquet exports, never the transactional tables. Data is at most
+# ANALYTICS_MAX_LAG_MINUTES old: a request that finds an older export serves it and refreshes in the background.
+ANALYTICS_MAX_LAG_MINUTES = 15
+
+class AnalyticsQueryResponse(BaseModel):
+    as_of: Optional[datetime]  # oldest export the answer was computed from; newer OLTP writes are not included
+    refreshing: bool
+    rows: List[Dict[str, Any]]
+
+def refresh_analytics_datasets(names: List[str]):
+    """Background refresh of stale exports; skipped if another export is running"""
+    if not analytics_export_lock.acquire(blocking=False):
+        return
+    db = SessionLocal()
+    try:
+        for name in names:
+            export_analytics_dataset(db, name)
+    except Exception:
+        db.rollback()
+    finally:
+        db.close()
+        analytics_export_lock.release()
+
+def run_analytics_query(db: Session, background_tasks: BackgroundTasks, datasets: List[str], sql: str, params: list) -> AnalyticsQueryResponse:
+    """Run sql in an in-memory DuckDB where each dataset is a view over its Parquet files"""
+    states = {
+        state.dataset: state.exported_at
+        for state in db.query(AnalyticsExportWatermark).filter(AnalyticsExportWatermark.dataset.in_(datasets))
+    }
+    cutoff = datetime.utcnow() - timedelta(minutes=ANALYTICS_MAX_LAG_MINUTES)
+    stale = [name for name in datasets if states.get(name) is None or states[name] < cutoff]
+    if stale:
+        background_tasks.add_task(refresh_analytics_datasets, stale)
+    if any(states.get(name) is None for name in datasets):
+        return AnalyticsQueryResponse(as_of=None, refreshing=True, rows=[])
+
+    conn = duckdb.connect()
+    try:
+        for name in datasets:
+            dataset = ANALYTICS_DATASETS[name]
+            pattern = os.path.join(analytics_dataset_dir(name), "**", "*.parquet")
+            if glob.glob(pattern, recursive=True):
+                files = pattern.replace("'", "''")
+                source = f"read_parquet('{files}', hive_partitioning = true, hive_types_autocast = false, union_by_name = true)"
+                dedupe = ""
+                if "unique" in dataset:
+                    # Re-exported rows (e.g. plant backfill corrections) sit next to their older copies; keep the newest
+                    dedupe = f"QUALIFY row_number() OVER (PARTITION BY {', '.join(dataset['unique'])} ORDER BY {dataset['key'].key} DESC) = 1"
+                conn.execute(f"CREATE VIEW {name} AS SELECT * FROM {source} {dedupe}")
+            else:
+                # Exported but still empty: an empty table with the dataset's columns
+                conn.register(name, analytics_schema(ANALYTICS_DATASETS[name]).empty_table())
+        cursor = conn.execute(sql, params)
+        names = [description[0] for description in cursor.description]
+        rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+    return AnalyticsQueryResponse(as_of=min(states[name] for name in datasets), refreshing=bool(stale), rows=rows)
+
+def month_filters(start_month: Optional[str], end_month: Optional[str], property_id: Optional[str], alias: str = "") -> Tuple[str, list]:
+    prefix = f"{alias}." if alias else ""
+    clauses, params = ["true"], []
+    if start_month:
+        clauses.append(f"{prefix}month >= ?")
+        params.append(start_month)
+    if end_month:
+        clauses.append(f"{prefix}month <= ?")
+        params.append(end_month)
+    if property_id:
+        clauses.append(f"{prefix}property_id = ?")
+        params.append(property_id)
+    return " AND ".join(clauses), params
+
+MONTH_PATTERN = "^[0-9]{4}-[0-9]{2}$"
+
+@app.get("/analytics/incidents/monthly", response_model=AnalyticsQueryResponse, tags=["Portfolio Analytics"])
+def get_incidents_per_month(
+    background_tasks: BackgroundTasks,
+    property_id: Optional[str] = None,
+    start_month: Optional[str] = Query(None, pattern=MONTH_PATTERN),
+    end_month: Optional[str] = Query(None, pattern=MONTH_PATTERN),
+    db: Session = Depends(get_db)
+):
+    """Incident reports per property and month (by report creation)"""
+    where, params = month_filters(start_month, end_month, property_id)
+    return run_analytics_query(db, background_tasks, ["incident_reports"], f"""
+        SELECT property_id, month, count(*) AS incidents
+        FROM incident_reports WHERE {where}
+        GROUP BY property_id, month ORDER BY month, property_id
+    """, params)
+
+@app.get("/analytics/electricity/blocks", response_model=AnalyticsQueryResponse, tags=["Portfolio Analytics"])
+def get_electricity_per_block(
+    background_tasks: BackgroundTasks,
+    property_id: Optional[str] = None,
+    start_month: Optional[str] = Query(None, pattern=MONTH_PATTERN),
+    end_month: Optional[str] = Query(None, pattern=MONTH_PATTERN),
+    db: Session = Depends(get_db)
+):
+    """kWh consumed per block (or STP phase) and month, from the meter reading deltas"""
+    where, params = month_filters(start_month, end_month, property_id, "r")
+    return run_analytics_query(db, background_tasks, ["electricity_meter_readings", "electricity_consumptions"], f"""
+        SELECT r.property_id, c.block_name, c.consumption_type, c.phase, r.month,
+               sum(r.delta) AS consumption_kwh, count(*) AS readings
+        FROM electricity_meter_readings r
+        JOIN electricity_consumptions c ON c.id = r.consumption_id
+        WHERE {where}
+        GROUP BY ALL ORDER BY r.month, r.property_id, c.block_name
+    """, params)
+
+@app.get("/analytics/kpis/departments", response_model=AnalyticsQueryResponse, tags=["Portfolio Analytics"])
+def get_kpi_achievement_by_department(
+    background_tasks: BackgroundTasks,
+    property_id: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """KPI count and achievement per department; achievement_percentage values like '85%' are parsed"""
+    where, params = month_filters(None, None, property_id)
+    return run_analytics_query(db, background_tasks, ["kpi_records"], f"""
+        WITH kpis AS (
+            SELECT department, status,
+                   TRY_CAST(trim(replace(achievement_percentage, '%', '')) AS DOUBLE) AS achievement
+            FROM kpi_records WHERE {where}
+        )
+        SELECT department, count(*) AS kpis, round(avg(achievement), 2) AS avg_achievement,
+               count(*) FILTER (WHERE achievement >= 100) AS on_target,
+               count(*) FILTER (WHERE achievement IS NULL) AS unparsed
+        FROM kpis GROUP BY department ORDER BY department
+    """, params)
+
+@app.get("/analytics/water/monthly", response_model=AnalyticsQueryResponse, tags=["Portfolio Analytics"])
+def get_water_per_month(
+    background_tasks: BackgroundTasks,
+    property_id: Optional[str] = None,
+    start_month: Optional[str] = Query(None, pattern=MONTH_PATTERN),
+    end_month: Optional[str] = Query(None, pattern=MONTH_PATTERN),
+    db: Session = Depends(get_db)
+):
+    """Water totals per property, reading type, unit and month"""
+    where, params = month_filters(start_month, end_month, property_id)
+    return run_analytics_query(db, background_tasks, ["water_readings"], f"""
+        SELECT property_id, reading_type, unit, month, sum(value) AS total, count(*) AS readings
+        FROM water_readings WHERE {where}
+        GROUP BY ALL ORDER BY month, property_id, reading_type
+    """, params)
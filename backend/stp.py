@@ -2,10 +2,11 @@ from fastapi import FastAPI, HTTPException, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
-from sqlalchemy import create_engine, Column, String, DateTime, Integer, Boolean, Text, ForeignKey, Float
+from sqlalchemy import create_engine, Column, String, DateTime, Integer, Boolean, Text, ForeignKey, Float, Index, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base, Session, relationship
 from datetime import datetime
 import uuid
+import numpy as np
 
 app = FastAPI(title="Water Quality Monitoring System API")
 
@@ -83,10 +84,15 @@ class MeterReading(Base):
     treated_water_current = Column(Float)
     previous_date = Column(DateTime)
     current_date = Column(DateTime, default=datetime.now)
+    replaced_meters = Column(String, default="")  # comma separated meters swapped for new ones at this reading
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     
     phase = relationship("Phase", back_populates="meter_readings")
+    
+    __table_args__ = (
+        Index("ix_meter_readings_phase_date", "phase_id", "current_date"),
+    )
 
 class TankLevel(Base):
     __tablename__ = "tank_levels"
@@ -117,6 +123,13 @@ class AirQuality(Base):
 # Create all tables
 Base.metadata.create_all(bind=engine)
 
+# Databases created before the meter engine lack its column and index
+if "replaced_meters" not in {column["name"] for column in inspect(engine).get_columns("meter_readings")}:
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE meter_readings ADD COLUMN replaced_meters VARCHAR DEFAULT ''"))
+for index in MeterReading.__table__.indexes:
+    index.create(bind=engine, checkfirst=True)
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -139,7 +152,7 @@ class PropertyResponse(PropertyBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class PhaseBase(BaseModel):
     name: str
@@ -154,7 +167,7 @@ class PhaseResponse(PhaseBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class WaterQualityBase(BaseModel):
     tank1_mlss: float
@@ -174,17 +187,20 @@ class WaterQualityResponse(WaterQualityBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class MeterReadingBase(BaseModel):
-    energy_consumption_previous: float
     energy_consumption_current: float
-    raw_sewage_flow_previous: float
     raw_sewage_flow_current: float
-    treated_water_previous: float
     treated_water_current: float
-    previous_date: datetime
     current_date: datetime = Field(default_factory=datetime.now)
+    # Previous values are looked up from the phase's earlier reading. They are only read for
+    # the first reading of a phase and for meters listed in replaced_meters (the new meter's start value).
+    energy_consumption_previous: Optional[float] = None
+    raw_sewage_flow_previous: Optional[float] = None
+    treated_water_previous: Optional[float] = None
+    previous_date: Optional[datetime] = None
+    replaced_meters: List[str] = []
 
 class MeterReadingCreate(MeterReadingBase):
     pass
@@ -201,13 +217,14 @@ class MeterReadingResponse(BaseModel):
     treated_water: float
     treated_water_previous: float
     treated_water_current: float
-    previous_date: datetime
+    previous_date: Optional[datetime]
     current_date: datetime
+    replaced_meters: Optional[str]
     created_at: datetime
     updated_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class TankLevelBase(BaseModel):
     raw_sewage_tank: float  # Percentage
@@ -225,7 +242,7 @@ class TankLevelResponse(TankLevelBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class AirQualityBase(BaseModel):
     smell: str
@@ -241,7 +258,7 @@ class AirQualityResponse(AirQualityBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 # API Routes for Properties
 @app.post("/properties/", response_model=PropertyResponse)
@@ -400,39 +417,133 @@ def delete_water_quality(record_id: str, db: Session = Depends(get_db)):
     db.commit()
     return {"message": "Water quality record deleted successfully"}
 
-# API Routes for Meter Readings
-@app.post("/meter-readings/", response_model=MeterReadingResponse)
-def create_meter_reading(meter_reading_data: MeterReadingCreate, phase_id: str, db: Session = Depends(get_db)):
-    # Verify phase exists
-    db_phase = db.query(Phase).filter(Phase.id == phase_id).first()
-    if db_phase is None:
-        raise HTTPException(status_code=404, detail="Phase not found")
-    
-    # Calculate consumption values
-    energy_consumption = meter_reading_data.energy_consumption_current - meter_reading_data.energy_consumption_previous
-    raw_sewage_flow = meter_reading_data.raw_sewage_flow_current - meter_reading_data.raw_sewage_flow_previous
-    treated_water = meter_reading_data.treated_water_current - meter_reading_data.treated_water_previous
-    
-    db_meter_reading = MeterReading(
+# Meter delta engine
+METERS = ("energy_consumption", "raw_sewage_flow", "treated_water")
+# A drop only counts as a rollover when the register goes from its top 10% to its bottom 10%
+METER_ROLLOVER_THRESHOLD = 0.9
+METER_UPDATE_BATCH_SIZE = 1000
+METER_BULK_MAX = 10000
+
+def meter_rollover_capacity(previous: np.ndarray) -> np.ndarray:
+    """Register size implied by each previous value, e.g. 99850 -> 100000 for a 5 digit meter"""
+    digits = np.floor(np.log10(np.maximum(previous, 1))) + 1
+    return 10 ** digits
+
+def recompute_meter_chain(db: Session, phase_id: str, start: datetime):
+    """Derive previous values, previous dates and deltas for every reading of a phase from start onwards.
+
+    Raises ValueError when a meter goes down without being a rollover or a listed replacement.
+    """
+    anchor = db.query(MeterReading).filter(
+        MeterReading.phase_id == phase_id,
+        MeterReading.current_date < start
+    ).order_by(MeterReading.current_date.desc(), MeterReading.created_at.desc(), MeterReading.id.desc()).first()
+    rows = db.query(MeterReading).filter(
+        MeterReading.phase_id == phase_id,
+        MeterReading.current_date >= start
+    ).order_by(MeterReading.current_date, MeterReading.created_at, MeterReading.id).all()
+    if not rows:
+        return
+    
+    dates = [row.current_date for row in rows]
+    previous_dates = [anchor.current_date if anchor else rows[0].previous_date] + dates[:-1]
+    replaced = [set(filter(None, (row.replaced_meters or "").split(","))) for row in rows]
+    values = {"previous_date": previous_dates}
+    
+    for meter in METERS:
+        current = np.array([getattr(row, f"{meter}_current") for row in rows], dtype=float)
+        given = np.array([getattr(row, f"{meter}_previous") for row in rows], dtype=float)  # None -> nan
+        previous = np.empty_like(current)
+        previous[1:] = current[:-1]
+        if anchor is not None:
+            previous[0] = getattr(anchor, f"{meter}_current")
+        else:
+            previous[0] = current[0] if np.isnan(given[0]) else given[0]
+        swapped = np.array([meter in names for names in replaced])
+        previous[swapped] = np.nan_to_num(given[swapped])  # new meter's start value, 0 unless sent
+        
+        delta = current - previous
+        capacity = meter_rollover_capacity(previous)
+        rollover = (delta < 0) & (previous >= METER_ROLLOVER_THRESHOLD * capacity) & (current < (1 - METER_ROLLOVER_THRESHOLD) * capacity)
+        delta[rollover] += capacity[rollover]
+        
+        invalid = np.flatnonzero(delta < 0)
+        if invalid.size:
+            i = invalid[0]
+            raise ValueError(
+                f"{meter} reading {current[i]} on {dates[i].isoformat()} is lower than the previous reading {previous[i]}; "
+                f"list '{meter}' in replaced_meters if the meter was replaced"
+            )
+        values[f"{meter}_previous"] = previous.tolist()
+        values[meter] = delta.tolist()
+    
+    # Only rows whose derived values moved are written back
+    mappings = []
+    for i, row in enumerate(rows):
+        changes = {key: column[i] for key, column in values.items() if getattr(row, key) != column[i]}
+        if changes:
+            mappings.append({"id": row.id, "updated_at": datetime.now(), **changes})
+    for offset in range(0, len(mappings), METER_UPDATE_BATCH_SIZE):
+        db.bulk_update_mappings(MeterReading, mappings[offset:offset + METER_UPDATE_BATCH_SIZE])
+
+def build_meter_reading(meter_reading_data: MeterReadingCreate, phase_id: str) -> MeterReading:
+    unknown = set(meter_reading_data.replaced_meters) - set(METERS)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown meters in replaced_meters: {', '.join(sorted(unknown))}")
+    return MeterReading(
         phase_id=phase_id,
-        energy_consumption=energy_consumption,
         energy_consumption_previous=meter_reading_data.energy_consumption_previous,
         energy_consumption_current=meter_reading_data.energy_consumption_current,
-        raw_sewage_flow=raw_sewage_flow,
         raw_sewage_flow_previous=meter_reading_data.raw_sewage_flow_previous,
         raw_sewage_flow_current=meter_reading_data.raw_sewage_flow_current,
-        treated_water=treated_water,
         treated_water_previous=meter_reading_data.treated_water_previous,
         treated_water_current=meter_reading_data.treated_water_current,
         previous_date=meter_reading_data.previous_date,
-        current_date=meter_reading_data.current_date
+        current_date=meter_reading_data.current_date,
+        replaced_meters=",".join(meter_reading_data.replaced_meters)
     )
+
+def commit_meter_chain(db: Session, phase_id: str, start: datetime):
+    db.flush()
+    try:
+        recompute_meter_chain(db, phase_id, start)
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=422, detail=str(e))
+    db.commit()
+
+# API Routes for Meter Readings
+@app.post("/meter-readings/", response_model=MeterReadingResponse)
+def create_meter_reading(meter_reading_data: MeterReadingCreate, phase_id: str, db: Session = Depends(get_db)):
+    # Verify phase exists
+    db_phase = db.query(Phase).filter(Phase.id == phase_id).first()
+    if db_phase is None:
+        raise HTTPException(status_code=404, detail="Phase not found")
     
+    # Previous values and consumption are derived from the phase's earlier reading
+    db_meter_reading = build_meter_reading(meter_reading_data, phase_id)
     db.add(db_meter_reading)
-    db.commit()
+    commit_meter_chain(db, phase_id, db_meter_reading.current_date)
     db.refresh(db_meter_reading)
     return db_meter_reading
 
+@app.post("/meter-readings/bulk", response_model=List[MeterReadingResponse])
+def create_meter_readings_bulk(meter_readings_data: List[MeterReadingCreate], phase_id: str, db: Session = Depends(get_db)):
+    """Backfill many readings at once; the phase's deltas are recomputed in one pass"""
+    db_phase = db.query(Phase).filter(Phase.id == phase_id).first()
+    if db_phase is None:
+        raise HTTPException(status_code=404, detail="Phase not found")
+    if not meter_readings_data:
+        return []
+    if len(meter_readings_data) > METER_BULK_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {METER_BULK_MAX} readings per request")
+    
+    db_readings = [build_meter_reading(meter_reading_data, phase_id) for meter_reading_data in meter_readings_data]
+    db.add_all(db_readings)
+    commit_meter_chain(db, phase_id, min(db_reading.current_date for db_reading in db_readings))
+    ids = [db_reading.id for db_reading in db_readings]
+    return db.query(MeterReading).filter(MeterReading.id.in_(ids)).order_by(MeterReading.current_date).all()
+
 @app.get("/meter-readings/", response_model=List[MeterReadingResponse])
 def get_meter_readings(phase_id: Optional[str] = None, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     query = db.query(MeterReading)
@@ -454,25 +565,14 @@ def update_meter_reading(reading_id: str, meter_reading_data: MeterReadingCreate
     if db_reading is None:
         raise HTTPException(status_code=404, detail="Meter reading not found")
     
-    # Calculate consumption values
-    energy_consumption = meter_reading_data.energy_consumption_current - meter_reading_data.energy_consumption_previous
-    raw_sewage_flow = meter_reading_data.raw_sewage_flow_current - meter_reading_data.raw_sewage_flow_previous
-    treated_water = meter_reading_data.treated_water_current - meter_reading_data.treated_water_previous
-    
-    db_reading.energy_consumption = energy_consumption
-    db_reading.energy_consumption_previous = meter_reading_data.energy_consumption_previous
-    db_reading.energy_consumption_current = meter_reading_data.energy_consumption_current
-    db_reading.raw_sewage_flow = raw_sewage_flow
-    db_reading.raw_sewage_flow_previous = meter_reading_data.raw_sewage_flow_previous
-    db_reading.raw_sewage_flow_current = meter_reading_data.raw_sewage_flow_current
-    db_reading.treated_water = treated_water
-    db_reading.treated_water_previous = meter_reading_data.treated_water_previous
-    db_reading.treated_water_current = meter_reading_data.treated_water_current
-    db_reading.previous_date = meter_reading_data.previous_date
-    db_reading.current_date = meter_reading_data.current_date
+    # A correction shifts every later delta of the phase, so recompute from the earlier of both dates
+    old_date = db_reading.current_date
+    corrected = build_meter_reading(meter_reading_data, db_reading.phase_id)
+    for key in ("previous_date", "current_date", "replaced_meters") + tuple(f"{meter}_{part}" for meter in METERS for part in ("previous", "current")):
+        setattr(db_reading, key, getattr(corrected, key))
     db_reading.updated_at = datetime.now()
     
-    db.commit()
+    commit_meter_chain(db, db_reading.phase_id, min(old_date, meter_reading_data.current_date))
     db.refresh(db_reading)
     return db_reading
 
@@ -482,8 +582,9 @@ def delete_meter_reading(reading_id: str, db: Session = Depends(get_db)):
     if db_reading is None:
         raise HTTPException(status_code=404, detail="Meter reading not found")
     
+    phase_id, current_date = db_reading.phase_id, db_reading.current_date
     db.delete(db_reading)
-    db.commit()
+    commit_meter_chain(db, phase_id, current_date)
     return {"message": "Meter reading deleted successfully"}
 
 # API Routes for Tank Levels
@@ -116,7 +116,7 @@ class PropertyResponse(PropertyBase):
     created_at: datetime
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class PhaseBase(BaseModel):
     name: str
@@ -130,7 +130,7 @@ class PhaseResponse(PhaseBase):
     created_at: datetime
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class SumpLevelBase(BaseModel):
     raw_sump: int
@@ -145,7 +145,7 @@ class SumpLevelResponse(SumpLevelBase):
     timestamp: datetime
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class WaterQualityBase(BaseModel):
     raw_water_hardness: int
@@ -161,7 +161,7 @@ class WaterQualityResponse(WaterQualityBase):
     timestamp: datetime
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class MeterReadingBase(BaseModel):
     treated_water: float
@@ -175,7 +175,7 @@ class MeterReadingResponse(MeterReadingBase):
     timestamp: datetime
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class SaltUsageBase(BaseModel):
     todays_usage: int
@@ -191,7 +191,7 @@ class SaltUsageResponse(SaltUsageBase):
     timestamp: datetime
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class PhaseDashboardResponse(BaseModel):
     phase: PhaseResponse
@@ -201,7 +201,7 @@ class PhaseDashboardResponse(BaseModel):
     salt_usage: Optional[SaltUsageResponse] = None
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 # API Routes
 # Property API routes